@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CursorMind 代码审查基准测试脚本
+生成可复现的合成 Python 语料，测量 CodeReview.review_file 和
+review_directory 的吞吐量、峰值内存和各阶段耗时，结果以 JSON 输出，
+并可与之前的结果对比以发现性能回退。
+
+用法:
+    python3 scripts/benchmark_review.py --shape mixed --files 500
+    python3 scripts/benchmark_review.py --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 语料形状：(文件数系数, 每个文件的函数数, 嵌套深度, 长行比例)
+SHAPES = {
+    'small': (1.0, 3, 1, 0.02),
+    'huge': (0.01, 2000, 2, 0.05),
+    'nested': (0.2, 20, 12, 0.02),
+    'long_lines': (0.5, 10, 1, 0.6),
+}
+
+
+def _statement(rng, indent, long_ratio):
+    """生成一行语句"""
+    pad = '    ' * indent
+    kind = rng.random()
+    if rng.random() < long_ratio:
+        args = ', '.join(f"'value_{i}'" for i in range(rng.randint(10, 30)))
+        return f"{pad}result = helper({args})"
+    if kind < 0.3:
+        return f"{pad}total_{rng.randint(0, 30)} = {rng.randint(0, 1000)}"
+    if kind < 0.5:
+        return f"{pad}items.append('item_{rng.randint(0, 99)}')"
+    if kind < 0.6:
+        return f"{pad}os.system(command)"
+    if kind < 0.7:
+        return f"{pad}cursor.execute(query)"
+    return f'{pad}print("step {rng.randint(0, 99)}")'
+
+
+def _function(rng, name, indent, depth, long_ratio):
+    """生成一个函数，depth 大于 1 时在内部继续嵌套函数"""
+    pad = '    ' * indent
+    lines = [f'{pad}def {name}(command, query, items):']
+    if rng.random() < 0.7:
+        lines.append(f'{pad}    """函数 {name} 的文档字符串。"""')
+    for _ in range(rng.randint(3, 12)):
+        if rng.random() < 0.3:
+            lines.append(f'{pad}    if len(items) > {rng.randint(0, 9)}:')
+            lines.append(_statement(rng, indent + 2, long_ratio))
+        else:
+            lines.append(_statement(rng, indent + 1, long_ratio))
+    if depth > 1:
+        lines.extend(_function(rng, f'{name}_inner', indent + 1, depth - 1, long_ratio))
+    lines.append(f'{pad}    return items')
+    return lines
+
+
+def generate_corpus(root, shape, files, seed):
+    """
+    生成合成语料
+
+    参数:
+        root (Path): 输出目录
+        shape (str): 语料形状，mixed 表示所有形状的组合
+        files (int): 基准文件数
+        seed (int): 随机种子
+
+    返回:
+        dict: 语料描述（文件数、行数、字节数）
+    """
+    rng = random.Random(seed)
+    shapes = list(SHAPES) if shape == 'mixed' else [shape]
+    total_files = total_lines = total_bytes = 0
+
+    for shape_name in shapes:
+        factor, functions, depth, long_ratio = SHAPES[shape_name]
+        count = max(1, int(files * factor))
+        for i in range(count):
+            # 每 20 个文件放进一个子目录，模拟真实的包结构
+            directory = root / shape_name / f'pkg_{i // 20:04d}'
+            directory.mkdir(parents=True, exist_ok=True)
+            lines = ['"""合成模块。"""', 'import os', '']
+            for j in range(functions):
+                lines.extend(_function(rng, f'func_{j}', 0, depth, long_ratio))
+                lines.append('')
+            content = '\n'.join(lines) + '\n'
+            (directory / f'module_{i:05d}.py').write_text(content, encoding='utf-8')
+            total_files += 1
+            total_lines += len(lines)
+            total_bytes += len(content.encode('utf-8'))
+
+    return {
+        'shape': shape,
+        'seed': seed,
+        'files': total_files,
+        'lines': total_lines,
+        'bytes': total_bytes,
+    }
+
+
+def run_case(case, corpus_dir, jobs):
+    """
+    在当前进程中运行单个测量项，返回测量结果
+
+    参数:
+        case (str): review_file 或 review_directory
+        corpus_dir (str): 语料目录
+        jobs (int): review_directory 的并行进程数
+    """
+    sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+    from cursormind.core.code_review import CodeReview
+
+    paths = sorted(str(p) for p in Path(corpus_dir).rglob('*.py'))
+    lines = sum(Path(p).read_text(encoding='utf-8').count('\n') for p in paths)
+
+    def measure(reviewer):
+        start = time.perf_counter()
+        if case == 'review_file':
+            for path in paths:
+                reviewer.review_file(path)
+        else:
+            reviewer.review_directory(corpus_dir, jobs=jobs)
+        return time.perf_counter() - start
+
+    seconds = measure(CodeReview(use_cache=False))
+
+    # 单独跑一遍性能分析，避免计时包装影响吞吐量数据
+    profiled = CodeReview(use_cache=False, profile=True)
+    measure(profiled)
+    phases = {
+        name: entry['seconds']
+        for name, entry in profiled.profiler.to_dict()['phases'].items()
+    }
+
+    # Linux 上 ru_maxrss 的单位是 KB，macOS 上是字节
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if case == 'review_directory' and jobs > 1:
+        peak_rss = max(peak_rss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    if sys.platform == 'darwin':
+        peak_rss //= 1024
+
+    return {
+        'name': case if case == 'review_file' else f'{case}[jobs={jobs}]',
+        'files': len(paths),
+        'lines': lines,
+        'seconds': round(seconds, 6),
+        'files_per_sec': round(len(paths) / seconds, 2) if seconds else None,
+        'lines_per_sec': round(lines / seconds, 2) if seconds else None,
+        'peak_rss_kb': peak_rss,
+        'phases': phases,
+    }
+
+
+def _run_case_subprocess(case, corpus_dir, jobs, home):
+    """在独立的子进程中运行测量项，使峰值内存互不影响"""
+    env = dict(os.environ, HOME=home)
+    output = subprocess.run(
+        [sys.executable, __file__, '--run-case', case,
+         '--corpus', corpus_dir, '--jobs', str(jobs)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """
+    与基准结果对比吞吐量
+
+    返回:
+        list: 吞吐量下降超过阈值的测量项说明
+    """
+    previous = {r['name']: r for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        old = previous.get(result['name'])
+        if not old or not old.get('lines_per_sec') or not result.get('lines_per_sec'):
+            continue
+        change = result['lines_per_sec'] / old['lines_per_sec'] - 1
+        result['change'] = round(change, 4)
+        if change < -threshold:
+            regressions.append(
+                f"{result['name']}: {old['lines_per_sec']} -> "
+                f"{result['lines_per_sec']} 行/秒 ({change:+.1%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CursorMind 代码审查基准测试')
+    parser.add_argument('--shape', choices=['mixed', *SHAPES], default='mixed',
+                        help='语料形状')
+    parser.add_argument('--files', type=int, default=200, help='基准文件数')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='review_directory 的并行进程数')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='重复次数，取最快的一次')
+    parser.add_argument('--output', help='结果输出文件（默认输出到标准输出）')
+    parser.add_argument('--compare', help='用于对比的历史结果文件')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='判定为性能回退的吞吐量下降比例')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--corpus', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.corpus, args.jobs)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix='cursormind-bench-') as tmp:
+        corpus_dir = Path(tmp) / 'corpus'
+        home = Path(tmp) / 'home'
+        home.mkdir()
+        corpus = generate_corpus(corpus_dir, args.shape, args.files, args.seed)
+
+        results = []
+        cases = [('review_file', 1), ('review_directory', 1)]
+        if args.jobs > 1:
+            cases.append(('review_directory', args.jobs))
+        for case, jobs in cases:
+            runs = [
+                _run_case_subprocess(case, str(corpus_dir), jobs, str(home))
+                for _ in range(max(1, args.repeat))
+            ]
+            results.append(min(runs, key=lambda r: r['seconds']))
+
+    sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+    from cursormind import __version__
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'corpus': corpus,
+        'results': results,
+    }
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        report['regressions'] = regressions
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if regressions:
+        for line in regressions:
+            print(f"性能回退: {line}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
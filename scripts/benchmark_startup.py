@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CursorMind 启动性能基准测试脚本
+测量 `python -m cursormind --help`、`--version` 和每个命令组冷启动的
+耗时、`-X importtime` 的导入耗时分布，以及启动过程中打开、写入的文件数。
+每次运行都使用全新的临时 HOME 和工作目录，结果以 JSON 输出，超出预算
+（默认读取 scripts/startup_budget.json）时以非零状态退出。
+
+用法:
+    python3 scripts/benchmark_startup.py
+    python3 scripts/benchmark_startup.py --command "note today" --repeat 10
+    python3 scripts/benchmark_startup.py --budget my_budget.json --output startup.json
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET = Path(__file__).resolve().parent / 'startup_budget.json'
+
+# 在子进程中统计文件访问：通过审计钩子记录 open、mkdir 等事件，
+# 进程退出时把结果写入 CURSORMIND_BENCH_TRACE 指定的文件
+_TRACE_BOOTSTRAP = '''
+import atexit, json, os, runpy, sys
+
+_done = []
+_opened = {}
+_events = {"mkdir": 0, "listdir": 0, "remove": 0, "rename": 0}
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_TRUNC
+
+def _hook(event, args):
+    if _done:
+        return
+    if event == "open":
+        path, mode, flags = args
+        if path is None or isinstance(path, int):
+            return
+        if isinstance(mode, str):
+            write = any(c in mode for c in "wax+")
+        else:
+            write = bool(flags & _WRITE_FLAGS)
+        path = os.fsdecode(path)
+        _opened[path] = _opened.get(path, False) or write
+    elif event == "os.mkdir":
+        _events["mkdir"] += 1
+    elif event in ("os.listdir", "os.scandir"):
+        _events["listdir"] += 1
+    elif event in ("os.remove", "os.rmdir"):
+        _events["remove"] += 1
+    elif event in ("os.rename", "os.replace"):
+        _events["rename"] += 1
+
+def _dump():
+    # 审计钩子无法移除，写结果前停止记录
+    _done.append(True)
+    with open(os.environ["CURSORMIND_BENCH_TRACE"], "w", encoding="utf-8") as f:
+        json.dump({"opened": _opened, "events": _events}, f)
+
+atexit.register(_dump)
+sys.addaudithook(_hook)
+sys.argv = ["cursormind"] + sys.argv[1:]
+runpy.run_module("cursormind", run_name="__main__", alter_sys=True)
+'''
+
+
+def default_cases():
+    """
+    默认的测量项：主命令的 --help、--version，以及每个命令组的 --help
+
+    返回:
+        list: 命令行参数列表
+    """
+    sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+    from cursormind.cli import COMMAND_GROUPS
+
+    cases = [['--help'], ['--version']]
+    cases.extend([group, '--help'] for group in COMMAND_GROUPS)
+    return cases
+
+
+def _fresh_env(tmp):
+    """创建全新的 HOME 和工作目录，返回 (环境变量, 工作目录)"""
+    home = Path(tempfile.mkdtemp(prefix='home-', dir=tmp))
+    cwd = Path(tempfile.mkdtemp(prefix='cwd-', dir=tmp))
+    env = dict(os.environ, HOME=str(home))
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(PROJECT_ROOT / 'src'), os.environ.get('PYTHONPATH')])
+    )
+    # 不让字节码缓存的写入干扰文件统计
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env, cwd, home
+
+
+def _run(args, tmp, extra_env=None):
+    """在全新的 HOME 中运行一次，返回 (耗时秒数, 标准错误, HOME, 工作目录)"""
+    env, cwd, home = _fresh_env(tmp)
+    env.update(extra_env or {})
+    start = time.perf_counter()
+    result = subprocess.run(args, env=env, cwd=cwd, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"命令执行失败（退出码 {result.returncode}）: {shlex.join(args)}\n{result.stderr}"
+        )
+    return seconds, result.stderr, home, cwd
+
+
+def parse_importtime(stderr, top):
+    """
+    解析 -X importtime 的输出
+
+    参数:
+        stderr (str): 子进程的标准错误
+        top (int): 列出耗时最多的顶层导入数
+
+    返回:
+        dict: 总导入耗时、cursormind 自身模块的耗时、模块数和耗时最多的顶层导入
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        modules.append({
+            'module': name.strip(),
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+            # 模块名前的缩进表示嵌套层级，0 为顶层导入
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+
+    top_level = sorted(
+        (m for m in modules if m['depth'] == 0),
+        key=lambda m: m['cumulative_us'], reverse=True
+    )
+    return {
+        'import_ms': round(sum(m['self_us'] for m in modules) / 1000, 3),
+        'cursormind_ms': round(
+            sum(m['self_us'] for m in modules if m['module'].startswith('cursormind')) / 1000, 3
+        ),
+        'modules': len(modules),
+        'top_imports': [
+            {'module': m['module'], 'cumulative_ms': round(m['cumulative_us'] / 1000, 3)}
+            for m in top_level[:top]
+        ],
+    }
+
+
+def _created_files(*roots):
+    """统计目录中新创建的文件和目录（相对路径）"""
+    created = []
+    for root in roots:
+        for path in sorted(root.rglob('*')):
+            created.append(f"{root.name.split('-')[0]}/{path.relative_to(root).as_posix()}")
+    return created
+
+
+def trace_files(case, tmp):
+    """
+    运行一次并统计文件访问
+
+    返回:
+        dict: 打开的文件数、写入的文件数、各类目录操作次数，以及在 HOME
+        和工作目录中新建的文件
+    """
+    trace_file = Path(tmp) / 'trace.json'
+    _, _, home, cwd = _run(
+        [sys.executable, '-c', _TRACE_BOOTSTRAP, *case], tmp,
+        {'CURSORMIND_BENCH_TRACE': str(trace_file)}
+    )
+    with open(trace_file, 'r', encoding='utf-8') as f:
+        trace = json.load(f)
+    trace_file.unlink()
+    opened = trace['opened']
+    return {
+        'files_opened': len(opened),
+        'files_written': sum(1 for write in opened.values() if write),
+        'dirs_created': trace['events']['mkdir'],
+        'dirs_listed': trace['events']['listdir'],
+        'files_removed': trace['events']['remove'],
+        'files_renamed': trace['events']['rename'],
+        'created': _created_files(home, cwd),
+    }
+
+
+def run_case(case, repeat, top, tmp):
+    """
+    测量一个命令的冷启动
+
+    参数:
+        case (list): 命令行参数
+        repeat (int): 计时重复次数，每次使用全新的 HOME
+        top (int): 列出耗时最多的顶层导入数
+        tmp (str): 临时目录
+
+    返回:
+        dict: 测量结果
+    """
+    command = [sys.executable, '-m', 'cursormind', *case]
+    runs = [_run(command, tmp)[0] for _ in range(max(1, repeat))]
+
+    # 导入耗时和文件统计各单独跑一次，避免影响计时
+    _, stderr, _, _ = _run([sys.executable, '-X', 'importtime', '-m', 'cursormind', *case], tmp)
+
+    return {
+        'name': shlex.join(case),
+        'wall_ms': round(min(runs) * 1000, 3),
+        'wall_median_ms': round(statistics.median(runs) * 1000, 3),
+        **parse_importtime(stderr, top),
+        **trace_files(case, tmp),
+    }
+
+
+def load_budget(path):
+    """读取预算文件，文件不存在时返回 None"""
+    if not path or not Path(path).exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_budget(results, budget):
+    """
+    检查测量结果是否超出预算
+
+    预算文件的 default 适用于所有测量项，cases 中的键是测量项名称的
+    通配符模式（例如 "* --help"），按顺序覆盖匹配的测量项的预算。
+
+    返回:
+        list: 超出预算的说明
+    """
+    violations = []
+    for result in results:
+        limits = dict(budget.get('default', {}))
+        for pattern, case_limits in budget.get('cases', {}).items():
+            if fnmatch.fnmatchcase(result['name'], pattern):
+                limits.update(case_limits)
+        result['budget'] = limits
+        for metric, limit in limits.items():
+            value = result.get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{result['name']}: {metric} = {value}，预算 {limit}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CursorMind 启动性能基准测试')
+    parser.add_argument('--command', action='append', default=[],
+                        help='额外测量的命令，例如 "note today"，可以重复指定')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='计时重复次数，取最快的一次')
+    parser.add_argument('--top', type=int, default=10,
+                        help='列出耗时最多的顶层导入数')
+    parser.add_argument('--budget', default=str(DEFAULT_BUDGET),
+                        help='预算文件，为空字符串时不检查预算')
+    parser.add_argument('--output', help='结果输出文件（默认输出到标准输出）')
+    args = parser.parse_args()
+
+    cases = default_cases() + [shlex.split(command) for command in args.command]
+    with tempfile.TemporaryDirectory(prefix='cursormind-startup-') as tmp:
+        results = [run_case(case, args.repeat, args.top, tmp) for case in cases]
+
+    from cursormind import __version__
+
+    report = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeat': args.repeat,
+        'results': results,
+    }
+
+    violations = []
+    budget = load_budget(args.budget)
+    if budget is not None:
+        violations = check_budget(results, budget)
+        report['violations'] = violations
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if violations:
+        for line in violations:
+            print(f"超出预算: {line}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+"""
+命令组模块 - 每个子模块定义一个命令组，由 cli 按需导入 🧩
+
+共用的 rich 控制台在第一次使用 ``console`` 时才创建，只导入命令组模块
+（例如守护进程客户端的纯文本输出）不会导入 rich。
+"""
+
+
+def __getattr__(name):
+    if name == 'console':
+        from rich.console import Console
+
+        global console
+        console = Console()
+        return console
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,59 @@
+"""
+成就系统命令 🏆
+"""
+import click
+from cursormind.core.achievement import achievement_manager
+from cursormind.commands import console
+
+@click.group(name='achievement')
+def achievement():
+    """成就系统 🏆"""
+    pass
+
+@achievement.command(name='list')
+@click.option('--all', '-a', is_flag=True, help='显示所有成就，包括未解锁的')
+def achievement_list(all: bool):
+    """查看成就列表"""
+    achievements = achievement_manager.get_achievements(include_locked=all)
+    
+    console.print("\n🏆 成就系统")
+    stats = achievement_manager.get_stats()
+    console.print(f"总积分：[green]{stats['points']}[/green] 分")
+    console.print(f"已解锁：[blue]{len(stats['unlocked_achievements'])}[/blue] 个成就\n")
+    
+    for category, category_achievements in achievements.items():
+        if category_achievements:
+            console.print(f"\n[yellow]== {category.upper()} ==[/yellow]")
+            for achievement_id, achievement in category_achievements.items():
+                status = "[green]✓[/green]" if achievement['unlocked'] else "[grey]✗[/grey]"
+                console.print(
+                    f"{status} {achievement['icon']} [{'green' if achievement['unlocked'] else 'grey'}"
+                    f"]{achievement['name']}[/{'green' if achievement['unlocked'] else 'grey'}]"
+                )
+                console.print(f"   {achievement['description']}")
+                console.print(f"   奖励：[yellow]{achievement['reward']}[/yellow] 分")
+
+@achievement.command(name='stats')
+def achievement_stats():
+    """查看成就统计"""
+    stats = achievement_manager.get_stats()
+    
+    console.print("\n📊 学习统计")
+    console.print(f"总积分：[green]{stats['points']}[/green] 分")
+    console.print(f"解锁成就：[blue]{len(stats['unlocked_achievements'])}[/blue] 个")
+    
+    stats_data = stats['stats']
+    console.print("\n[yellow]== 学习路径 ==[/yellow]")
+    console.print(f"开始的路径：[blue]{stats_data['paths_started']}[/blue] 个")
+    console.print(f"完成的路径：[green]{stats_data['paths_completed']}[/green] 个")
+    
+    console.print("\n[yellow]== 笔记记录 ==[/yellow]")
+    console.print(f"笔记总数：[blue]{stats_data['notes_created']}[/blue] 条")
+    console.print(f"连续记录：[green]{stats_data['daily_streak']}[/green] 天")
+    console.print(f"使用的标签：[magenta]{len(stats_data['unique_tags'])}[/magenta] 个")
+    console.print(f"涉及的主题：[cyan]{len(stats_data['unique_topics'])}[/cyan] 个")
+    
+    console.print("\n[yellow]== 学习回顾 ==[/yellow]")
+    console.print(f"生成的回顾报告：[blue]{stats_data['reviews_generated']}[/blue] 次")
+    
+    console.print(f"\n最后更新：[grey]{stats['last_updated']}[/grey]")
@@ -0,0 +1,83 @@
+"""
+Cursor 规范框架命令 🎯
+"""
+import click
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from cursormind.core.cursor_framework import cursor_framework
+from cursormind.commands import console
+
+@click.group(name='cursor')
+def cursor():
+    """Cursor 规范框架 🎯"""
+    pass
+
+@cursor.command(name='init')
+@click.argument('project_path', type=click.Path(exists=True), default='.')
+@click.option('--template', '-t', default='default', help='项目模板名称')
+def cursor_init(project_path: str, template: str):
+    """初始化项目结构"""
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        progress.add_task("正在生成项目结构...", total=None)
+        if cursor_framework.generate_project_template(project_path, template):
+            console.print("[green]✨ 项目结构初始化成功！[/green]")
+        else:
+            console.print("[red]❌ 项目结构初始化失败[/red]")
+
+@cursor.command(name='check')
+@click.argument('project_path', type=click.Path(exists=True), default='.')
+def cursor_check(project_path: str):
+    """检查项目结构是否符合规范"""
+    issues = cursor_framework.check_project_structure(project_path)
+    
+    if not issues["missing_dirs"] and not issues["missing_files"]:
+        console.print("[green]✨ 项目结构符合规范！[/green]")
+        return
+    
+    console.print("[yellow]⚠️ 发现以下问题：[/yellow]")
+    
+    if issues["missing_dirs"]:
+        console.print("\n[red]缺少必要的目录：[/red]")
+        for dir_name in issues["missing_dirs"]:
+            console.print(f"- {dir_name}")
+    
+    if issues["missing_files"]:
+        console.print("\n[red]缺少必要的文件：[/red]")
+        for file_name in issues["missing_files"]:
+            console.print(f"- {file_name}")
+
+@cursor.command(name='commit')
+@click.argument('message')
+def cursor_commit(message: str):
+    """验证提交信息是否符合规范"""
+    result = cursor_framework.validate_commit_message(message)
+    
+    if result["valid"]:
+        console.print("[green]✨ 提交信息符合规范！[/green]")
+    else:
+        console.print("[red]❌ 提交信息不符合规范[/red]")
+        if not result["type_valid"]:
+            console.print("\n提交类型必须是以下之一：")
+            for type_ in cursor_framework.rules["git"]["commit_types"]:
+                console.print(f"- {type_}")
+        if not result["format_valid"]:
+            console.print(f"\n提交格式必须符合：[yellow]{cursor_framework.rules['git']['commit_format']}[/yellow]")
+            console.print("示例：feat(user): add login function")
+
+@cursor.command(name='branch')
+@click.argument('branch_name')
+def cursor_branch(branch_name: str):
+    """验证分支名称是否符合规范"""
+    result = cursor_framework.validate_branch_name(branch_name)
+    
+    if result["valid"]:
+        console.print("[green]✨ 分支名称符合规范！[/green]")
+    else:
+        console.print("[red]❌ 分支名称不符合规范[/red]")
+        console.print("\n分支名称格式必须符合：")
+        for type_, format_ in cursor_framework.rules["git"]["branch_format"].items():
+            console.print(f"- {type_}: {format_}")
+            console.print(f"  示例：{format_.replace('<name>', 'login')}")
@@ -0,0 +1,175 @@
+"""
+笔记命令 📝
+"""
+import click
+from rich.table import Table
+from rich.markdown import Markdown
+from cursormind.core.note_manager import note_manager
+from cursormind.commands import console
+
+@click.group(name='note')
+def note():
+    """笔记管理 📝"""
+    pass
+
+@note.command(name='add')
+@click.argument('content')
+@click.option('--topic', '-t', default='general', help='笔记主题')
+def note_add(content: str, topic: str):
+    """添加新笔记"""
+    note = note_manager.add_note(content, topic)
+    console.print(f"[green]✨ 笔记已保存！[/green]")
+    console.print(f"ID: [blue]{note['id']}[/blue]")
+    console.print(f"主题: [yellow]{note['topic']}[/yellow]")
+    if note['tags']:
+        console.print(f"标签: [magenta]{', '.join(note['tags'])}[/magenta]")
+
+@note.command(name='today')
+def note_today():
+    """查看今天的笔记"""
+    notes = note_manager.get_daily_notes()
+    if notes:
+        console.print("\n📝 今日笔记：")
+        for note in notes:
+            console.print(f"\n[blue]{note['created_at']}[/blue]")
+            console.print(f"[yellow]主题：{note['topic']}[/yellow]")
+            if note['tags']:
+                console.print(f"[magenta]标签：{', '.join(note['tags'])}[/magenta]")
+            console.print(Markdown(note['content']))
+    else:
+        console.print("[yellow]今天还没有记录笔记哦～[/yellow]")
+
+@note.command(name='topic')
+@click.argument('topic')
+def note_topic(topic: str):
+    """查看指定主题的笔记"""
+    notes = note_manager.get_topic_notes(topic)
+    if notes:
+        console.print(f"\n📚 主题 [green]{topic}[/green] 的笔记：")
+        for note in notes:
+            console.print(f"\n[blue]{note['created_at']}[/blue]")
+            if note['tags']:
+                console.print(f"[magenta]标签：{', '.join(note['tags'])}[/magenta]")
+            console.print(Markdown(note['content']))
+    else:
+        console.print(f"[yellow]还没有 {topic} 主题的笔记～[/yellow]")
+
+@note.command(name='search')
+@click.argument('query')
+@click.option('--limit', '-n', default=10, type=click.IntRange(min=1), help='最多显示的笔记数')
+@click.option('--all', 'show_all', is_flag=True, help='按时间列出所有包含关键词的笔记，不按相关度排序')
+def note_search(query: str, limit: int, show_all: bool):
+    """搜索笔记
+
+    默认按相关度显示最匹配的几条。查询中的词都要出现，英文按单词开头匹配（pyth
+    能找到 python，thon 不能）；用引号括起的 "短语" 要连续出现；topic:主题
+    和 tag:标签 只显示指定主题或标签的笔记。
+    """
+    if show_all:
+        results = [(None, note) for note in note_manager.search_notes(query)]
+    else:
+        results = note_manager.rank_notes(query, limit)
+    if results:
+        console.print(f"\n🔍 搜索结果：")
+        for score, note in results:
+            console.print(f"\n[blue]{note['created_at']}[/blue]")
+            if score:
+                console.print(f"[cyan]相关度：{score:.2f}[/cyan]")
+            console.print(f"[yellow]主题：{note['topic']}[/yellow]")
+            if note['tags']:
+                console.print(f"[magenta]标签：{', '.join(note['tags'])}[/magenta]")
+            console.print(Markdown(note['content']))
+    else:
+        console.print(f"[yellow]没有找到匹配的笔记～[/yellow]")
+
+@note.command(name='reindex')
+def note_reindex():
+    """重建笔记搜索索引、每日摘要和统计数据
+
+    每个中日韩文字和每个英文单词各算一个字，#python装饰器 的标签是 python。
+    旧版本按空格分词，统计的字数、标签和超过 100 字的亮点笔记与现在不同，升级后运行一次即可按当前规则重新统计。
+    """
+    with console.status("正在重建搜索索引..."):
+        count = note_manager.rebuild_index()
+        days = note_manager.rebuild_summaries()
+        stats = note_manager.rebuild_stats()
+    if count < 0:
+        console.print("[red]❌ 搜索索引重建失败[/red]")
+    else:
+        console.print(f"[green]✨ 搜索索引已重建，共 {count} 条笔记[/green]")
+    console.print(f"[green]✨ 每日摘要已重建，共 {days} 天[/green]")
+    console.print(
+        f"[green]✨ 统计数据已重建，共 {stats['total_notes']} 条笔记、"
+        f"{stats['total_words']} 字[/green]"
+    )
+
+@note.command(name='compact')
+def note_compact():
+    """整理每日笔记文件"""
+    counts = note_manager.compact_daily_notes()
+    console.print(f"[green]✨ 已整理 {len(counts)} 天、共 {sum(counts.values())} 条每日笔记[/green]")
+
+@note.command(name='stats')
+def note_stats():
+    """查看笔记统计信息"""
+    stats = note_manager.get_stats()
+    
+    console.print("\n📊 笔记统计：")
+    console.print(f"总笔记数：[blue]{stats['total_notes']}[/blue] 条")
+    console.print(f"总字数：[blue]{stats['total_words']}[/blue] 字")
+    console.print(f"连续记录：[green]{stats['daily_streak']}[/green] 天")
+    
+    if stats['topics']:
+        console.print("\n📚 主题分布：")
+        topics_table = Table(show_header=False)
+        topics_table.add_column("主题", style="yellow")
+        topics_table.add_column("数量", style="cyan", justify="right")
+        for topic, count in sorted(stats['topics'].items(), key=lambda x: x[1], reverse=True):
+            topics_table.add_row(topic, str(count))
+        console.print(topics_table)
+    
+    if stats['tags']:
+        console.print("\n🏷️ 常用标签：")
+        tags_table = Table(show_header=False)
+        tags_table.add_column("标签", style="magenta")
+        tags_table.add_column("使用次数", style="cyan", justify="right")
+        for tag, count in sorted(stats['tags'].items(), key=lambda x: x[1], reverse=True)[:10]:
+            tags_table.add_row(tag, str(count))
+        console.print(tags_table)
+
+@note.command(name='review')
+@click.option('--days', '-d', default=7, help='要回顾的天数')
+def note_review(days: int):
+    """生成学习回顾报告"""
+    review = note_manager.generate_review(days)
+    
+    console.print(f"\n📅 学习回顾：{review['period']}")
+    console.print(f"记录笔记：[blue]{review['total_notes']}[/blue] 条")
+    console.print(f"总字数：[blue]{review['total_words']}[/blue] 字")
+    
+    if review['topics']:
+        console.print("\n📚 主题分布：")
+        topics_table = Table(show_header=False)
+        topics_table.add_column("主题", style="yellow")
+        topics_table.add_column("数量", style="cyan", justify="right")
+        for topic, count in sorted(review['topics'].items(), key=lambda x: x[1], reverse=True):
+            topics_table.add_row(topic, str(count))
+        console.print(topics_table)
+    
+    if review['tags']:
+        console.print("\n🏷️ 常用标签：")
+        tags_table = Table(show_header=False)
+        tags_table.add_column("标签", style="magenta")
+        tags_table.add_column("使用次数", style="cyan", justify="right")
+        for tag, count in sorted(review['tags'].items(), key=lambda x: x[1], reverse=True)[:10]:
+            tags_table.add_row(tag, str(count))
+        console.print(tags_table)
+    
+    if review['highlights']:
+        console.print("\n✨ 学习亮点：")
+        for note in review['highlights']:
+            console.print(f"\n[blue]{note['created_at']}[/blue]")
+            console.print(f"[yellow]主题：{note['topic']}[/yellow]")
+            if note['tags']:
+                console.print(f"[magenta]标签：{', '.join(note['tags'])}[/magenta]")
+            console.print(Markdown(note['content']))
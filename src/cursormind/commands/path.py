@@ -0,0 +1,117 @@
+"""
+学习路径命令 🗺️
+"""
+import click
+from rich.table import Table
+from cursormind.core.learning_path import learning_path_manager
+from cursormind.commands import console
+
+@click.group(name='path')
+def path():
+    """学习路径管理 🗺️"""
+    pass
+
+@path.command(name='list')
+def path_list():
+    """列出所有可用的学习路径"""
+    paths = learning_path_manager.get_all_paths()
+    
+    table = Table(title="可用的学习路径")
+    table.add_column("ID", style="cyan")
+    table.add_column("名称", style="green")
+    table.add_column("描述", style="blue")
+    table.add_column("难度", style="yellow")
+    table.add_column("预计时间", style="magenta")
+    
+    for path in paths:
+        table.add_row(
+            path['id'],
+            path['name'],
+            path['description'],
+            path['difficulty'],
+            path['estimated_time']
+        )
+    
+    console.print(table)
+
+@path.command(name='start')
+@click.argument('path_id')
+def path_start(path_id: str):
+    """开始一个学习路径"""
+    if learning_path_manager.set_current_path(path_id):
+        progress = learning_path_manager.get_current_progress()
+        console.print(f"[green]✨ 成功开始学习路径：{progress['path_name']}[/green]")
+        console.print(f"\n当前阶段：[yellow]{progress['current_stage_name']}[/yellow]")
+        console.print(f"当前任务：[blue]{progress['current_step_name']}[/blue]")
+        
+        # 显示学习资源
+        resources = learning_path_manager.get_current_resources()
+        if resources:
+            console.print("\n📚 推荐学习资源：")
+            for resource in resources:
+                console.print(f"- {resource['name']}: {resource['url']}")
+        
+        # 显示练习项目
+        projects = learning_path_manager.get_current_projects()
+        if projects:
+            console.print("\n🎯 练习项目：")
+            for project in projects:
+                console.print(f"- {project['name']}: {project['description']}")
+    else:
+        console.print(f"[red]❌ 未找到ID为 {path_id} 的学习路径[/red]")
+
+@path.command(name='status')
+def path_status():
+    """查看当前学习进度"""
+    progress = learning_path_manager.get_current_progress()
+    if progress:
+        console.print(f"\n📊 当前学习进度：[green]{progress['path_name']}[/green]")
+        console.print(f"阶段：[yellow]{progress['current_stage_name']}[/yellow]")
+        console.print(f"任务：[blue]{progress['current_step_name']}[/blue]")
+        console.print(f"完成度：[magenta]{progress['progress']} ({progress['percentage']}%)[/magenta]")
+        
+        # 显示当前阶段的资源和项目
+        resources = learning_path_manager.get_current_resources()
+        if resources:
+            console.print("\n📚 当前阶段学习资源：")
+            for resource in resources:
+                console.print(f"- {resource['name']}: {resource['url']}")
+        
+        projects = learning_path_manager.get_current_projects()
+        if projects:
+            console.print("\n🎯 当前阶段练习项目：")
+            for project in projects:
+                console.print(f"- {project['name']}: {project['description']}")
+    else:
+        console.print("[yellow]⚠️ 你还没有开始任何学习路径[/yellow]")
+        console.print("使用 [green]cursormind path list[/green] 查看可用的学习路径")
+        console.print("使用 [green]cursormind path start <路径ID>[/green] 开始学习")
+
+@path.command(name='next')
+def path_next():
+    """完成当前任务，进入下一个任务"""
+    progress_before = learning_path_manager.get_current_progress()
+    if not progress_before:
+        console.print("[yellow]⚠️ 你还没有开始任何学习路径[/yellow]")
+        return
+    
+    if learning_path_manager.advance_progress():
+        progress = learning_path_manager.get_current_progress()
+        console.print(f"[green]✨ 恭喜完成任务：{progress_before['current_step_name']}[/green]")
+        if progress:
+            console.print(f"\n下一个任务：[blue]{progress['current_step_name']}[/blue]")
+            
+            # 显示新任务的资源和项目
+            resources = learning_path_manager.get_current_resources()
+            if resources:
+                console.print("\n📚 推荐学习资源：")
+                for resource in resources:
+                    console.print(f"- {resource['name']}: {resource['url']}")
+            
+            projects = learning_path_manager.get_current_projects()
+            if projects:
+                console.print("\n🎯 练习项目：")
+                for project in projects:
+                    console.print(f"- {project['name']}: {project['description']}")
+        else:
+            console.print("[yellow]🎉 恭喜！你已经完成了当前学习路径的所有任务！[/yellow]")
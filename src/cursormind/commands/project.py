@@ -0,0 +1,248 @@
+"""
+项目管理命令 📋
+"""
+import click
+from typing import Dict
+from rich.table import Table
+from rich.markdown import Markdown
+from cursormind.core.project_manager import project_manager
+from cursormind.commands import console
+
+@click.group(name='project')
+def project():
+    """项目管理 📋"""
+    pass
+
+@project.command(name='create')
+@click.argument('title')
+@click.option('--type', '-t', 'type_', help='任务类型')
+@click.option('--priority', '-p', help='优先级')
+@click.option('--assignee', '-a', help='负责人')
+@click.option('--description', '-d', help='任务描述')
+@click.option('--deadline', help='截止日期 (YYYY-MM-DD)')
+@click.option('--tags', help='标签（逗号分隔）')
+def project_create(title: str, type_: str, priority: str, assignee: str,
+                  description: str, deadline: str, tags: str):
+    """创建新任务"""
+    kwargs = {}
+    if type_:
+        kwargs['type'] = type_
+    if priority:
+        kwargs['priority'] = priority
+    if assignee:
+        kwargs['assignee'] = assignee
+    if description:
+        kwargs['description'] = description
+    if deadline:
+        kwargs['deadline'] = deadline
+    if tags:
+        kwargs['tags'] = [tag.strip() for tag in tags.split(',')]
+    
+    task = project_manager.create_task(title, **kwargs)
+    console.print(f"[green]✨ 任务创建成功！[/green]")
+    _print_task_details(task)
+
+@project.command(name='list')
+@click.option('--status', '-s', help='任务状态')
+@click.option('--priority', '-p', help='优先级')
+@click.option('--type', '-t', 'type_', help='任务类型')
+@click.option('--assignee', '-a', help='负责人')
+@click.option('--tags', help='标签（逗号分隔）')
+def project_list(status: str, priority: str, type_: str, assignee: str, tags: str):
+    """列出任务"""
+    tags_list = [tag.strip() for tag in tags.split(',')] if tags else None
+    tasks = project_manager.list_tasks(
+        status=status,
+        priority=priority,
+        type_=type_,
+        assignee=assignee,
+        tags=tags_list
+    )
+    
+    if not tasks:
+        console.print("[yellow]没有找到匹配的任务[/yellow]")
+        return
+    
+    table = Table(title="任务列表")
+    table.add_column("ID", style="cyan")
+    table.add_column("标题", style="green")
+    table.add_column("状态", style="yellow")
+    table.add_column("优先级", style="red")
+    table.add_column("类型", style="blue")
+    table.add_column("负责人", style="magenta")
+    table.add_column("截止日期", style="cyan")
+    
+    for task in tasks:
+        table.add_row(
+            task['id'],
+            task['title'],
+            task['status'],
+            task['priority'],
+            task['type'],
+            task['assignee'] or '-',
+            task['deadline'] or '-'
+        )
+    
+    console.print(table)
+
+@project.command(name='show')
+@click.argument('task_id')
+def project_show(task_id: str):
+    """查看任务详情"""
+    task = project_manager.get_task(task_id)
+    if not task:
+        console.print(f"[red]未找到任务：{task_id}[/red]")
+        return
+    
+    _print_task_details(task)
+
+@project.command(name='update')
+@click.argument('task_id')
+@click.option('--title', '-t', help='任务标题')
+@click.option('--status', '-s', help='任务状态')
+@click.option('--priority', '-p', help='优先级')
+@click.option('--type', 'type_', help='任务类型')
+@click.option('--assignee', '-a', help='负责人')
+@click.option('--description', '-d', help='任务描述')
+@click.option('--deadline', help='截止日期 (YYYY-MM-DD)')
+@click.option('--tags', help='标签（逗号分隔）')
+def project_update(task_id: str, **kwargs):
+    """更新任务"""
+    if kwargs.get('tags'):
+        kwargs['tags'] = [tag.strip() for tag in kwargs['tags'].split(',')]
+    
+    task = project_manager.update_task(task_id, **{k: v for k, v in kwargs.items() if v is not None})
+    if not task:
+        console.print(f"[red]未找到任务：{task_id}[/red]")
+        return
+    
+    console.print(f"[green]✨ 任务更新成功！[/green]")
+    _print_task_details(task)
+
+@project.command(name='subtask')
+@click.argument('task_id')
+@click.argument('title')
+@click.option('--status', '-s', help='任务状态')
+def project_subtask(task_id: str, title: str, status: str):
+    """添加子任务"""
+    kwargs = {}
+    if status:
+        kwargs['status'] = status
+    
+    subtask = project_manager.add_subtask(task_id, title, **kwargs)
+    if not subtask:
+        console.print(f"[red]未找到任务：{task_id}[/red]")
+        return
+    
+    console.print(f"[green]✨ 子任务添加成功！[/green]")
+    console.print(f"ID: [blue]{subtask['id']}[/blue]")
+    console.print(f"标题: [green]{subtask['title']}[/green]")
+    console.print(f"状态: [yellow]{subtask['status']}[/yellow]")
+
+@project.command(name='note')
+@click.argument('task_id')
+@click.argument('content')
+def project_note(task_id: str, content: str):
+    """添加任务笔记"""
+    note = project_manager.add_note(task_id, content)
+    if not note:
+        console.print(f"[red]未找到任务：{task_id}[/red]")
+        return
+    
+    console.print(f"[green]✨ 笔记添加成功！[/green]")
+    console.print(f"ID: [blue]{note['id']}[/blue]")
+    console.print(f"内容: [green]{note['content']}[/green]")
+    console.print(f"时间: [yellow]{note['created_at']}[/yellow]")
+
+@project.command(name='link')
+@click.argument('task_id')
+@click.argument('related_task_id')
+def project_link(task_id: str, related_task_id: str):
+    """关联任务"""
+    if project_manager.link_tasks(task_id, related_task_id):
+        console.print(f"[green]✨ 任务关联成功！[/green]")
+    else:
+        console.print(f"[red]任务关联失败，请检查任务ID是否正确[/red]")
+
+@project.command(name='stats')
+def project_stats():
+    """查看任务统计"""
+    stats = project_manager.get_task_stats()
+    
+    console.print("\n📊 任务统计")
+    console.print(f"总任务数：[blue]{stats['total_tasks']}[/blue]")
+    console.print(f"完成率：[green]{stats['completion_rate']:.1f}%[/green]")
+    console.print(f"平均完成时间：[yellow]{stats['average_completion_time']:.1f} 天[/yellow]")
+    
+    if stats['status_counts']:
+        console.print("\n[cyan]== 状态分布 ==[/cyan]")
+        for status, count in stats['status_counts'].items():
+            console.print(f"{status}: [blue]{count}[/blue]")
+    
+    if stats['priority_counts']:
+        console.print("\n[cyan]== 优先级分布 ==[/cyan]")
+        for priority, count in stats['priority_counts'].items():
+            console.print(f"{priority}: [blue]{count}[/blue]")
+    
+    if stats['type_counts']:
+        console.print("\n[cyan]== 类型分布 ==[/cyan]")
+        for type_, count in stats['type_counts'].items():
+            console.print(f"{type_}: [blue]{count}[/blue]")
+    
+    if stats['assignee_counts']:
+        console.print("\n[cyan]== 负责人分布 ==[/cyan]")
+        for assignee, count in stats['assignee_counts'].items():
+            console.print(f"{assignee}: [blue]{count}[/blue]")
+    
+    if stats['tag_counts']:
+        console.print("\n[cyan]== 标签统计 ==[/cyan]")
+        for tag, count in sorted(stats['tag_counts'].items(), key=lambda x: x[1], reverse=True)[:10]:
+            console.print(f"{tag}: [blue]{count}[/blue]")
+
+def _print_task_details(task: Dict):
+    """打印任务详情"""
+    console.print(f"\n[cyan]== 任务详情 ==[/cyan]")
+    console.print(f"ID: [blue]{task['id']}[/blue]")
+    console.print(f"标题: [green]{task['title']}[/green]")
+    console.print(f"状态: [yellow]{task['status']}[/yellow]")
+    console.print(f"优先级: [red]{task['priority']}[/red]")
+    console.print(f"类型: [magenta]{task['type']}[/magenta]")
+    
+    if task['description']:
+        console.print("\n[cyan]描述:[/cyan]")
+        console.print(Markdown(task['description']))
+    
+    if task['assignee']:
+        console.print(f"负责人: [blue]{task['assignee']}[/blue]")
+    
+    if task['deadline']:
+        console.print(f"截止日期: [yellow]{task['deadline']}[/yellow]")
+    
+    if task['tags']:
+        console.print(f"标签: [magenta]{', '.join(task['tags'])}[/magenta]")
+    
+    if task['subtasks']:
+        console.print("\n[cyan]子任务:[/cyan]")
+        for subtask in task['subtasks']:
+            status_color = "green" if subtask['status'] == "已完成" else "yellow"
+            console.print(
+                f"- [{status_color}]{subtask['status']}[/{status_color}] "
+                f"{subtask['title']} [blue]({subtask['id']})[/blue]"
+            )
+    
+    if task['notes']:
+        console.print("\n[cyan]笔记:[/cyan]")
+        for note in task['notes']:
+            console.print(f"\n[blue]{note['created_at']}[/blue]")
+            console.print(Markdown(note['content']))
+    
+    if task['related_tasks']:
+        console.print("\n[cyan]关联任务:[/cyan]")
+        for related_id in task['related_tasks']:
+            related_task = project_manager.get_task(related_id)
+            if related_task:
+                console.print(
+                    f"- [blue]{related_id}[/blue]: "
+                    f"[green]{related_task['title']}[/green] "
+                    f"([yellow]{related_task['status']}[/yellow])"
+                )
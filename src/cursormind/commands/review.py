@@ -0,0 +1,748 @@
+"""
+代码审查命令 🔍
+
+审查引擎、基线、分片、监视和守护进程模块在用到它们的命令中才导入，
+rich 在第一次富文本输出时才导入。守护进程正在运行时，
+``review file --plain`` 只需要导入 click 和套接字协议。
+"""
+import click
+import json
+import signal
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from cursormind.core.review_render import (
+    DEFAULT_PAGE_SIZE, ReviewRenderer, page_issues, summarize
+)
+from cursormind.core.review_server import review_via_daemon
+from cursormind.utils.lazy import LazyInstance
+
+if TYPE_CHECKING:
+    from cursormind.core.code_review import CodeReview
+    from cursormind.core.review_baseline import Baseline
+
+def _shared_console():
+    """命令组共用的控制台"""
+    from cursormind.commands import console
+    return console
+
+# 第一次输出时才创建控制台
+console = LazyInstance(_shared_console)
+
+def _parse_shard_option(ctx, param, value):
+    """解析 --shard 参数"""
+    from cursormind.core.review_shard import parse_shard_spec
+    
+    if value is None:
+        return None
+    try:
+        return parse_shard_spec(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+def _render_options(func):
+    """问题列表的分页、分组和输出模式选项"""
+    func = click.option('--plain', is_flag=True,
+                        help='纯文本输出，每个问题一行，便于其他程序处理')(func)
+    func = click.option('--group-by', type=click.Choice(['file', 'rule']), default=None,
+                        help='按文件或规则分组显示问题')(func)
+    func = click.option('--limit', type=click.IntRange(min=0), default=None,
+                        help=f'最多显示的问题数（默认 {DEFAULT_PAGE_SIZE}，纯文本模式默认全部）')(func)
+    func = click.option('--offset', type=click.IntRange(min=0), default=0,
+                        help='从第几个问题开始显示')(func)
+    return func
+
+def _render_review(title: str, fields: List, issues: List[Dict], offset: int,
+                   limit: Optional[int], group_by: Optional[str], top: int,
+                   plain: bool, stats: Optional[Dict] = None,
+                   file_path: Optional[str] = None):
+    """先输出汇总，再输出一页问题"""
+    renderer = ReviewRenderer(console, plain, file_path=file_path)
+    if stats is None:
+        stats = summarize(issues)
+    renderer.header(title, fields)
+    renderer.summary(stats, top)
+    page = page_issues(issues, offset, renderer.default_limit(limit), group_by)
+    renderer.page(page, offset, stats["total"], group_by)
+
+@click.group(name='review')
+def review():
+    """代码审查 🔍"""
+    pass
+
+@review.command(name='file')
+@click.argument('file_path', type=click.Path(exists=True))
+@click.option('--no-cache', is_flag=True, help='不使用审查结果缓存')
+@click.option('--save', is_flag=True, help='保存审查报告，之后可用 review show 查看')
+@click.option('--no-daemon', is_flag=True, help='不使用审查守护进程，在当前进程中审查')
+@_render_options
+@click.option('--top', type=click.IntRange(min=0), default=10,
+              help='汇总中列出问题最多的规则数量')
+def review_file(file_path, no_cache, save, no_daemon, offset, limit, group_by, plain, top):
+    """审查单个文件。
+
+    如果 review serve 守护进程正在运行，交给守护进程审查，
+    否则在当前进程中审查。
+
+    Args:
+        file_path: 要审查的文件路径
+        no_cache: 是否禁用缓存
+        save: 是否保存审查报告
+        no_daemon: 是否不使用守护进程
+        offset: 从第几个问题开始显示
+        limit: 最多显示的问题数
+        group_by: 问题分组方式
+        plain: 是否纯文本输出
+        top: 汇总中列出的条目数
+    """
+    try:
+        # 守护进程总是使用缓存，禁用缓存时在当前进程中审查
+        report = None
+        if not no_cache and not no_daemon:
+            report = review_via_daemon(file_path)
+        if report is not None:
+            report["file"] = file_path
+        else:
+            from cursormind.core.code_review import CodeReview
+            reviewer = CodeReview(use_cache=not no_cache)
+            with console.status("正在审查文件..."):
+                report = reviewer.review_file(file_path)
+        
+        _render_review(
+            "文件审查报告",
+            [("文件", report["file"]), ("时间", report["time"])],
+            report["issues"], offset, limit, group_by, top, plain,
+            file_path=report["file"]
+        )
+        
+        if save:
+            from cursormind.core.code_review import CodeReview
+            _save_review_report(CodeReview(use_cache=False), report)
+        
+    except Exception as e:
+        console.print(f"[red]错误：{str(e)}[/red]")
+        raise click.Abort()
+
+@review.command(name='dir')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='并行进程数（默认为 CPU 核数）')
+@click.option('--no-cache', is_flag=True, help='不使用审查结果缓存')
+@click.option('--exclude', '-e', multiple=True,
+              help='额外的排除规则（.gitignore 语法），可多次指定')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'json', 'jsonl']),
+              default='text',
+              help='输出格式，json 输出完整报告，jsonl 模式逐个文件实时输出')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-',
+              help='json / jsonl 模式的输出文件（默认为标准输出）')
+@click.option('--shard', callback=_parse_shard_option, default=None, metavar='I/N',
+              help='只审查第 I 个分片（共 N 个），用于把审查分给多个 CI 任务')
+@click.option('--balance', is_flag=True, help='分片时按文件大小做负载均衡')
+@click.option('--timings', 'timings_file', type=click.Path(exists=True, dir_okay=False),
+              default=None,
+              help='上一次分片审查的报告，按其中记录的耗时做负载均衡')
+@click.option('--baseline', default=None, metavar='REPORT',
+              help='基线报告（报告ID或文件），只输出相对基线新增和已修复的问题，'
+                   '内容未变的文件不重新审查')
+@click.option('--fail-on', type=click.Choice(['error', 'warning', 'info']), default=None,
+              help='存在该级别及以上的问题（指定基线时为新增问题）时以非零状态退出')
+@click.option('--profile', is_flag=True, help='统计各规则、各阶段和各文件的耗时')
+@click.option('--top', type=click.IntRange(min=0), default=10,
+              help='汇总中列出问题最多的文件和规则数量，以及性能分析中列出最慢的文件数量')
+@click.option('--save', is_flag=True, help='保存审查报告，之后可用 review show 查看')
+@click.option('--compact', is_flag=True,
+              help='以压缩的紧凑格式保存报告（配合 --save 使用）')
+@_render_options
+def review_directory(directory, jobs, no_cache, exclude, output_format, output,
+                     shard, balance, timings_file, baseline, fail_on, profile, top,
+                     save, compact, offset, limit, group_by, plain):
+    """审查目录中的所有Python文件。
+
+    Args:
+        directory: 要审查的目录路径
+        jobs: 并行进程数
+        no_cache: 是否禁用缓存
+        exclude: 额外的排除规则
+        output_format: 输出格式
+        output: json / jsonl 模式的输出文件
+        shard: (分片序号, 分片总数)
+        balance: 分片时是否按文件大小做负载均衡
+        timings_file: 记录了各文件耗时的上一次报告
+        baseline: 基线报告的ID或文件路径
+        fail_on: 导致非零退出的最低严重程度
+        profile: 是否统计耗时
+        top: 汇总和性能分析中列出的条目数
+        save: 是否保存审查报告
+        compact: 是否以紧凑格式保存报告
+        offset: 从第几个问题开始显示
+        limit: 最多显示的问题数
+        group_by: 问题分组方式
+        plain: 是否纯文本输出
+    """
+    from cursormind.core.code_review import CodeReview
+    from cursormind.core.review_shard import load_report_file
+    
+    reviewer = CodeReview(use_cache=not no_cache, profile=profile)
+    base = None
+    if baseline:
+        base = reviewer.load_baseline(baseline)
+        if base is None:
+            console.print(f"[red]未找到基线报告：{baseline}[/red]")
+            raise click.Abort()
+    
+    try:
+        timings = None
+        if timings_file:
+            timings = load_report_file(timings_file).get("timings", {})
+            if shard is None:
+                console.print("[yellow]未指定 --shard，忽略 --timings[/yellow]")
+        
+        if output_format == 'jsonl':
+            final = _write_review_jsonl(reviewer, directory, jobs, list(exclude), output,
+                                        top, shard, balance, timings, base)
+            _check_fail_on(
+                final["baseline"]["new"] if base is not None else None,
+                fail_on, final["summary"]["issue_severities"]
+            )
+            return
+        
+        with console.status("正在审查目录..."):
+            report = reviewer.review_directory(
+                directory, jobs=jobs, exclude=list(exclude),
+                shard=shard, balance=balance, timings=timings, baseline=base
+            )
+        if reviewer.profiler is not None:
+            report["profile"] = reviewer.profiler.to_dict(top)
+        
+        if output_format == 'json':
+            json.dump(report, output, ensure_ascii=False, indent=2)
+            output.write("\n")
+            output.flush()
+            if save:
+                _save_review_report(reviewer, report, 'compact' if compact else None)
+            _check_fail_on(_gated_issues(report), fail_on)
+            return
+        
+        fields = [("目录", report["directory"])]
+        if shard is not None:
+            fields.append(("分片", f"{shard[0]}/{shard[1]}"))
+        if base is not None:
+            fields.append((
+                "基线",
+                f"{baseline}，{report['baseline']['reused_files']} 个文件未修改，沿用基线结果"
+            ))
+        fields += [("时间", report["time"]), ("审查文件数", report["files_reviewed"])]
+        
+        if base is not None:
+            # 指定基线时只输出新增和已修复的问题
+            renderer = ReviewRenderer(console, plain)
+            renderer.header("目录审查报告", fields)
+            renderer.summary(summarize(report["issues"]), top)
+            _print_baseline_diff(report["baseline"], renderer, offset, limit, group_by)
+        else:
+            _render_review("目录审查报告", fields, report["issues"],
+                           offset, limit, group_by, top, plain)
+        
+        if "profile" in report:
+            _print_review_profile(report["profile"])
+        
+        if save:
+            _save_review_report(reviewer, report, 'compact' if compact else None)
+        
+    except Exception as e:
+        console.print(f"[red]错误：{str(e)}[/red]")
+        raise click.Abort()
+    
+    _check_fail_on(_gated_issues(report), fail_on)
+
+def _gated_issues(report: Dict) -> List[Dict]:
+    """--fail-on 检查的问题：指定基线时只检查新增问题"""
+    if "baseline" in report:
+        return report["baseline"]["new"]
+    return report["issues"]
+
+def _check_fail_on(issues: Optional[List[Dict]], fail_on: Optional[str],
+                   severities: Optional[Dict[str, int]] = None):
+    """存在不低于 fail_on 级别的问题时以非零状态退出。
+
+    Args:
+        issues: 要检查的问题
+        fail_on: 导致非零退出的最低严重程度，为 None 时不检查
+        severities: 没有问题列表时使用的严重程度分布
+    """
+    if not fail_on:
+        return
+    levels = ['info', 'warning', 'error']
+    threshold = levels.index(fail_on)
+    if issues is not None:
+        severities = {}
+        for issue in issues:
+            severities[issue['severity']] = severities.get(issue['severity'], 0) + 1
+    if any(
+        count and severity in levels and levels.index(severity) >= threshold
+        for severity, count in (severities or {}).items()
+    ):
+        raise SystemExit(1)
+
+def _print_baseline_diff(diff: Dict, renderer: Optional[ReviewRenderer] = None,
+                         offset: int = 0, limit: Optional[int] = None,
+                         group_by: Optional[str] = None):
+    """打印相对基线新增和已修复的问题，两者分别分页"""
+    renderer = renderer or ReviewRenderer(console)
+    limit = renderer.default_limit(limit)
+    for title, key, color in (("新增问题", "new", "red"), ("已修复问题", "fixed", "green")):
+        issues = diff[key]
+        if renderer.plain:
+            # 纯文本模式下以注释行分隔两部分
+            renderer.stream.write(f"# {title}：{len(issues)}\n")
+        else:
+            console.print(f"\n[{color}]{title}：{len(issues)}[/{color}]")
+        renderer.page(page_issues(issues, offset, limit, group_by), offset, len(issues),
+                      group_by)
+
+@review.command(name='diff')
+@click.option('--base', default='HEAD', help='对比的基准（分支、标签或提交），默认为 HEAD')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='并行进程数（默认为 CPU 核数）')
+@click.option('--no-cache', is_flag=True, help='不使用审查结果缓存')
+@click.option('--fail-on', type=click.Choice(['error', 'warning', 'info']), default=None,
+              help='存在该级别及以上的问题时以非零状态退出')
+def review_diff(base, jobs, no_cache, fail_on):
+    """只审查相对于基准被修改的文件和代码行。
+
+    Args:
+        base: 对比的基准
+        jobs: 并行进程数
+        no_cache: 是否禁用缓存
+        fail_on: 导致非零退出的最低严重程度
+    """
+    from cursormind.core.code_review import CodeReview
+    
+    try:
+        reviewer = CodeReview(use_cache=not no_cache)
+        report = reviewer.review_diff(base=base, jobs=jobs)
+    except Exception as e:
+        console.print(f"[red]错误：{str(e)}[/red]")
+        raise click.Abort()
+    
+    console.print("\n== 修改审查报告 ==")
+    console.print(f"仓库：{report['directory']}")
+    console.print(f"基准：{report['base']}")
+    console.print(f"审查文件数：{report.get('files_reviewed', 0)}")
+    
+    issues = report["issues"]
+    console.print(f"\n总问题数：{len(issues)}")
+    
+    if issues:
+        console.print("\n具体问题：\n")
+        ReviewRenderer(console).issues(issues)
+    
+    _check_fail_on(issues, fail_on)
+
+@review.command(name='diff-report')
+@click.argument('old')
+@click.argument('new')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'json']),
+              default='text', help='输出格式')
+@click.option('--fail-on', type=click.Choice(['error', 'warning', 'info']), default=None,
+              help='存在该级别及以上的新增问题时以非零状态退出')
+def review_diff_report(old, new, output_format, fail_on):
+    """比较两份审查报告，只输出新增和已修复的问题。
+
+    OLD 和 NEW 为报告ID或报告文件。问题按文件、规则和所在行的内容
+    匹配，与行号无关。
+
+    Args:
+        old: 旧报告
+        new: 新报告
+        output_format: 输出格式
+        fail_on: 导致非零退出的最低严重程度
+    """
+    from cursormind.core.code_review import CodeReview
+    from cursormind.core.review_baseline import diff_reports
+    
+    reviewer = CodeReview(use_cache=False)
+    reports = []
+    for reference in (old, new):
+        report = reviewer.load_report(reference)
+        if report is None:
+            console.print(f"[red]未找到报告：{reference}[/red]")
+            raise click.Abort()
+        reports.append(report)
+    
+    diff = diff_reports(*reports)
+    if output_format == 'json':
+        click.echo(json.dumps(diff, ensure_ascii=False, indent=2))
+    else:
+        console.print("\n== 报告对比 ==")
+        console.print(f"旧报告：{old}")
+        console.print(f"新报告：{new}")
+        _print_baseline_diff(diff)
+    
+    _check_fail_on(diff["new"], fail_on)
+
+@review.command(name='merge')
+@click.argument('reports', nargs=-1, required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default=None,
+              help='把合并后的报告以 JSON 格式写入文件')
+@click.option('--allow-partial', is_flag=True, help='缺少部分分片时仍然合并')
+@click.option('--save', is_flag=True, help='保存合并后的报告，之后可用 review show 查看')
+@click.option('--compact', is_flag=True,
+              help='以压缩的紧凑格式保存报告（配合 --save 使用）')
+def review_merge(reports, output, allow_partial, save, compact):
+    """合并各分片的审查报告。
+
+    REPORTS 为 review dir --shard 以 json 或 jsonl 格式输出的报告，
+    或者保存的报告文件。
+
+    Args:
+        reports: 分片报告文件
+        output: 合并后报告的输出文件
+        allow_partial: 是否允许缺少分片
+        save: 是否保存合并后的报告
+        compact: 是否以紧凑格式保存报告
+    """
+    from cursormind.core.review_shard import load_report_file, merge_reports
+    
+    try:
+        report = merge_reports(
+            [load_report_file(path) for path in reports], allow_partial
+        )
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"[red]错误：{str(e)}[/red]")
+        raise click.Abort()
+    
+    shards = report["shards"]
+    console.print("\n== 合并审查报告 ==")
+    console.print(f"目录：{report['directory']}")
+    console.print(f"分片：已合并 {len(shards['merged'])}/{shards['count']}")
+    if shards["missing"]:
+        console.print(
+            "[yellow]缺少分片："
+            + "、".join(f"{i}/{shards['count']}" for i in shards["missing"])
+            + "[/yellow]"
+        )
+    console.print(f"审查文件数：{report['files_reviewed']}")
+    console.print(f"\n总问题数：{report['total_issues']}")
+    
+    if report["issue_types"]:
+        console.print("\n问题类型分布：")
+        for type_name, count in report["issue_types"].items():
+            console.print(f"- {type_name}: {count}")
+    
+    if report["issue_severities"]:
+        console.print("\n严重程度分布：")
+        for severity, count in report["issue_severities"].items():
+            console.print(f"- {severity}: {count}")
+    
+    if output is not None:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+        output.write("\n")
+        console.print(f"\n[green]合并后的报告已写入 {output.name}[/green]")
+    
+    if save:
+        from cursormind.core.code_review import CodeReview
+        _save_review_report(CodeReview(use_cache=False), report,
+                            'compact' if compact else None)
+
+def _save_review_report(reviewer: "CodeReview", report: Dict,
+                        report_format: Optional[str] = None):
+    """保存审查报告并打印报告ID"""
+    report_id = reviewer.save_report(report, report_format)
+    if report_id:
+        console.print(f"[green]✨ 报告已保存，ID：[blue]{report_id}[/blue][/green]")
+    else:
+        console.print("[red]❌ 报告保存失败[/red]")
+
+def _print_review_profile(profile: Dict):
+    """打印审查耗时统计"""
+    from rich.table import Table
+    
+    console.print("\n[cyan]== 性能分析 ==[/cyan]")
+    console.print(
+        f"文件数：{profile['files']}，"
+        f"总耗时：{profile['total_seconds'] * 1000:.1f} ms"
+    )
+    
+    for title, key in (("阶段耗时", "phases"), ("规则耗时", "rules")):
+        table = Table(title=title)
+        table.add_column("名称", style="yellow")
+        table.add_column("调用次数", style="cyan", justify="right")
+        table.add_column("总耗时 (ms)", style="red", justify="right")
+        table.add_column("平均 (µs)", style="blue", justify="right")
+        for name, entry in profile[key].items():
+            table.add_row(
+                name,
+                str(entry["calls"]),
+                f"{entry['seconds'] * 1000:.2f}",
+                f"{entry['seconds'] * 1e6 / max(entry['calls'], 1):.2f}"
+            )
+        console.print(table)
+    
+    if profile["slowest_files"]:
+        table = Table(title="最慢的文件")
+        table.add_column("文件", style="blue")
+        table.add_column("耗时 (ms)", style="red", justify="right")
+        for entry in profile["slowest_files"]:
+            table.add_row(entry["file"], f"{entry['seconds'] * 1000:.2f}")
+        console.print(table)
+
+def _write_review_jsonl(reviewer: "CodeReview", directory: str,
+                        jobs: Optional[int], exclude: List[str], output,
+                        top: int = 10, shard: Optional[Tuple[int, int]] = None,
+                        balance: bool = False,
+                        timings: Optional[Dict[str, float]] = None,
+                        baseline: Optional["Baseline"] = None) -> Dict:
+    """以 JSON Lines 格式逐个文件输出审查结果，最后一行为汇总，并返回汇总。"""
+    from cursormind.core.review_baseline import BaselineDiff
+    from cursormind.core.review_shard import relative_path
+    
+    summary = {
+        "files_reviewed": 0,
+        "total_issues": 0,
+        "issue_types": {},
+        "issue_severities": {}
+    }
+    root = str(Path(directory).resolve())
+    file_times = {}
+    diff = None if baseline is None else BaselineDiff(baseline, root)
+    for result in reviewer.iter_review_directory(
+        directory, jobs, exclude, shard, balance, timings, baseline
+    ):
+        summary = result.pop("summary")
+        if shard is not None:
+            file_times[relative_path(result["file"], root)] = result.get("seconds", 0.0)
+        if diff is not None:
+            diff.add(result)
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+    
+    # 各文件的内容哈希在逐行结果中，读取时还原为报告的 digests
+    final = {
+        "directory": directory,
+        "root": root,
+        "time": datetime.now().isoformat(),
+        "rules": reviewer._rules_fingerprint(),
+        "summary": summary
+    }
+    if shard is not None:
+        final["shard"] = {"index": shard[0], "count": shard[1]}
+        final["timings"] = file_times
+    if diff is not None:
+        final["baseline"] = diff.finish(complete=shard is None)
+    if reviewer.profiler is not None:
+        final["profile"] = reviewer.profiler.to_dict(top)
+    output.write(json.dumps(final, ensure_ascii=False) + "\n")
+    output.flush()
+    return final
+
+@review.command(name='watch')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+              help='首次完整审查的并行进程数（默认为 CPU 核数）')
+@click.option('--exclude', '-e', multiple=True,
+              help='额外的排除规则（.gitignore 语法），可多次指定')
+@click.option('--interval', type=click.FloatRange(min=0.05), default=0.5,
+              help='检查文件变化的间隔（秒）')
+@click.option('--debounce', type=click.FloatRange(min=0), default=0.5,
+              help='最后一次修改后等待多久再审查（秒）')
+@click.option('--poll', is_flag=True,
+              help='始终轮询文件变化，不使用 watchdog 的文件系统事件')
+def review_watch(directory, jobs, exclude, interval, debounce, poll):
+    """监视目录，文件修改后只重新审查变化的文件并打印新增和已修复的问题。
+
+    Args:
+        directory: 要监视的目录路径
+        jobs: 首次完整审查的并行进程数
+        exclude: 额外的排除规则
+        interval: 检查间隔
+        debounce: 去抖等待时间
+        poll: 是否始终轮询
+    """
+    from cursormind.core.code_review import CodeReview
+    from cursormind.core.review_watch import ReviewWatcher
+    
+    watcher = ReviewWatcher(
+        CodeReview(), directory, list(exclude),
+        jobs=jobs, interval=interval, debounce=debounce,
+        use_events=not poll
+    )
+    
+    try:
+        with console.status("正在审查目录..."):
+            summary = watcher.start()
+    except KeyboardInterrupt:
+        watcher.close()
+        console.print("\n[yellow]已停止监视[/yellow]")
+        return
+    # 之后每批只有少量文件，串行审查避免反复创建进程池
+    watcher.jobs = 1
+    _print_watch_summary(summary)
+    console.print("[cyan]正在监视文件变化，按 Ctrl+C 退出...[/cyan]")
+    
+    try:
+        for batch in watcher.watch():
+            console.print(
+                f"\n[cyan]{datetime.now().strftime('%H:%M:%S')} "
+                f"重新审查 {len(batch['files'])} 个文件[/cyan]"
+            )
+            for issue in batch["new"]:
+                console.print(
+                    f"[red]+ {issue['severity'].upper()}[/red] "
+                    f"{issue['file']}:{issue['line']} "
+                    f"[yellow]{issue['rule']}[/yellow] {issue['message']}"
+                )
+            for issue in batch["fixed"]:
+                console.print(
+                    f"[green]- 已修复[/green] "
+                    f"{issue['file']}:{issue['line']} "
+                    f"[yellow]{issue['rule']}[/yellow] {issue['message']}"
+                )
+            _print_watch_summary(
+                batch["summary"], len(batch["new"]), len(batch["fixed"])
+            )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]已停止监视[/yellow]")
+
+def _print_watch_summary(summary: Dict, new: int = 0, fixed: int = 0):
+    """打印监视模式的问题统计"""
+    severities = "，".join(
+        f"{severity} {count}"
+        for severity, count in summary["issue_severities"].items()
+    )
+    delta = f"（新增 {new}，修复 {fixed}）" if new or fixed else ""
+    console.print(
+        f"{summary['files_reviewed']} 个文件，共 {summary['total_issues']} 个问题"
+        f"{delta}" + (f"：{severities}" if severities else "")
+    )
+
+@review.command(name='serve')
+@click.option('--stop', is_flag=True, help='停止正在运行的守护进程')
+@click.option('--status', is_flag=True, help='查看守护进程是否在运行')
+def review_serve(stop, status):
+    """启动审查守护进程，保持规则、配置和缓存常驻。
+
+    守护进程在前台运行，按 Ctrl+C 停止。升级 CursorMind 后需要重新启动。
+
+    Args:
+        stop: 是否停止正在运行的守护进程
+        status: 是否只查看运行状态
+    """
+    from cursormind.core.review_server import ReviewServer, send_request
+    
+    if stop or status:
+        response = send_request({"op": "shutdown" if stop else "ping"})
+        if response is None:
+            console.print("[yellow]审查守护进程未运行[/yellow]")
+        elif stop:
+            console.print("[green]✨ 审查守护进程已停止[/green]")
+        else:
+            console.print(
+                f"[green]审查守护进程正在运行[/green] "
+                f"（PID {response['pid']}，版本 {response['version']}，"
+                f"已处理 {response['requests']} 个请求）"
+            )
+        return
+    
+    try:
+        server = ReviewServer()
+    except (RuntimeError, OSError) as e:
+        console.print(f"[red]错误：{str(e)}[/red]")
+        raise click.Abort()
+    
+    # 收到 SIGTERM 时和 Ctrl+C 一样正常退出并删除套接字文件
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    console.print(f"[green]审查守护进程已启动：[blue]{server.socket_path}[/blue][/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        console.print("\n[yellow]审查守护进程已退出[/yellow]")
+
+@review.command(name='clear-cache')
+def review_clear_cache():
+    """清空审查结果缓存"""
+    from cursormind.core.code_review import CodeReview
+    
+    reviewer = CodeReview()
+    if reviewer.cache is None:
+        console.print("[yellow]审查结果缓存未启用[/yellow]")
+        return
+    
+    reviewer.cache.clear()
+    console.print("[green]✨ 审查结果缓存已清空[/green]")
+
+@review.command(name='list')
+def review_list():
+    """列出审查报告"""
+    from rich.table import Table
+    from cursormind.core.code_review import CodeReview
+    
+    reports = CodeReview().list_reports()
+    
+    if not reports:
+        console.print("[yellow]还没有审查报告[/yellow]")
+        return
+    
+    table = Table(title="审查报告列表")
+    table.add_column("ID", style="cyan")
+    table.add_column("时间", style="blue")
+    table.add_column("目标", style="green")
+    table.add_column("问题数", style="red", justify="right")
+    
+    for report in reports:
+        table.add_row(
+            report["id"],
+            report["timestamp"],
+            report["target"],
+            str(report["total_issues"])
+        )
+    
+    console.print(table)
+
+@review.command(name='show')
+@click.argument('report_id')
+@_render_options
+@click.option('--top', type=click.IntRange(min=0), default=10,
+              help='汇总中列出问题最多的文件和规则数量')
+def review_show(report_id: str, offset: int, limit: Optional[int],
+                group_by: Optional[str], plain: bool, top: int):
+    """查看审查报告"""
+    from cursormind.core.code_review import CodeReview
+    
+    stored = CodeReview().open_report(report_id)
+    
+    if stored is None:
+        console.print(f"[red]未找到报告：{report_id}[/red]")
+        return
+    
+    meta = stored.meta
+    if "file" in meta:
+        title = "文件审查报告"
+        fields = [("文件", meta["file"])]
+    else:
+        title = "目录审查报告"
+        fields = [
+            ("目录", meta.get("directory")),
+            ("文件数", meta.get("summary", {}).get("total_files", meta.get("files_reviewed")))
+        ]
+    fields.append(("时间", meta.get("timestamp") or meta.get("time", "")))
+    
+    renderer = ReviewRenderer(console, plain, file_path=meta.get("file"))
+    renderer.header(title, fields)
+    # 紧凑格式的报告用头部中的计数统计，不解压问题
+    stats = stored.summary()
+    if stats is None:
+        stats = summarize(stored.iter_issues())
+    renderer.summary(stats, top)
+    
+    limit = renderer.default_limit(limit)
+    if group_by is None:
+        # 不分组时只读取当前页，紧凑格式的报告只解压涉及的块
+        page = list(stored.iter_issues(offset, limit))
+    else:
+        page = page_issues(stored.iter_issues(), offset, limit, group_by)
+    renderer.page(page, offset, stored.total, group_by)
@@ -7,6 +7,7 @@ from datetime import datetime
 import pytz
 from pathlib import Path
 from typing import Dict, Any, Optional
+from ..utils.lazy import LazyInstance
 
 class Settings:
     """配置管理类"""
@@ -73,6 +74,9 @@ class Settings:
             'learning_paths_dir': 'learning_paths',  # 学习路径目录
             'notes_dir': 'learning_notes',     # 笔记目录
             'backups_dir': 'backups',          # 备份目录
+            'notes_fsync': 'always',           # 笔记写入策略：always 每次保存都写入磁盘，never 由系统决定
+            'stats_flush_every': 0,            # 统计数据累计多少次修改后写回，0 表示命令结束时写回
+            'stats_flush_interval': 0,         # 统计数据距上次写回多少秒后写回，0 表示命令结束时写回
             
             # 学习记录
             'start_date': self._get_timestamp(),  # 开始使用日期
@@ -111,5 +115,5 @@ class Settings:
 """
         print(welcome_message)
 
-# 创建全局配置实例
-settings = Settings() 
\ No newline at end of file
+# 创建全局配置实例，第一次读取配置时才加载（首次使用时创建配置文件）
+settings = LazyInstance(Settings) 
\ No newline at end of file
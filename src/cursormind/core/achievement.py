@@ -6,6 +6,9 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from ..utils.helpers import get_timestamp, ensure_dir
+from ..utils.lazy import LazyInstance
+from ..utils.write_behind import WriteBehindStore
+from ..config.settings import settings
 
 class AchievementManager:
     """成就系统管理器"""
@@ -22,10 +25,16 @@ class AchievementManager:
         
         # 初始化成就数据
         self._ensure_achievements_file()
-        self._ensure_stats_file()
         
-        # 加载成就定义和用户统计
+        # 加载成就定义和用户统计，统计数据在命令结束时统一写回
         self.achievements = self._load_achievements()
+        self._stats_store = WriteBehindStore(
+            self.stats_file,
+            self._default_stats,
+            flush_every=settings.get('stats_flush_every', 0),
+            flush_interval=settings.get('stats_flush_interval', 0),
+            json_default=lambda x: sorted(x) if isinstance(x, set) else x
+        )
         self.stats = self._load_stats()
     
     def _ensure_achievements_file(self):
@@ -103,27 +112,23 @@ class AchievementManager:
             with open(self.achievements_file, 'w', encoding='utf-8') as f:
                 json.dump(default_achievements, f, ensure_ascii=False, indent=2)
     
-    def _ensure_stats_file(self):
-        """确保用户统计文件存在"""
-        if not os.path.exists(self.stats_file):
-            default_stats = {
-                "points": 0,
-                "unlocked_achievements": [],
-                "stats": {
-                    "paths_started": 0,
-                    "paths_completed": 0,
-                    "notes_created": 0,
-                    "daily_streak": 0,
-                    "unique_tags": set(),
-                    "unique_topics": set(),
-                    "reviews_generated": 0
-                },
-                "last_updated": get_timestamp()
-            }
-            
-            with open(self.stats_file, 'w', encoding='utf-8') as f:
-                json.dump(default_stats, f, ensure_ascii=False, indent=2, 
-                         default=lambda x: list(x) if isinstance(x, set) else x)
+    @staticmethod
+    def _default_stats() -> Dict:
+        """新的用户统计数据"""
+        return {
+            "points": 0,
+            "unlocked_achievements": [],
+            "stats": {
+                "paths_started": 0,
+                "paths_completed": 0,
+                "notes_created": 0,
+                "daily_streak": 0,
+                "unique_tags": [],
+                "unique_topics": [],
+                "reviews_generated": 0
+            },
+            "last_updated": get_timestamp()
+        }
     
     def _load_achievements(self) -> Dict:
         """加载成就定义"""
@@ -132,18 +137,19 @@ class AchievementManager:
     
     def _load_stats(self) -> Dict:
         """加载用户统计数据"""
-        with open(self.stats_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
-            # 将列表转换回集合
-            stats['stats']['unique_tags'] = set(stats['stats']['unique_tags'])
-            stats['stats']['unique_topics'] = set(stats['stats']['unique_topics'])
-            return stats
+        stats = self._stats_store.data
+        # 将列表转换回集合
+        stats['stats']['unique_tags'] = set(stats['stats']['unique_tags'])
+        stats['stats']['unique_topics'] = set(stats['stats']['unique_topics'])
+        return stats
     
     def _save_stats(self):
-        """保存用户统计数据"""
-        with open(self.stats_file, 'w', encoding='utf-8') as f:
-            json.dump(self.stats, f, ensure_ascii=False, indent=2,
-                     default=lambda x: list(x) if isinstance(x, set) else x)
+        """记录统计数据已修改，在命令结束时统一写回"""
+        self._stats_store.mark_dirty()
+    
+    def flush_stats(self) -> None:
+        """立即写回统计数据"""
+        self._stats_store.flush()
     
     def _check_achievements(self) -> List[Dict]:
         """检查是否有新的成就达成"""
@@ -226,7 +232,8 @@ class AchievementManager:
     def get_stats(self) -> Dict:
         """获取用户统计信息"""
         stats = self.stats.copy()
-        # 转换集合为列表以便序列化
+        # 转换集合为列表以便序列化，不修改内存中的统计数据
+        stats['stats'] = stats['stats'].copy()
         stats['stats']['unique_tags'] = list(stats['stats']['unique_tags'])
         stats['stats']['unique_topics'] = list(stats['stats']['unique_topics'])
         return stats
@@ -251,5 +258,5 @@ class AchievementManager:
                     result[category][achievement_id] = achievement_data
         return result
 
-# 创建全局实例
-achievement_manager = AchievementManager() 
\ No newline at end of file
+# 创建全局实例，第一次使用时才初始化
+achievement_manager = LazyInstance(AchievementManager) 
\ No newline at end of file
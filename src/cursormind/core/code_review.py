@@ -4,10 +4,97 @@
 import os
 import ast
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import hashlib
+import mmap
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, Callable, Iterator, Iterable
 from pathlib import Path
+import re
 import subprocess
+import sys
+import time
+from contextlib import nullcontext
 from datetime import datetime
+from .. import __version__
+from .review_cache import ReviewCache, content_digest
+from .review_discovery import DEFAULT_EXCLUDES, iter_python_files
+from .review_lexer import LexicalTable, iter_scan, scan
+from .review_profile import ReviewProfiler
+from .review_rules import (
+    CATEGORIES, FunctionMetrics, ReviewRule, build_dispatch, create_rules,
+    is_builtin, rule_group, rule_signature
+)
+from .review_baseline import Baseline, BaselineDiff, add_context
+from .review_shard import load_report_file, relative_path, select_shard
+from .review_report import CompactReport, JsonReport, write_compact_report
+from ..utils.lazy import LazyInstance
+
+# 规则实现发生变化（会影响审查结果）时递增，使旧的缓存结果失效
+RULES_REVISION = 3
+
+# 并行审查时每次交给工作进程的文件数
+PARALLEL_BATCH = 8
+
+# 并行审查时每个工作进程最多排队的批次数，限制尚未输出的结果占用的内存
+PARALLEL_WINDOW = 4
+
+# 完整审查（解析语法树）的最大文件大小，更大的文件只执行逐行规则
+MAX_PARSE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# 可审查的最大文件大小，更大的文件直接跳过
+MAX_FILE_SIZE = 256 * 1024 * 1024  # 256MB
+
+# 单个文件的默认审查时间预算（秒）
+TIME_BUDGET = 30.0
+
+# 遍历语法树时每处理这么多个节点检查一次时间预算
+DEADLINE_CHECK_NODES = 4096
+
+# 大文件流式词法分析时每块的字节数
+LARGE_FILE_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 性能分析模式下单独计时的函数度量遍历回调，规则本身按规则名计时
+PROFILED_METHODS = (
+    "_count_branch", "_count_local", "_count_return", "_count_statement",
+)
+
+_NO_PROFILE = nullcontext()
+
+# 报告在函数或类定义行上、需要按整个定义范围判断是否被修改的规则
+DEFINITION_RULES = {
+    "docstring", "complexity", "locals", "returns", "statements"
+}
+
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# 报告格式对应的文件扩展名
+REPORT_FORMATS = {"json": ".json", "compact": ".cmr"}
+
+
+class _WalkState:
+    """一次审查中各规则共享的状态。"""
+
+    __slots__ = ("function", "functions", "issues")
+
+    def __init__(self, groups: List[str]):
+        self.function: Optional[FunctionMetrics] = None
+        self.functions: List[FunctionMetrics] = []
+        # 每个问题分组的问题列表
+        self.issues: Dict[str, List[Dict[str, Any]]] = {
+            group: [] for group in groups
+        }
+
+
+def _collect(issues: List[Dict[str, Any]], result: Any) -> None:
+    """把规则的返回值（单个问题、问题序列或 None）加入问题列表。"""
+    if result is None:
+        return
+    if isinstance(result, dict):
+        issues.append(result)
+    else:
+        issues.extend(result)
+
 
 class CodeReview:
     """代码审查类，用于检查代码质量和安全性。
@@ -18,8 +105,19 @@ class CodeReview:
     3. 安全性检查：SQL注入、命令注入等
     """
 
-    def __init__(self):
-        """初始化代码审查类，设置配置目录和加载配置。"""
+    def __init__(
+        self,
+        use_cache: bool = True,
+        config: Optional[Dict[str, Any]] = None,
+        profile: bool = False
+    ):
+        """初始化代码审查类，设置配置目录和加载配置。
+
+        Args:
+            use_cache: 是否使用审查结果缓存
+            config: 审查配置，默认从配置文件加载
+            profile: 是否统计各规则和各阶段的耗时
+        """
         self.config_dir = (
             Path.home() / 
             ".cursormind" / 
@@ -29,7 +127,58 @@ class CodeReview:
         self.reports_dir = self.config_dir / "reports"
         self.reports_dir.mkdir(exist_ok=True)
         self.config_file = self.config_dir / "config.json"
-        self.config = self._load_config()
+        self.config = config if config is not None else self._load_config()
+        limits = self.config.get("limits", {})
+        self.max_parse_size = int(
+            limits.get("max_parse_size_mb", MAX_PARSE_SIZE / 1024 / 1024)
+            * 1024 * 1024
+        )
+        self.max_file_size = int(
+            limits.get("max_file_size_mb", MAX_FILE_SIZE / 1024 / 1024)
+            * 1024 * 1024
+        )
+        self.time_budget = float(limits.get("time_budget_seconds", TIME_BUDGET))
+        self.rules: List[ReviewRule] = create_rules(self.config)
+        self._build_dispatch()
+        self.cache = self._create_cache() if use_cache else None
+        self.profiler: Optional[ReviewProfiler] = None
+        if profile:
+            self.enable_profiling()
+
+    def enable_profiling(self) -> ReviewProfiler:
+        """开启性能分析，为每个规则单独计时。
+
+        计时包装只挂在当前实例上，未开启时规则调用没有任何额外开销。
+
+        Returns:
+            ReviewProfiler: 收集统计数据的对象
+        """
+        if self.profiler is not None:
+            return self.profiler
+
+        self.profiler = ReviewProfiler()
+        for name in PROFILED_METHODS:
+            setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+        for rule in self.rules:
+            label = rule.name if is_builtin(type(rule)) else f"plugin:{rule.name}"
+            for method in ("visit", "check_line", "check_function"):
+                setattr(rule, method, self.profiler.wrap(
+                    label, getattr(rule, method)
+                ))
+
+        # 分发表引用的是绑定方法，需要按包装后的方法重建
+        self._build_dispatch()
+        return self.profiler
+
+    def _phase(self, name: str):
+        """返回统计某一阶段耗时的上下文，未开启性能分析时不做任何事。
+
+        Args:
+            name: 阶段名称
+        """
+        if self.profiler is None:
+            return _NO_PROFILE
+        return self.profiler.phase(name)
 
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件，如果不存在则创建默认配置。
@@ -61,6 +210,27 @@ class CodeReview:
                 "file_risk_functions": [
                     "open", "read", "write"
                 ]
+            },
+            "cache": {
+                "enabled": True,
+                "max_size_mb": 256
+            },
+            "discovery": {
+                "exclude": list(DEFAULT_EXCLUDES),
+                "use_gitignore": True
+            },
+            "report": {
+                "format": "json"
+            },
+            "plugins": {
+                "enabled": True,
+                "disabled": [],
+                "options": {}
+            },
+            "limits": {
+                "max_parse_size_mb": MAX_PARSE_SIZE // 1024 // 1024,
+                "max_file_size_mb": MAX_FILE_SIZE // 1024 // 1024,
+                "time_budget_seconds": TIME_BUDGET
             }
         }
 
@@ -95,6 +265,45 @@ class CodeReview:
         except Exception as e:
             print(f"保存配置文件时出错：{str(e)}")
 
+    def _rules_fingerprint(self) -> str:
+        """计算规则配置和工具版本的指纹，任一变化都会使缓存失效。
+
+        Returns:
+            str: 十六进制指纹
+        """
+        payload = json.dumps(
+            {
+                "version": __version__,
+                "revision": RULES_REVISION,
+                "rules": {
+                    key: self.config.get(key)
+                    for key in (
+                        "style", "performance", "security", "plugins", "limits"
+                    )
+                },
+                "plugins": [rule_signature(rule) for rule in self.rules],
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _create_cache(self) -> Optional[ReviewCache]:
+        """根据配置创建审查结果缓存。
+
+        Returns:
+            Optional[ReviewCache]: 缓存对象，配置中禁用时返回 None
+        """
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+
+        return ReviewCache(
+            self.config_dir / "cache.db",
+            self._rules_fingerprint(),
+            int(cache_config.get("max_size_mb", 256) * 1024 * 1024)
+        )
+
     def _safe_open(self, file_path: str, mode: str = "r") -> Optional[Path]:
         """安全地打开文件。
         
@@ -126,452 +335,523 @@ class CodeReview:
             is_safe = is_safe and not path.is_symlink()
                 
             # 文件大小检查
-            is_safe = is_safe and path.stat().st_size <= 10 * 1024 * 1024  # 10MB
+            is_safe = is_safe and path.stat().st_size <= self.max_file_size
                 
             return path if is_safe else None
             
         except (TypeError, ValueError, OSError):
             return None
 
-    def _check_line_length(self, lines: List[str]) -> List[Dict[str, Any]]:
-        """检查行长度。
+    def _parsing_error(self, e: Exception) -> Dict[str, Any]:
+        """将解析或遍历过程中的异常转换为问题字典。
 
         Args:
-            lines: 代码行列表
+            e: 捕获到的异常
 
         Returns:
-            包含行长度问题的列表
+            描述该异常的问题字典
         """
-        issues = []
-        max_length = self.config["style"]["max_line_length"]
-        
-        for i, line in enumerate(lines, 1):
-            if len(line.rstrip()) > max_length:
-                issues.append({
-                    "type": "style",
-                    "rule": "line_length",
-                    "message": (
-                        f"行长度超过 {max_length} "
-                        "个字符"
-                    ),
-                    "line": i,
-                    "severity": "warning"
-                })
-        
-        return issues
+        return {
+            "type": "error",
+            "rule": "parsing",
+            "message": f"解析代码时出错：{str(e)}",
+            "line": (e.lineno or 1) if isinstance(e, SyntaxError) else 1,
+            "severity": "error"
+        }
+
+    def _build_dispatch(self) -> None:
+        """按启用的规则建立分发表和问题分组，创建实例时建立一次。
 
-    def _check_indentation(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """检查缩进。
+        同一节点上先执行函数度量的遍历回调，再按规则顺序执行规则；
+        函数度量只在有规则订阅时统计。
+        """
+        self._line_rules = [rule for rule in self.rules if rule.lexical]
+        self._function_rules = [rule for rule in self.rules if rule.functions]
+
+        subscriptions: List[Tuple[Any, Callable]] = []
+        if self._function_rules:
+            subscriptions += [
+                (ast.FunctionDef, self._visit_function),
+                ((ast.If, ast.For, ast.While, ast.Try), self._count_branch),
+                (ast.Name, self._count_local),
+                (ast.Return, self._count_return),
+                (ast.stmt, self._count_statement),
+            ]
+        subscriptions += [
+            (rule.node_types, self._rule_visitor(rule))
+            for rule in self.rules
+            if rule.node_types
+        ]
+        self._dispatch = build_dispatch(subscriptions)
+
+        # 每种类型的问题按分组第一次出现的顺序输出
+        self._groups: Dict[str, List[str]] = {
+            category: [] for category in CATEGORIES
+        }
+        for rule in self.rules:
+            groups = self._groups[rule.category]
+            if rule_group(rule) not in groups:
+                groups.append(rule_group(rule))
+
+    def _rule_visitor(self, rule: ReviewRule) -> Callable:
+        """把规则的 visit 包装为遍历回调。
+
+        规则出错时只记录一个错误问题，不影响其他规则。
 
         Args:
-            tree: AST树
+            rule: 规则
 
         Returns:
-            包含缩进问题的列表
+            遍历回调
         """
-        issues = []
-        indent_size = self.config["style"]["indent_size"]
-        
-        for node in ast.walk(tree):
-            if isinstance(
-                node, 
-                (ast.FunctionDef, ast.ClassDef, ast.If, ast.For, ast.While)
-            ):
-                if (hasattr(node, "col_offset") and 
-                    node.col_offset % indent_size != 0):
-                    issues.append({
-                        "type": "style",
-                        "rule": "indentation",
-                        "message": (
-                            f"缩进应该是 {indent_size} "
-                            "的倍数"
-                        ),
-                        "line": node.lineno,
-                        "severity": "warning"
-                    })
-        
-        return issues
+        group = rule_group(rule)
+        visit = rule.visit
+
+        def visitor(node: ast.AST, state: "_WalkState") -> None:
+            try:
+                _collect(state.issues[group], visit(node))
+            except Exception as e:
+                state.issues[group].append(
+                    self._rule_error(rule, e, getattr(node, "lineno", 1))
+                )
+
+        return visitor
+
+    def _rule_error(
+        self, rule: ReviewRule, e: Exception, line: int
+    ) -> Dict[str, Any]:
+        """生成规则执行出错的问题。"""
+        return {
+            "type": "error",
+            "rule": rule.name,
+            "message": f"规则执行出错：{str(e)}",
+            "line": line,
+            "severity": "error"
+        }
+
+    def _run_line_rules(
+        self, lexical: LexicalTable, state: "_WalkState"
+    ) -> None:
+        """对行信息表中的每一行执行逐行规则，问题追加到遍历状态中。
 
-    def _check_docstring(self, tree: ast.AST) -> List[Dict[str, Any]]:
-        """检查文档字符串。
+        Args:
+            lexical: 行信息表，可以是大文件的一个分块
+            state: 收集问题的遍历状态
+        """
+        issues = state.issues
+        line_rules = [(rule, issues[rule_group(rule)]) for rule in self._line_rules]
+        for i in lexical.line_numbers():
+            for rule, rule_issues in line_rules:
+                try:
+                    _collect(rule_issues, rule.check_line(i, lexical))
+                except Exception as e:
+                    rule_issues.append(self._rule_error(rule, e, i))
+
+    def _walk_tree(
+        self, tree: ast.AST, state: "_WalkState", deadline: Optional[float]
+    ) -> bool:
+        """广度优先遍历语法树（与 ``ast.walk`` 顺序一致），执行 AST 规则
+        和函数度量规则。
 
         Args:
             tree: AST树
+            state: 收集问题的遍历状态
+            deadline: 时间预算的截止时刻（``time.perf_counter``），
+                None 表示不限时
 
         Returns:
-            包含文档字符串问题的列表
+            bool: 是否在截止时刻之前遍历完成；未完成时函数度量规则不执行
         """
-        issues = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.Module)):
-                if not ast.get_docstring(node):
-                    issues.append({
-                        "type": "style",
-                        "rule": "docstring",
-                        "message": "缺少文档字符串",
-                        "line": node.lineno,
-                        "severity": "info"
-                    })
-        
-        return issues
+        dispatch = self._dispatch
+        todo = deque([(tree, None)])
+        # 每处理一批节点检查一次截止时刻，避免每个节点都读取时钟
+        budget = DEADLINE_CHECK_NODES
+        while todo:
+            node, state.function = todo.popleft()
+            for handler in dispatch.get(type(node), ()):
+                handler(node, state)
+            function = state.function
+            todo.extend(
+                (child, function) for child in ast.iter_child_nodes(node)
+            )
+            budget -= 1
+            if not budget:
+                if deadline is not None and time.perf_counter() > deadline:
+                    return False
+                budget = DEADLINE_CHECK_NODES
+
+        # 嵌套函数的度量同样计入外层函数；广度优先顺序保证子函数排在
+        # 父函数之后，逆序累加即可一次完成
+        for metrics in reversed(state.functions):
+            if metrics.parent is not None:
+                metrics.parent.merge(metrics)
+
+        issues = state.issues
+        for metrics in state.functions:
+            for rule in self._function_rules:
+                rule_issues = issues[rule_group(rule)]
+                try:
+                    _collect(rule_issues, rule.check_function(metrics))
+                except Exception as e:
+                    rule_issues.append(
+                        self._rule_error(rule, e, metrics.node.lineno)
+                    )
+        return True
+
+    def _run_rules(
+        self,
+        tree: Optional[ast.AST],
+        lexical: LexicalTable,
+        deadline: Optional[float] = None
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], bool]:
+        """对已解析的代码执行全部规则。
 
-    def _check_quotes(self, lines: List[str]) -> List[Dict[str, Any]]:
-        """检查引号使用。
+        逐行规则共用一次词法分析得到的行信息表，AST 规则共用一次广度
+        优先遍历，因此问题顺序与逐项检查时完全相同。遍历超过截止时刻
+        时放弃已得到的 AST 规则问题，与大文件一样只保留逐行规则的结果。
 
         Args:
-            lines: 代码行列表
+            tree: AST树，为 None 时只执行逐行规则
+            lexical: 词法分析得到的行信息表
+            deadline: 时间预算的截止时刻（``time.perf_counter``），
+                None 表示不限时
 
         Returns:
-            包含引号使用问题的列表
+            (按 style / performance / security 分类的问题列表,
+            是否执行了全部规则)
         """
-        issues = []
-        quote_type = self.config["style"]["quote_type"]
-        
-        for i, line in enumerate(lines, 1):
-            if quote_type == "double" and "'" in line and '"' not in line:
-                issues.append({
-                    "type": "style",
-                    "rule": "quotes",
-                    "message": "建议使用双引号",
-                    "line": i,
-                    "severity": "info"
-                })
-            elif quote_type == "single" and '"' in line and "'" not in line:
-                issues.append({
-                    "type": "style",
-                    "rule": "quotes",
-                    "message": "建议使用单引号",
-                    "line": i,
-                    "severity": "info"
-                })
-        
-        return issues
+        state = _WalkState(
+            [group for groups in self._groups.values() for group in groups]
+        )
+        self._run_line_rules(lexical, state)
+        complete = tree is not None and self._walk_tree(tree, state, deadline)
+
+        issues = state.issues
+        groups = self._groups
+        if not complete:
+            line_groups = {rule_group(rule) for rule in self._line_rules}
+            groups = {
+                category: [group for group in names if group in line_groups]
+                for category, names in groups.items()
+            }
+        return {
+            category: [
+                issue for group in names for issue in issues[group]
+            ]
+            for category, names in groups.items()
+        }, complete
 
-    def check_style(self, content: str) -> List[Dict[str, Any]]:
-        """检查代码风格。
+    def _review_content(self, content: str) -> Dict[str, List[Dict[str, Any]]]:
+        """解析代码并执行全部规则。
 
         Args:
             content: 要检查的代码内容
 
         Returns:
-            包含风格问题的列表
+            按 style / performance / security 分类的问题列表
         """
-        issues = []
-        
-        try:
-            tree = ast.parse(content)
-            lines = content.split("\n")
-            
-            # 检查行长度
-            issues.extend(self._check_line_length(lines))
-            
-            # 检查缩进
-            issues.extend(self._check_indentation(tree))
-            
-            # 检查文档字符串
-            issues.extend(self._check_docstring(tree))
-            
-            # 检查引号使用
-            issues.extend(self._check_quotes(lines))
-                    
-        except SyntaxError as e:
-            issues.append({
-                "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
-                "line": e.lineno or 1,
-                "severity": "error"
-            })
-        except Exception as e:
-            issues.append({
-                "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
-                "line": 1,
-                "severity": "error"
-            })
-        
-        return issues
+        tree = ast.parse(content)
+        return self._run_rules(tree, scan(content))[0]
+
+    def _visit_function(self, node: ast.FunctionDef, state: "_WalkState") -> None:
+        """遍历回调：进入函数，后续子节点的度量计入该函数。"""
+        metrics = FunctionMetrics(node, state.function)
+        state.functions.append(metrics)
+        state.function = metrics
+
+    def _count_branch(self, node: ast.AST, state: "_WalkState") -> None:
+        """遍历回调：统计分支节点。"""
+        if state.function is not None:
+            state.function.complexity += 1
+
+    def _count_local(self, node: ast.Name, state: "_WalkState") -> None:
+        """遍历回调：统计被赋值的名称。"""
+        if state.function is not None and isinstance(node.ctx, ast.Store):
+            state.function.locals += 1
+
+    def _count_return(self, node: ast.Return, state: "_WalkState") -> None:
+        """遍历回调：统计 return 语句。"""
+        if state.function is not None:
+            state.function.returns += 1
+
+    def _count_statement(self, node: ast.stmt, state: "_WalkState") -> None:
+        """遍历回调：统计语句（包括函数定义本身）。"""
+        if state.function is not None:
+            state.function.statements += 1
 
-    def _check_complexity(self, node: ast.FunctionDef) -> Optional[Dict[str, Any]]:
-        """检查函数复杂度。
+    def check_style(self, content: str) -> List[Dict[str, Any]]:
+        """检查代码风格。
 
         Args:
-            node: 函数节点
+            content: 要检查的代码内容
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            包含风格问题的列表
         """
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.Try)):
-                complexity += 1
-        
-        if complexity > self.config["performance"]["max_complexity"]:
-            return {
-                "type": "performance",
-                "rule": "complexity",
-                "message": (
-                    f"函数复杂度为 {complexity}，超过最大值 "
-                    f"{self.config['performance']['max_complexity']}"
-                ),
-                "line": node.lineno,
-                "severity": "warning"
-            }
-        
-        return None
+        try:
+            return self._review_content(content)["style"]
+        except Exception as e:
+            return [self._parsing_error(e)]
 
-    def _check_locals(self, node: ast.FunctionDef) -> Optional[Dict[str, Any]]:
-        """检查局部变量数量。
+    def check_performance(self, content: str) -> List[Dict[str, Any]]:
+        """检查代码性能相关问题。
 
         Args:
-            node: 函数节点
+            content: 要检查的代码内容
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            包含性能问题的列表
         """
-        locals_count = len([
-            n for n in ast.walk(node) 
-            if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)
-        ])
-        
-        if locals_count > self.config["performance"]["max_locals"]:
-            return {
-                "type": "performance",
-                "rule": "locals",
-                "message": (
-                    f"局部变量数量为 {locals_count}，超过最大值 "
-                    f"{self.config['performance']['max_locals']}"
-                ),
-                "line": node.lineno,
-                "severity": "warning"
-            }
-        
-        return None
+        try:
+            return self._review_content(content)["performance"]
+        except Exception as e:
+            return [self._parsing_error(e)]
 
-    def _check_returns(self, node: ast.FunctionDef) -> Optional[Dict[str, Any]]:
-        """检查return语句数量。
+    def check_security(self, content: str) -> List[Dict[str, Any]]:
+        """检查代码安全性问题。
 
         Args:
-            node: 函数节点
+            content: 要检查的代码内容
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            包含安全问题的列表
         """
-        returns = len([
-            n for n in ast.walk(node) 
-            if isinstance(n, ast.Return)
-        ])
-        
-        if returns > self.config["performance"]["max_returns"]:
-            return {
-                "type": "performance",
-                "rule": "returns",
-                "message": (
-                    f"return语句数量为 {returns}，超过最大值 "
-                    f"{self.config['performance']['max_returns']}"
-                ),
-                "line": node.lineno,
-                "severity": "warning"
-            }
-        
-        return None
+        try:
+            return self._review_content(content)["security"]
+        except Exception as e:
+            return [self._parsing_error(e)]
+
+    def _review_source(self, content: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """审查已读取的文件内容。
 
-    def _check_statements(self, node: ast.FunctionDef) -> Optional[Dict[str, Any]]:
-        """检查语句数量。
+        完整审查的结果只取决于文件内容和规则配置，可以安全地缓存；
+        超出时间预算而只执行了逐行规则的结果不应缓存。
 
         Args:
-            node: 函数节点
+            content: 文件内容
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            (问题列表, 是否完整审查)
         """
-        statements = len([
-            n for n in ast.walk(node) 
-            if isinstance(n, ast.stmt)
-        ])
-        
-        if statements > self.config["performance"]["max_statements"]:
-            return {
-                "type": "performance",
-                "rule": "statements",
-                "message": (
-                    f"语句数量为 {statements}，超过最大值 "
-                    f"{self.config['performance']['max_statements']}"
-                ),
-                "line": node.lineno,
-                "severity": "warning"
-            }
-        
-        return None
+        deadline = time.perf_counter() + self.time_budget
 
-    def check_performance(self, content: str) -> List[Dict[str, Any]]:
-        """检查代码性能相关问题。
+        # 检查文件是否为空
+        if not content.strip():
+            return [{
+                "type": "error",
+                "rule": "empty_file",
+                "message": "文件为空",
+                "line": 1,
+                "severity": "error"
+            }], True
 
-        Args:
-            content: 要检查的代码内容
+        # 检查文件编码
+        try:
+            content.encode("utf-8").decode("utf-8")
+        except UnicodeError:
+            return [{
+                "type": "error",
+                "rule": "encoding",
+                "message": "文件编码不是UTF-8",
+                "line": 1,
+                "severity": "error"
+            }], True
 
-        Returns:
-            包含性能问题的列表
-        """
-        issues = []
-        
+        # 检查语法错误
         try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    # 检查函数复杂度
-                    if issue := self._check_complexity(node):
-                        issues.append(issue)
-                    
-                    # 检查局部变量数量
-                    if issue := self._check_locals(node):
-                        issues.append(issue)
-                    
-                    # 检查return语句数量
-                    if issue := self._check_returns(node):
-                        issues.append(issue)
-                    
-                    # 检查语句数量
-                    if issue := self._check_statements(node):
-                        issues.append(issue)
-                        
+            with self._phase("parse"):
+                tree = ast.parse(content)
         except SyntaxError as e:
-            issues.append({
+            issues = [{
                 "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
+                "rule": "syntax",
+                "message": f"语法错误：{str(e)}",
                 "line": e.lineno or 1,
                 "severity": "error"
-            })
+            }]
+            add_context(issues, content.split("\n"))
+            return issues, True
+
+        # 进行代码审查，所有规则共用同一棵语法树和同一张行信息表；
+        # 解析已经用完时间预算时只执行逐行规则，遍历中用完时放弃遍历
+        try:
+            with self._phase("lex"):
+                lexical = scan(content)
+            if time.perf_counter() > deadline:
+                tree = None
+            with self._phase("walk"):
+                issues, complete = self._run_rules(tree, lexical, deadline)
         except Exception as e:
-            issues.append({
-                "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
-                "line": 1,
-                "severity": "error"
-            })
-        
-        return issues
+            return [self._parsing_error(e)], True
 
-    def _check_sql_injection(self, node: ast.Call) -> Optional[Dict[str, Any]]:
-        """检查SQL注入风险。
+        result = (
+            issues["style"] +
+            issues["performance"] +
+            issues["security"]
+        )
+        if not complete:
+            result.append(self._skipped_rules_issue(
+                "time_budget",
+                f"审查超出时间预算 {self.time_budget:g} 秒，只执行了逐行规则"
+            ))
+        # 记录问题所在行的上下文，用于与基线报告比较
+        add_context(result, lexical.lines)
+        return result, complete
+
+    def _skipped_rules_issue(self, rule: str, reason: str) -> Dict[str, Any]:
+        """生成说明哪些规则被跳过的问题。
 
         Args:
-            node: 函数调用节点
+            rule: 问题的规则名，large_file 或 time_budget
+            reason: 跳过的原因
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            问题字典
         """
-        if (isinstance(node.func, ast.Name) and 
-            node.func.id in self.config["security"]["sql_risk_functions"]):
-            return {
-                "type": "security",
-                "rule": "sql_injection",
-                "message": "可能存在SQL注入风险",
-                "line": node.lineno,
-                "severity": "error"
-            }
-        
-        return None
+        skipped = [
+            skipped_rule.name
+            for skipped_rule in self.rules
+            if skipped_rule.node_types or skipped_rule.functions
+        ]
+        return {
+            "type": "review",
+            "rule": rule,
+            "message": f"{reason}；已跳过：{', '.join(skipped)}",
+            "line": 1,
+            "severity": "info"
+        }
+
+    def _review_large(
+        self, path: Path, st: os.stat_result
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """以降级模式审查超过解析大小上限的文件。
 
-    def _check_command_injection(self, node: ast.Call) -> Optional[Dict[str, Any]]:
-        """检查命令注入风险。
+        文件通过 mmap 读取，分块做词法分析并执行逐行规则，内存占用与
+        分块大小相当，不构建语法树。超出时间预算而未审查完的结果不缓存。
 
         Args:
-            node: 函数调用节点
+            path: 文件路径
+            st: 文件的 stat 结果
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            (内容哈希, 问题列表)
         """
-        if (isinstance(node.func, ast.Name) and 
-            node.func.id in self.config["security"]["shell_risk_functions"]):
-            return {
-                "type": "security",
-                "rule": "command_injection",
-                "message": "可能存在命令注入风险",
-                "line": node.lineno,
-                "severity": "error"
-            }
-        
-        return None
+        start = time.perf_counter()
+        with open(path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with self._phase("cache"):
+                digest = hashlib.sha256(data).hexdigest()
+            if self.cache is not None:
+                with self._phase("cache"):
+                    issues = self.cache.lookup_content(path, st, digest)
+                if issues is not None:
+                    return digest, issues
+
+            state = _WalkState(
+                [group for groups in self._groups.values() for group in groups]
+            )
+            # 每个问题分组中已补充上下文的问题数，每块只处理本块新增的问题
+            annotated = dict.fromkeys(state.issues, 0)
+            last_line = 0
+            complete = True
+            try:
+                chunks = iter_scan(data, LARGE_FILE_CHUNK_SIZE)
+                if self.profiler is not None:
+                    chunks = self.profiler.time_iter("lex", chunks)
+                for lexical in chunks:
+                    with self._phase("walk"):
+                        self._run_line_rules(lexical, state)
+                    # 分块处理完后行文本即被释放，在此记录本块问题的上下文
+                    for group, issues in state.issues.items():
+                        add_context(
+                            issues[annotated[group]:],
+                            lexical.lines, lexical.first_line
+                        )
+                        annotated[group] = len(issues)
+                    last_line = lexical.first_line + len(lexical) - 1
+                    if time.perf_counter() - start > self.time_budget:
+                        complete = False
+                        break
+            except UnicodeDecodeError:
+                return digest, [{
+                    "type": "error",
+                    "rule": "encoding",
+                    "message": "文件编码不是UTF-8",
+                    "line": 1,
+                    "severity": "error"
+                }]
 
-    def _check_file_access(self, node: ast.Call) -> Optional[Dict[str, Any]]:
-        """检查文件访问风险。
+        issues = [
+            issue
+            for groups in self._groups.values()
+            for group in groups
+            for issue in state.issues[group]
+        ]
+        size_mb = st.st_size / 1024 / 1024
+        reason = (
+            f"文件大小 {size_mb:.1f}MB 超过 "
+            f"{self.max_parse_size / 1024 / 1024:g}MB，只执行了逐行规则"
+        )
+        if complete:
+            issues.append(self._skipped_rules_issue("large_file", reason))
+        else:
+            issues.append(self._skipped_rules_issue(
+                "time_budget",
+                f"{reason}，且超出时间预算 {self.time_budget:g} 秒，"
+                f"只审查到第 {last_line} 行"
+            ))
+
+        if complete and self.cache is not None:
+            with self._phase("cache"):
+                self.cache.store(path, st, digest, issues)
+        return digest, issues
+
+    def review_file(self, file_path: str) -> Dict[str, Any]:
+        """审查单个文件。
+
+        启用缓存时，文件元数据或内容未变化则直接返回缓存的结果。
 
         Args:
-            node: 函数调用节点
+            file_path: 要审查的文件路径
 
         Returns:
-            如果存在问题则返回问题字典，否则返回 None
+            包含审查结果的字典
         """
-        if (isinstance(node.func, ast.Name) and 
-            node.func.id in self.config["security"]["file_risk_functions"]):
-            return {
-                "type": "security",
-                "rule": "file_access",
-                "message": "可能存在不安全的文件访问",
-                "line": node.lineno,
-                "severity": "warning"
-            }
-        
-        return None
+        return self._review_entry(file_path)
 
-    def check_security(self, content: str) -> List[Dict[str, Any]]:
-        """检查代码安全性问题。
+    def _review_entry(
+        self, file_path: str, st: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
+        """审查单个文件，可复用目录遍历时取得的 stat 结果。
+
+        结果的 ``seconds`` 字段为该文件的审查耗时，分片审查据此记录
+        耗时数据；开启性能分析时同时计入统计。
 
         Args:
-            content: 要检查的代码内容
+            file_path: 要审查的文件路径
+            st: 遍历时取得的 stat 结果，为 None 时先做完整的安全检查
 
         Returns:
-            包含安全问题的列表
+            包含审查结果的字典
         """
-        issues = []
-        
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    # 检查SQL注入风险
-                    if issue := self._check_sql_injection(node):
-                        issues.append(issue)
-                    
-                    # 检查命令注入风险
-                    if issue := self._check_command_injection(node):
-                        issues.append(issue)
-                    
-                    # 检查文件访问风险
-                    if issue := self._check_file_access(node):
-                        issues.append(issue)
-                        
-        except SyntaxError as e:
-            issues.append({
-                "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
-                "line": e.lineno or 1,
-                "severity": "error"
-            })
-        except Exception as e:
-            issues.append({
-                "type": "error",
-                "rule": "parsing",
-                "message": f"解析代码时出错：{str(e)}",
-                "line": 1,
-                "severity": "error"
-            })
-        
-        return issues
+        start = time.perf_counter()
+        result = self._review_path(file_path, st)
+        elapsed = time.perf_counter() - start
+        result["seconds"] = elapsed
+        if self.profiler is not None:
+            self.profiler.add_file(file_path, elapsed)
+        return result
 
-    def review_file(self, file_path: str) -> Dict[str, Any]:
-        """审查单个文件。
+    def _review_path(
+        self, file_path: str, st: Optional[os.stat_result]
+    ) -> Dict[str, Any]:
+        """读取并审查单个文件，优先使用缓存的结果。
+
+        结果的 ``digest`` 字段为文件的内容哈希，文件无法读取时没有该字段。
 
         Args:
             file_path: 要审查的文件路径
+            st: 遍历时取得的 stat 结果，为 None 时先做完整的安全检查
 
         Returns:
             包含审查结果的字典
@@ -582,63 +862,48 @@ class CodeReview:
             "issues": []
         }
 
-        # 检查文件访问权限
-        path = self._safe_open(file_path)
+        # 检查文件访问权限；遍历得到的文件已确认是普通文件，只需检查大小
+        if st is None:
+            path = self._safe_open(file_path)
+        else:
+            path = Path(file_path) if st.st_size <= self.max_file_size else None
         if not path:
-            result["issues"].append({
-                "type": "error",
-                "rule": "file_access",
-                "message": "无法访问文件",
-                "line": 1,
-                "severity": "error"
-            })
+            result["issues"].append(self._access_error(file_path, st))
             return result
         
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # 检查文件是否为空
-            if not content.strip():
-                result["issues"].append({
-                    "type": "error",
-                    "rule": "empty_file",
-                    "message": "文件为空",
-                    "line": 1,
-                    "severity": "error"
-                })
-                return result
-            
-            # 检查文件编码
-            try:
-                content.encode("utf-8").decode("utf-8")
-            except UnicodeError:
-                result["issues"].append({
-                    "type": "error",
-                    "rule": "encoding",
-                    "message": "文件编码不是UTF-8",
-                    "line": 1,
-                    "severity": "error"
-                })
-                return result
-            
-            # 检查语法错误
-            try:
-                ast.parse(content)
-            except SyntaxError as e:
-                result["issues"].append({
-                    "type": "error",
-                    "rule": "syntax",
-                    "message": f"语法错误：{str(e)}",
-                    "line": e.lineno or 1,
-                    "severity": "error"
-                })
+            if st is None:
+                st = path.stat()
+            if self.cache is not None:
+                with self._phase("cache"):
+                    cached = self.cache.lookup(path, st)
+                if cached is not None:
+                    result["digest"], result["issues"] = cached
+                    return result
+
+            if st.st_size > self.max_parse_size:
+                result["digest"], result["issues"] = self._review_large(path, st)
                 return result
-            
-            # 进行代码审查
-            result["issues"].extend(self.check_style(content))
-            result["issues"].extend(self.check_performance(content))
-            result["issues"].extend(self.check_security(content))
+
+            with self._phase("read"):
+                with open(path, "r", encoding="utf-8") as f:
+                    content = f.read()
+
+            with self._phase("cache"):
+                digest = result["digest"] = content_digest(content)
+            if self.cache is not None:
+                with self._phase("cache"):
+                    issues = self.cache.lookup_content(path, st, digest)
+                if issues is not None:
+                    result["issues"] = issues
+                    return result
+
+            issues, complete = self._review_source(content)
+            result["issues"].extend(issues)
+
+            if complete and self.cache is not None:
+                with self._phase("cache"):
+                    self.cache.store(path, st, digest, issues)
             
         except Exception as e:
             result["issues"].append({
@@ -651,11 +916,385 @@ class CodeReview:
         
         return result
 
-    def review_directory(self, directory: str) -> Dict[str, Any]:
+    def _file_digest(self, file_path: str, st: os.stat_result) -> Optional[str]:
+        """计算文件的内容哈希，与审查结果中的 digest 字段一致。
+
+        元数据与缓存中的记录一致时直接使用记录的哈希，不读取文件。
+
+        Args:
+            file_path: 文件路径
+            st: 文件的 stat 结果
+
+        Returns:
+            Optional[str]: 内容哈希，文件无法读取时返回 None
+        """
+        path = Path(file_path)
+        if self.cache is not None:
+            digest = self.cache.known_digest(path, st)
+            if digest is not None:
+                return digest
+
+        if st.st_size > self.max_file_size:
+            return None
+        try:
+            if st.st_size > self.max_parse_size:
+                with open(path, "rb") as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return hashlib.sha256(data).hexdigest()
+            with open(path, "r", encoding="utf-8") as f:
+                return content_digest(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _access_error(
+        self, file_path: str, st: Optional[os.stat_result]
+    ) -> Dict[str, Any]:
+        """生成文件无法审查时的问题，区分文件过大和无法访问。
+
+        Args:
+            file_path: 文件路径
+            st: 遍历时取得的 stat 结果
+
+        Returns:
+            问题字典
+        """
+        try:
+            size = (st or os.stat(file_path)).st_size
+        except OSError:
+            size = 0
+
+        if size > self.max_file_size:
+            return {
+                "type": "error",
+                "rule": "file_size",
+                "message": (
+                    f"文件大小 {size / 1024 / 1024:.1f}MB 超过上限 "
+                    f"{self.max_file_size / 1024 / 1024:g}MB，已跳过"
+                ),
+                "line": 1,
+                "severity": "error"
+            }
+        return {
+            "type": "error",
+            "rule": "file_access",
+            "message": "无法访问文件",
+            "line": 1,
+            "severity": "error"
+        }
+
+    def _lookup_cached(
+        self, file_path: str, st: Optional[os.stat_result] = None
+    ) -> Optional[Dict[str, Any]]:
+        """只按文件元数据查询缓存，不读取文件内容。
+
+        Args:
+            file_path: 文件路径
+            st: 遍历时取得的 stat 结果
+
+        Returns:
+            Optional[Dict[str, Any]]: 命中时返回审查结果，否则返回 None
+        """
+        try:
+            if st is None:
+                path = self._safe_open(file_path)
+                if not path:
+                    return None
+                st = path.stat()
+            else:
+                path = Path(file_path)
+            cached = self.cache.lookup(path, st)
+        except OSError:
+            return None
+        if cached is None:
+            return None
+
+        return {
+            "file": file_path,
+            "time": datetime.now().isoformat(),
+            "digest": cached[0],
+            "issues": cached[1]
+        }
+
+    def _review_files(
+        self,
+        files: Iterable[Tuple[str, Optional[os.stat_result]]],
+        jobs: Optional[int] = None,
+        reuse: Optional[
+            Callable[[str, os.stat_result], Optional[Dict[str, Any]]]
+        ] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """逐个审查文件，按输入顺序产出结果。
+
+        ``jobs`` 大于 1 时使用进程池并行审查，结果仍按输入顺序返回，
+        因此与串行模式的输出完全一致。两种模式都边遍历边审查，缓存
+        命中和可以沿用的结果立即产出。
+
+        Args:
+            files: (文件路径, stat 结果) 序列，stat 结果可以为 None
+            jobs: 并行进程数，默认为 CPU 核数
+            reuse: 审查每个文件前调用，返回可以沿用的结果时不再审查；
+                只用于 stat 结果不为 None 的文件
+
+        Yields:
+            每个文件的审查结果
+        """
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+
+        if jobs <= 1:
+            for file_path, st in files:
+                result = None
+                if reuse is not None and st is not None:
+                    result = reuse(file_path, st)
+                yield result or self._review_entry(file_path, st)
+            return
+
+        # 边遍历边提交：缓存命中的文件在主进程中直接产出，其余文件按批
+        # 交给进程池。最多同时有 jobs * PARALLEL_WINDOW 批在审查，前面的
+        # 结果被取走后才继续遍历，内存占用与目录规模无关
+        window = jobs * PARALLEL_WINDOW
+        slots: deque = deque()  # 按输入顺序排列的结果或一批文件的 Future
+        batch: List[Tuple[str, Optional[os.stat_result]]] = []
+        executor: Optional[ProcessPoolExecutor] = None
+        in_flight = 0
+
+        def submit() -> None:
+            nonlocal batch, executor, in_flight
+            if executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=_init_worker,
+                    initargs=(
+                        self.config, self.cache is not None,
+                        self.profiler is not None
+                    )
+                )
+            slots.append(executor.submit(_review_batch_in_worker, batch))
+            batch = []
+            in_flight += 1
+
+        def drain(wait_all: bool) -> Iterator[Dict[str, Any]]:
+            # 产出队首已经完成的结果；队列满或 wait_all 时等待队首的批次
+            nonlocal in_flight
+            while slots:
+                head = slots[0]
+                if isinstance(head, dict):
+                    yield slots.popleft()
+                    continue
+                if not (wait_all or in_flight >= window or head.done()):
+                    return
+                slots.popleft()
+                in_flight -= 1
+                for result in head.result():
+                    # 合并工作进程为该文件收集的耗时统计
+                    profile = result.pop("profile", None)
+                    if profile is not None and self.profiler is not None:
+                        self.profiler.merge(profile)
+                    yield result
+
+        try:
+            for file_path, st in files:
+                result = None
+                if reuse is not None and st is not None:
+                    result = reuse(file_path, st)
+                if result is None and self.cache is not None:
+                    with self._phase("cache"):
+                        result = self._lookup_cached(file_path, st)
+                if result is None:
+                    batch.append((file_path, st))
+                    if len(batch) >= PARALLEL_BATCH:
+                        submit()
+                else:
+                    if batch:
+                        submit()
+                    slots.append(result)
+                yield from drain(False)
+
+            if batch:
+                if executor is None and len(batch) == 1:
+                    # 只有一个文件需要审查时不启动进程池
+                    slots.append(self._review_entry(*batch[0]))
+                else:
+                    submit()
+            yield from drain(True)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def discover_files(
+        self,
+        directory: str,
+        exclude: Optional[List[str]] = None,
+        start: str = "",
+        visit_dir: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """按配置遍历目录中需要审查的 Python 文件。
+
+        Args:
+            directory: 要审查的目录路径
+            exclude: 额外的排除规则，语法与 .gitignore 相同
+            start: 只遍历其中的这个子目录（以 / 分隔的相对路径）
+            visit_dir: 进入每个目录前调用，返回 False 时跳过该目录
+
+        Yields:
+            (文件路径, stat 结果)，按路径排序
+        """
+        discovery = self.config.get("discovery", {})
+        excludes = list(discovery.get("exclude", DEFAULT_EXCLUDES))
+        if exclude:
+            excludes.extend(exclude)
+
+        yield from iter_python_files(
+            str(Path(directory).resolve()),
+            excludes,
+            discovery.get("use_gitignore", True),
+            start,
+            visit_dir
+        )
+
+    def iter_review_directory(
+        self,
+        directory: str,
+        jobs: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        balance: bool = False,
+        timings: Optional[Dict[str, float]] = None,
+        baseline: Optional[Baseline] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """逐个产出目录中每个文件的审查结果。
+
+        每个结果附带 ``summary`` 字段，为截至该文件的累计统计，调用方
+        无需保留之前的结果即可获得全局统计，内存占用与目录规模无关。
+        指定基线时，内容与基线中相同的文件不重新审查，直接沿用基线中
+        的结果，这些结果的 ``baseline`` 字段为 True。
+
+        Args:
+            directory: 要审查的目录路径
+            jobs: 并行进程数，默认为 CPU 核数，为 1 时串行审查
+            exclude: 额外的排除规则，语法与 .gitignore 相同
+            shard: (分片序号, 分片总数)，只审查属于该分片的文件
+            balance: 分片时是否按文件大小做负载均衡
+            timings: 上一次运行记录的每个文件耗时，分片时据此做负载均衡
+            baseline: 基线报告
+
+        Yields:
+            单个文件的审查结果
+
+        Raises:
+            NotADirectoryError: 目录不存在或不是目录时抛出
+        """
+        path = Path(directory).resolve()
+        if not path.is_dir():
+            raise NotADirectoryError(f"无法访问目录：{directory}")
+
+        files_reviewed = 0
+        total_issues = 0
+        issue_types = {}
+        issue_severities = {}
+
+        files = self.discover_files(str(path), exclude)
+        if self.profiler is not None:
+            files = self.profiler.time_iter("discover", files)
+        if shard is not None:
+            files = select_shard(
+                list(files), str(path), *shard, balance=balance, timings=timings
+            )
+        reuse = None
+        if baseline is not None and baseline.digests:
+            root = str(path)
+
+            def reuse(file_path: str, st: os.stat_result):
+                return self._reuse_baseline(file_path, st, root, baseline)
+
+        for result in self._review_files(files, jobs, reuse):
+            with self._phase("report"):
+                files_reviewed += 1
+                total_issues += len(result["issues"])
+
+                # 统计问题分布
+                for issue in result["issues"]:
+                    issue_type = issue["type"]
+                    issue_severity = issue["severity"]
+
+                    issue_types[issue_type] = issue_types.get(
+                        issue_type, 0
+                    ) + 1
+                    issue_severities[issue_severity] = issue_severities.get(
+                        issue_severity, 0
+                    ) + 1
+
+                result["summary"] = {
+                    "files_reviewed": files_reviewed,
+                    "total_issues": total_issues,
+                    "issue_types": dict(issue_types),
+                    "issue_severities": dict(issue_severities)
+                }
+            yield result
+
+    def _reuse_baseline(
+        self,
+        file_path: str,
+        st: os.stat_result,
+        root: str,
+        baseline: Baseline
+    ) -> Optional[Dict[str, Any]]:
+        """内容与基线相同的文件沿用基线中的结果。
+
+        在审查流水线中逐个文件调用，不需要先遍历完整个目录。
+
+        Args:
+            file_path: 文件路径
+            st: 文件的 stat 结果
+            root: 审查根目录
+            baseline: 基线报告
+
+        Returns:
+            Optional[Dict[str, Any]]: 可以沿用时返回审查结果，其
+            ``baseline`` 字段为 True；否则返回 None
+        """
+        with self._phase("baseline"):
+            digest = self._file_digest(file_path, st)
+            issues = baseline.reusable(relative_path(file_path, root), digest)
+        if issues is None:
+            return None
+        return {
+            "file": file_path,
+            "time": datetime.now().isoformat(),
+            "digest": digest,
+            "issues": issues,
+            "baseline": True
+        }
+
+    def review_directory(
+        self,
+        directory: str,
+        jobs: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        balance: bool = False,
+        timings: Optional[Dict[str, float]] = None,
+        baseline: Optional[Baseline] = None
+    ) -> Dict[str, Any]:
         """审查目录中的所有Python文件。
 
+        文件按路径排序后审查，并行与串行模式的结果顺序相同。分片审查时
+        报告附带 ``shard`` 和每个文件的耗时 ``timings``，供 merge_reports
+        合并以及下一次运行做负载均衡。
+
+        报告记录审查根目录 ``root``、规则指纹 ``rules`` 和每个文件的内容
+        哈希 ``digests``，可以作为之后审查的基线。指定基线时报告的
+        ``baseline`` 字段列出相对基线新增和已修复的问题；分片审查时不在
+        本分片中的文件无从判断是否已删除，不计入已修复的问题。
+
         Args:
             directory: 要审查的目录路径
+            jobs: 并行进程数，默认为 CPU 核数，为 1 时串行审查
+            exclude: 额外的排除规则，语法与 .gitignore 相同
+            shard: (分片序号, 分片总数)，只审查属于该分片的文件
+            balance: 分片时是否按文件大小做负载均衡
+            timings: 上一次运行记录的每个文件耗时，分片时据此做负载均衡
+            baseline: 基线报告，由 load_baseline 加载
 
         Returns:
             包含审查结果的字典
@@ -676,37 +1315,50 @@ class CodeReview:
                 }
             
             issues = []
-            files_reviewed = 0
-            
-            for file_path in path.rglob("*.py"):
-                result = self.review_file(str(file_path))
-                issues.extend(result["issues"])
-                files_reviewed += 1
+            summary = {
+                "files_reviewed": 0,
+                "total_issues": 0,
+                "issue_types": {},
+                "issue_severities": {}
+            }
             
-            # 统计问题分布
-            issue_types = {}
-            issue_severities = {}
+            file_times = {}
+            digests = {}
+            diff = None if baseline is None else BaselineDiff(baseline, str(path))
             
-            for issue in issues:
-                issue_type = issue["type"]
-                issue_severity = issue["severity"]
-                
-                issue_types[issue_type] = issue_types.get(
-                    issue_type, 0
-                ) + 1
-                issue_severities[issue_severity] = issue_severities.get(
-                    issue_severity, 0
-                ) + 1
+            for result in self.iter_review_directory(
+                directory, jobs, exclude, shard, balance, timings, baseline
+            ):
+                file_path = result["file"]
+                rel_path = relative_path(file_path, str(path))
+                issues.extend(
+                    {"file": file_path, **issue} for issue in result["issues"]
+                )
+                summary = result["summary"]
+                if "digest" in result:
+                    digests[rel_path] = result["digest"]
+                if shard is not None:
+                    file_times[rel_path] = result.get("seconds", 0.0)
+                if diff is not None:
+                    diff.add(result)
             
-            return {
+            report = {
                 "directory": directory,
+                "root": str(path),
                 "time": datetime.now().isoformat(),
-                "files_reviewed": files_reviewed,
-                "total_issues": len(issues),
-                "issue_types": issue_types,
-                "issue_severities": issue_severities,
+                **summary,
+                "rules": self._rules_fingerprint(),
+                "digests": digests,
                 "issues": issues
             }
+            if shard is not None:
+                report["shard"] = {"index": shard[0], "count": shard[1]}
+                report["timings"] = file_times
+            if diff is not None:
+                report["baseline"] = diff.finish(complete=shard is None)
+            if self.profiler is not None:
+                report["profile"] = self.profiler.to_dict()
+            return report
             
         except Exception as e:
             return {
@@ -721,27 +1373,404 @@ class CodeReview:
                 }]
             }
 
-    def save_report(self, report: Dict) -> str:
-        """保存审查报告。
+    def load_report(self, reference: str) -> Optional[Dict]:
+        """按报告ID或文件路径读取审查报告。
+
+        Args:
+            reference: 报告ID，或者报告文件（json、jsonl 或紧凑格式）的路径
+
+        Returns:
+            Optional[Dict]: 报告内容，不存在或无法读取时返回 None
+        """
+        if not os.path.isfile(reference):
+            return self.get_report(reference)
+        try:
+            return load_report_file(reference)
+        except (OSError, ValueError) as e:
+            print(f"读取审查报告时出错：{str(e)}")
+            return None
+
+    def load_baseline(self, reference: str) -> Optional[Baseline]:
+        """加载作为基线的审查报告。
+
+        Args:
+            reference: 报告ID，或者报告文件的路径
+
+        Returns:
+            Optional[Baseline]: 基线，报告不存在或无法读取时返回 None
+        """
+        report = self.load_report(reference)
+        if report is None:
+            return None
+        return Baseline(report, self._rules_fingerprint())
+
+    def _run_git(self, args: List[str], cwd: str) -> str:
+        """执行 git 命令并返回标准输出。
+
+        Args:
+            args: git 子命令及参数
+            cwd: 执行命令的目录
+
+        Returns:
+            str: 命令的标准输出
+
+        Raises:
+            subprocess.CalledProcessError: 命令执行失败时抛出
+        """
+        completed = subprocess.run(
+            ["git", "-c", "core.quotePath=false", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True
+        )
+        return completed.stdout
+
+    def _parse_diff(self, diff: str) -> Dict[str, List[Tuple[int, int]]]:
+        """解析 ``--unified=0`` 格式的 diff，得到每个文件被修改的行范围。
+
+        纯删除的位置记为 ``(c + 1, c)``：它不包含任何行，但落在某个定义
+        内部时仍会与该定义的范围相交。
+
+        Args:
+            diff: git diff 输出
+
+        Returns:
+            文件相对路径到行范围列表的映射
+        """
+        changes: Dict[str, List[Tuple[int, int]]] = {}
+        ranges = None
+        for line in diff.splitlines():
+            if line.startswith("+++ "):
+                target = line[4:].rstrip("\t")
+                if target == "/dev/null":
+                    ranges = None
+                else:
+                    ranges = changes.setdefault(target[2:], [])
+            elif line.startswith("@@") and ranges is not None:
+                match = _HUNK_HEADER.match(line)
+                if not match:
+                    continue
+                start = int(match.group(1))
+                count = int(match.group(2) or 1)
+                if count:
+                    ranges.append((start, start + count - 1))
+                else:
+                    ranges.append((start + 1, start))
+        return changes
+
+    def _git_changed_lines(
+        self, repo_root: str, base: str
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """获取工作区相对于基准的 Python 文件修改。
+
+        基准与 HEAD 的共同祖先作为对比起点，因此 ``--base main`` 只包含
+        当前分支上的修改。未跟踪的新文件视为整个文件被修改。
+
+        Args:
+            repo_root: 仓库根目录
+            base: 基准引用
+
+        Returns:
+            文件相对路径到行范围列表的映射
+        """
+        try:
+            start = self._run_git(["merge-base", base, "HEAD"], repo_root).strip()
+        except subprocess.CalledProcessError:
+            start = base
+
+        diff = self._run_git(
+            [
+                "diff", "--unified=0", "--no-color", "--no-ext-diff",
+                # _parse_diff 按 b/ 前缀截取路径，不受 diff.noprefix 和
+                # diff.mnemonicPrefix 配置的影响
+                "--src-prefix=a/", "--dst-prefix=b/",
+                "--diff-filter=d", start, "--", "*.py"
+            ],
+            repo_root
+        )
+        changes = self._parse_diff(diff)
+
+        untracked = self._run_git(
+            ["ls-files", "--others", "--exclude-standard", "--", "*.py"],
+            repo_root
+        )
+        for rel_path in untracked.splitlines():
+            changes[rel_path] = [(1, sys.maxsize)]
+
+        return {
+            rel_path: ranges
+            for rel_path, ranges in changes.items()
+            if ranges
+        }
+
+    def _definition_spans(self, file_path: str) -> Dict[int, int]:
+        """获取文件中函数和类定义的起止行，模块本身对应第 1 行。
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            定义所在行到结束行的映射，无法解析或超过解析大小上限时返回
+            空字典
+        """
+        try:
+            if os.path.getsize(file_path) > self.max_parse_size:
+                return {}
+            with open(file_path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, UnicodeError, SyntaxError, ValueError):
+            return {}
+
+        spans = {1: sys.maxsize}
+        for node in ast.walk(tree):
+            if isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+            ):
+                spans[node.lineno] = max(
+                    spans.get(node.lineno, 0), node.end_lineno or node.lineno
+                )
+        return spans
+
+    def _filter_to_changes(
+        self,
+        issues: List[Dict[str, Any]],
+        ranges: List[Tuple[int, int]],
+        spans: Dict[int, int]
+    ) -> List[Dict[str, Any]]:
+        """只保留与修改相关的问题。
+
+        错误类问题总是保留；定义级规则在定义范围与修改相交时保留；
+        其余逐行问题只在所在行被修改时保留。
+
+        Args:
+            issues: 问题列表
+            ranges: 被修改的行范围
+            spans: 定义起止行
+
+        Returns:
+            过滤后的问题列表
+        """
+        def touched(first: int, last: int) -> bool:
+            return any(start <= last and end >= first for start, end in ranges)
+
+        kept = []
+        for issue in issues:
+            line = issue["line"]
+            if issue["type"] == "error":
+                kept.append(issue)
+            elif issue["rule"] in DEFINITION_RULES and line in spans:
+                if touched(line, spans[line]):
+                    kept.append(issue)
+            elif touched(line, line):
+                kept.append(issue)
+        return kept
+
+    def review_diff(
+        self,
+        base: str = "HEAD",
+        directory: str = ".",
+        jobs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """只审查 git 仓库中相对于基准被修改的 Python 文件。
+
+        逐行问题只保留落在修改行上的，函数级问题只保留被修改函数的。
+        每个问题额外带有 ``file`` 字段。
+
+        Args:
+            base: 对比的基准引用，默认为 HEAD
+            directory: 仓库内的任意目录
+            jobs: 并行进程数，默认为 CPU 核数，为 1 时串行审查
+
+        Returns:
+            包含审查结果的字典
+        """
+        try:
+            repo_root = self._run_git(
+                ["rev-parse", "--show-toplevel"], directory
+            ).strip()
+            changes = self._git_changed_lines(repo_root, base)
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, "stderr", None) or str(e)
+            return {
+                "directory": directory,
+                "base": base,
+                "time": datetime.now().isoformat(),
+                "issues": [{
+                    "type": "error",
+                    "rule": "git_diff",
+                    "message": f"获取 git 修改时出错：{detail.strip()}",
+                    "line": 1,
+                    "severity": "error"
+                }]
+            }
+
+        issues = []
+        issue_types = {}
+        issue_severities = {}
+
+        rel_paths = sorted(changes)
+        file_paths = [str(Path(repo_root) / p) for p in rel_paths]
+        files = [(file_path, None) for file_path in file_paths]
+        for rel_path, result in zip(
+            rel_paths, self._review_files(files, jobs)
+        ):
+            # 只有存在定义级问题时才需要再解析一次文件
+            spans = {}
+            if any(i["rule"] in DEFINITION_RULES for i in result["issues"]):
+                spans = self._definition_spans(result["file"])
+            kept = self._filter_to_changes(
+                result["issues"], changes[rel_path], spans
+            )
+            for issue in kept:
+                issues.append({"file": rel_path, **issue})
+                issue_types[issue["type"]] = issue_types.get(
+                    issue["type"], 0
+                ) + 1
+                issue_severities[issue["severity"]] = issue_severities.get(
+                    issue["severity"], 0
+                ) + 1
+
+        return {
+            "directory": repo_root,
+            "base": base,
+            "time": datetime.now().isoformat(),
+            "files_reviewed": len(file_paths),
+            "total_issues": len(issues),
+            "issue_types": issue_types,
+            "issue_severities": issue_severities,
+            "issues": issues
+        }
+
+    @property
+    def _report_index_file(self) -> Path:
+        """报告目录索引文件，每行记录一份报告的摘要。"""
+        return self.reports_dir / "index.jsonl"
+
+    def _report_entry(self, report_id: str, report: Dict) -> Dict[str, Any]:
+        """提取报告的摘要信息。
+
+        Args:
+            report_id: 报告ID
+            report: 报告内容
+
+        Returns:
+            Dict[str, Any]: 摘要信息
+        """
+        summary = report.get("summary", {})
+        return {
+            "id": report_id,
+            "timestamp": report.get("timestamp") or report.get("time", ""),
+            "target": report.get("file") or report.get("directory"),
+            "total_issues": summary.get(
+                "total_issues",
+                summary.get("total", len(report.get("issues", [])))
+            )
+        }
+
+    def _report_path(self, report_id: str) -> Optional[Path]:
+        """查找报告文件，依次尝试各种报告格式。
+
+        Args:
+            report_id: 报告ID
+
+        Returns:
+            Optional[Path]: 报告文件路径，不存在时返回 None
+        """
+        for suffix in REPORT_FORMATS.values():
+            report_file = self.reports_dir / f"report_{report_id}{suffix}"
+            # 报告ID不能跳出报告目录
+            if report_file.parent != self.reports_dir:
+                return None
+            if report_file.is_file():
+                return report_file
+        return None
+
+    def save_report(
+        self, report: Dict, report_format: Optional[str] = None
+    ) -> Optional[str]:
+        """保存审查报告，并在报告索引中追加一行摘要。
+
+        compact 格式把问题按列压缩存储，适合问题数很多的目录报告，
+        查看时可以只解压需要的部分。
         
         Args:
             report: 要保存的报告
+            report_format: 报告格式（json 或 compact），默认使用配置中的格式
             
         Returns:
-            str: 报告ID
+            Optional[str]: 报告ID，保存失败时返回 None
         """
-        report_id = datetime.now().strftime("%Y%m%d%H%M%S")
-        report_file = self.reports_dir / f"report_{report_id}.json"
-        
-        path = self._safe_open(str(report_file), "w")
-        if not path:
+        if report_format is None:
+            report_format = self.config.get("report", {}).get("format", "json")
+        if report_format not in REPORT_FORMATS:
+            print(f"不支持的报告格式：{report_format}")
             return None
         
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        # 同一秒内保存多份报告时追加序号
+        base_id = report_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        suffix = 1
+        while self._report_path(report_id) is not None:
+            suffix += 1
+            report_id = f"{base_id}_{suffix}"
+        report_file = (
+            self.reports_dir /
+            f"report_{report_id}{REPORT_FORMATS[report_format]}"
+        )
+        
+        # 补充 show 命令需要的时间戳和统计信息
+        report = dict(report)
+        report.setdefault("timestamp", report.get("time", ""))
+        if "summary" not in report:
+            report["summary"] = self._calculate_stats(report["issues"])
+            report["summary"]["total_files"] = report.get("files_reviewed", 1)
+        
+        try:
+            if report_format == "compact":
+                write_compact_report(report_file, report)
+            else:
+                with report_file.open("w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+            
+            if self._report_index_file.exists():
+                entry = self._report_entry(report_id, report)
+                with self._report_index_file.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            else:
+                # 还没有索引（例如升级前保存的报告）时扫描所有报告建立索引，
+                # 其中已包含刚保存的报告
+                self.rebuild_report_index()
+        except OSError as e:
+            print(f"保存审查报告时出错：{str(e)}")
+            return None
         
         return report_id
 
+    def open_report(self, report_id: str):
+        """打开审查报告，用于按页读取问题。
+
+        compact 格式只读取报告头部，问题在读取时才解压。
+
+        Args:
+            report_id: 报告ID
+
+        Returns:
+            报告读取器（JsonReport 或 CompactReport），不存在或无法读取时
+            返回 None
+        """
+        report_file = self._report_path(report_id)
+        if report_file is None:
+            return None
+        
+        try:
+            if report_file.suffix == REPORT_FORMATS["compact"]:
+                return CompactReport(report_file)
+            return JsonReport(report_file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"读取审查报告时出错：{str(e)}")
+            return None
+
     def get_report(self, report_id: str) -> Optional[Dict]:
         """获取审查报告。
         
@@ -751,38 +1780,59 @@ class CodeReview:
         Returns:
             Optional[Dict]: 报告内容，如果不存在则返回 None
         """
-        report_file = self.reports_dir / f"report_{report_id}.json"
-        path = self._safe_open(str(report_file))
-        if not path:
+        stored = self.open_report(report_id)
+        if stored is None:
             return None
+        return stored.to_dict()
+
+    def rebuild_report_index(self) -> int:
+        """扫描所有报告文件重建报告索引。
+
+        用于升级前保存的报告或索引损坏时。JSON 报告需要完整读取，
+        compact 报告只读取头部。
+
+        Returns:
+            int: 索引中的报告数
+        """
+        entries = []
+        for report_file in self.reports_dir.glob("report_*"):
+            if report_file.suffix not in REPORT_FORMATS.values():
+                continue
+            report_id = report_file.stem.replace("report_", "", 1)
+            stored = self.open_report(report_id)
+            if stored is None:
+                continue
+            report = dict(stored.meta)
+            report.setdefault("summary", {"total": stored.total})
+            entries.append(self._report_entry(report_id, report))
         
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        entries.sort(key=lambda x: x["timestamp"])
+        tmp_file = self._report_index_file.with_suffix(".tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_file, self._report_index_file)
+        return len(entries)
 
     def list_reports(self) -> List[Dict]:
         """列出所有审查报告。
+
+        只读取报告索引，不打开报告文件本身。
         
         Returns:
             List[Dict]: 报告列表
         """
+        if not self._report_index_file.exists():
+            self.rebuild_report_index()
+        
         reports = []
-        for report_file in self.reports_dir.glob("report_*.json"):
-            path = self._safe_open(str(report_file))
-            if not path:
-                continue
-            
-            with path.open("r", encoding="utf-8") as f:
-                report = json.load(f)
-                reports.append({
-                    "id": report_file.stem.replace("report_", ""),
-                    "timestamp": report["timestamp"],
-                    "target": report.get("file") or report.get("directory"),
-                    "total_issues": (
-                        report["summary"]["total_issues"]
-                        if "total_issues" in report["summary"]
-                        else len(report["issues"])
-                    )
-                })
+        with self._report_index_file.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    reports.append(json.loads(line))
+                except ValueError:
+                    # 跳过写入中断留下的不完整行
+                    continue
         
         return sorted(reports, key=lambda x: x["timestamp"], reverse=True)
 
@@ -817,4 +1867,44 @@ class CodeReview:
         
         return stats
 
-code_review = CodeReview() 
\ No newline at end of file
+_worker_reviewer: Optional[CodeReview] = None
+
+
+def _init_worker(
+    config: Dict[str, Any], use_cache: bool, profile: bool
+) -> None:
+    """进程池初始化：每个工作进程创建一个使用相同配置的审查实例。
+
+    Args:
+        config: 主进程中的审查配置
+        use_cache: 是否使用审查结果缓存
+        profile: 是否统计耗时
+    """
+    global _worker_reviewer
+    _worker_reviewer = CodeReview(
+        use_cache=use_cache, config=config, profile=profile
+    )
+
+
+def _review_batch_in_worker(
+    batch: List[Tuple[str, Optional[os.stat_result]]]
+) -> List[Dict[str, Any]]:
+    """在工作进程中审查一批文件。
+
+    Args:
+        batch: (文件路径, stat 结果) 列表
+
+    Returns:
+        按输入顺序排列的审查结果
+    """
+    results = []
+    for entry in batch:
+        result = _worker_reviewer._review_entry(*entry)
+        if _worker_reviewer.profiler is not None:
+            result["profile"] = _worker_reviewer.profiler.drain()
+        results.append(result)
+    return results
+
+
+# 并行审查的工作进程也会导入本模块，全局实例在第一次使用时才初始化
+code_review = LazyInstance(CodeReview) 
\ No newline at end of file
@@ -6,6 +6,7 @@ import json
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
+from ..utils.lazy import LazyInstance
 
 class CursorFramework:
     def __init__(self):
@@ -207,4 +208,4 @@ setup(
 )
 '''
 
-cursor_framework = CursorFramework() 
\ No newline at end of file
+cursor_framework = LazyInstance(CursorFramework) 
\ No newline at end of file
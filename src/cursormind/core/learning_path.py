@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from ..config.settings import settings
 from ..utils.helpers import get_timestamp, ensure_dir
+from ..utils.lazy import LazyInstance
 from .achievement import achievement_manager
 
 class LearningPath:
@@ -296,5 +297,5 @@ class LearningPath:
         stage = path['stages'][current_stage]
         return stage.get('projects', [])
 
-# 创建全局实例
-learning_path_manager = LearningPath() 
\ No newline at end of file
+# 创建全局实例，第一次使用时才初始化
+learning_path_manager = LazyInstance(LearningPath) 
\ No newline at end of file
@@ -0,0 +1,639 @@
+"""
+笔记搜索索引模块，用持久化的倒排索引代替逐个读取笔记文件的线性扫描。
+
+索引保存在 SQLite 中：notes 表保存每条笔记的内容和长度，postings 表保存
+词项到笔记的倒排列表和词频，terms 表记录每个词项出现在多少条笔记中。
+标签和主题也作为带前缀的词项（``#标签``、``@主题``）写入倒排列表。添加
+笔记时增量更新索引，已有的 ``learning_notes/`` 可以用 ``note reindex`` 重建。
+
+分词见 note_text：中日韩文字按二元组建立索引，其他文字按单词建立索引。
+``search`` 返回所有包含查询的笔记，``rank`` 按 BM25 相关度返回前几条，
+支持 ``"短语"``、``topic:主题`` 和 ``tag:标签``。
+"""
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .note_text import analyze, query_terms
+
+# 索引格式或分词方式变化时修改，旧索引会在下次搜索时自动重建
+INDEX_VERSION = "2"
+
+# 标签和主题词项的前缀，内容词项只由文字组成，不会与之冲突
+TAG_PREFIX = "#"
+TOPIC_PREFIX = "@"
+
+# BM25 的词频饱和参数和长度归一化参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 重建索引时每批写入的倒排记录数
+_REBUILD_BATCH = 100000
+
+# 一条 SQL 语句中最多使用的参数个数，旧版本 SQLite 的上限是 999
+_MAX_PARAMS = 500
+
+_TABLES = ("meta", "notes", "postings", "terms")
+
+# 查询语法：topic:值 和 tag:值（值可以加引号）、"短语"、普通词
+_QUERY_RE = re.compile(r'(topic|tag):(?:"([^"]*)"|(\S+))|"([^"]*)"?|(\S+)')
+
+
+def _prefix_end(prefix: str) -> str:
+    """返回以 prefix 开头的字符串的上界（不含），用于范围查询。"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _chunks(items: List[Any]) -> Iterator[List[Any]]:
+    """按 SQL 参数个数上限分批。"""
+    for start in range(0, len(items), _MAX_PARAMS):
+        yield items[start:start + _MAX_PARAMS]
+
+
+def note_terms(note: Dict[str, Any]) -> Counter:
+    """一条笔记的所有词项及词频，包括标签和主题词项。
+
+    Args:
+        note: 笔记
+
+    Returns:
+        Counter: 词项到词频的映射
+    """
+    terms = Counter(analyze(note["content"]))
+    for tag in note.get("tags", []):
+        terms[TAG_PREFIX + tag.lower()] = 1
+    terms[TOPIC_PREFIX + note.get("topic", "").lower()] = 1
+    return terms
+
+
+def _content_length(terms: Counter) -> int:
+    """笔记内容的词项数，不含标签和主题词项。"""
+    return sum(
+        tf for term, tf in terms.items()
+        if not term.startswith((TAG_PREFIX, TOPIC_PREFIX))
+    )
+
+
+def parse_query(query: str) -> Dict[str, List[str]]:
+    """解析排序搜索的查询。
+
+    Args:
+        query: 查询，例如 ``装饰器 "functools.wraps" topic:python tag:学习``
+
+    Returns:
+        Dict[str, List[str]]: ``words`` 为普通词，``phrases`` 为必须连续
+        出现的短语，``topics`` 和 ``tags`` 为过滤条件
+    """
+    parsed: Dict[str, List[str]] = {
+        "words": [], "phrases": [], "topics": [], "tags": []
+    }
+    for field, quoted, value, phrase, word in _QUERY_RE.findall(query):
+        if field == "tag":
+            parsed["tags"].append((quoted or value).strip("#"))
+        elif field == "topic":
+            parsed["topics"].append(quoted or value)
+        elif phrase.strip():
+            parsed["phrases"].append(phrase)
+        elif word:
+            parsed["words"].append(word)
+    return parsed
+
+
+class NoteIndex:
+    """笔记的持久化倒排索引。
+
+    查询中的每个词项先用倒排列表筛选候选笔记，从出现次数最少的词项开始
+    逐个求交集。英文等按词切分的词项按前缀匹配，因此查询 ``pyth`` 能找到
+    ``python``，但从单词中间开始的片段（如 ``thon``）不会匹配。
+    """
+
+    def __init__(self, db_file: Path, topic_dir: Path):
+        """初始化索引。
+
+        Args:
+            db_file: SQLite 数据库文件路径
+            topic_dir: 笔记的主题目录，重建索引时从这里读取所有笔记
+        """
+        self.db_file = db_file
+        self.topic_dir = topic_dir
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """按需打开数据库连接，出错时禁用索引。
+
+        Returns:
+            Optional[sqlite3.Connection]: 数据库连接，索引不可用时返回 None
+        """
+        if self._conn is not None or self._disabled:
+            return self._conn
+
+        try:
+            conn = sqlite3.connect(
+                str(self.db_file), timeout=30, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            version = conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if version is not None and version[0] != INDEX_VERSION:
+                # 旧版本的表结构不同，删除后在下次搜索时重建
+                conn.executescript(
+                    "".join(f"DROP TABLE IF EXISTS {table};" for table in _TABLES)
+                )
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS notes (
+                    doc INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    created_at TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    body TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS terms (
+                    term TEXT PRIMARY KEY,
+                    df INTEGER NOT NULL
+                ) WITHOUT ROWID;
+            """)
+        except sqlite3.Error as e:
+            print(f"笔记索引不可用：{str(e)}")
+            self._disabled = True
+            return None
+
+        self._conn = conn
+        return conn
+
+    def _ready(self, conn: sqlite3.Connection) -> bool:
+        """索引是否已经完整建立，且格式与当前版本一致。"""
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        return row is not None and row[0] == INDEX_VERSION
+
+    def _collection(self, conn: sqlite3.Connection) -> Tuple[int, int]:
+        """返回 (笔记数, 所有笔记内容的词项总数)。"""
+        meta = dict(conn.execute(
+            "SELECT key, value FROM meta WHERE key IN ('documents', 'length')"
+        ))
+        return int(meta.get("documents", 0)), int(meta.get("length", 0))
+
+    def _update_collection(
+        self, conn: sqlite3.Connection, documents: int, length: int
+    ) -> None:
+        """在当前事务中累加笔记数和词项总数。"""
+        old_documents, old_length = self._collection(conn)
+        conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (
+                ("documents", str(old_documents + documents)),
+                ("length", str(old_length + length))
+            )
+        )
+
+    def _remove(self, conn: sqlite3.Connection, path: str) -> None:
+        """在当前事务中删除一条笔记及其倒排列表。"""
+        row = conn.execute(
+            "SELECT doc, length, data FROM notes WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return
+        doc, length, data = row
+        terms = note_terms(json.loads(data))
+        conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+        conn.executemany(
+            "UPDATE terms SET df = df - 1 WHERE term = ?",
+            ((term,) for term in terms)
+        )
+        conn.execute("DELETE FROM terms WHERE df <= 0")
+        conn.execute("DELETE FROM notes WHERE doc = ?", (doc,))
+        self._update_collection(conn, -1, -length)
+
+    def _insert_note(
+        self, conn: sqlite3.Connection, path: str, note: Dict[str, Any],
+        length: int
+    ) -> int:
+        """在当前事务中写入一条笔记（不含倒排列表），返回其文档编号。"""
+        cursor = conn.execute(
+            "INSERT INTO notes (path, created_at, length, body, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                path,
+                note.get("created_at", ""),
+                length,
+                note["content"].lower(),
+                json.dumps(note, ensure_ascii=False)
+            )
+        )
+        return cursor.lastrowid
+
+    def _insert(
+        self, conn: sqlite3.Connection, path: str, note: Dict[str, Any]
+    ) -> None:
+        """在当前事务中写入一条笔记及其倒排列表，替换同一路径的旧笔记。"""
+        self._remove(conn, path)
+        terms = note_terms(note)
+        length = _content_length(terms)
+        doc = self._insert_note(conn, path, note, length)
+        conn.executemany(
+            "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)",
+            ((term, doc, tf) for term, tf in terms.items())
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO terms (term, df) VALUES (?, 0)",
+            ((term,) for term in terms)
+        )
+        conn.executemany(
+            "UPDATE terms SET df = df + 1 WHERE term = ?",
+            ((term,) for term in terms)
+        )
+        self._update_collection(conn, 1, length)
+
+    def add(self, note: Dict[str, Any], path: str) -> None:
+        """把新笔记加入索引。
+
+        索引尚未建立时不做任何事，下次搜索时会从笔记文件完整重建。
+
+        Args:
+            note: 笔记
+            path: 笔记文件相对于主题目录的路径
+        """
+        conn = self._connect()
+        if conn is None:
+            return
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if self._ready(conn):
+                self._insert(conn, path, note)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"更新笔记索引时出错：{str(e)}")
+
+    def _iter_note_files(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """遍历主题目录中的所有笔记文件，产出 (相对路径, 笔记)。"""
+        try:
+            with os.scandir(self.topic_dir) as entries:
+                topics = sorted(
+                    (entry for entry in entries if entry.is_dir()),
+                    key=lambda entry: entry.name
+                )
+        except OSError:
+            return
+        for topic in topics:
+            with os.scandir(topic.path) as entries:
+                names = sorted(
+                    entry.name for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                )
+            for name in names:
+                try:
+                    with open(os.path.join(topic.path, name), "r", encoding="utf-8") as f:
+                        note = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"跳过无法读取的笔记 {topic.name}/{name}：{str(e)}")
+                    continue
+                yield f"{topic.name}/{name}", note
+
+    def rebuild(self) -> int:
+        """从笔记文件重建整个索引。
+
+        重建在一个事务中完成，中途出错时保留原来的索引。
+
+        Returns:
+            int: 写入索引的笔记数，索引不可用时返回 -1
+        """
+        conn = self._connect()
+        if conn is None:
+            return -1
+
+        count = 0
+        total_length = 0
+        document_frequency: Counter = Counter()
+        postings: List[Tuple[str, int, int]] = []
+        insert_postings = "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)"
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for table in _TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            # 词项的文档频率在内存中累计，倒排列表分批写入
+            for path, note in self._iter_note_files():
+                terms = note_terms(note)
+                length = _content_length(terms)
+                doc = self._insert_note(conn, path, note, length)
+                document_frequency.update(terms.keys())
+                postings.extend((term, doc, tf) for term, tf in terms.items())
+                if len(postings) >= _REBUILD_BATCH:
+                    conn.executemany(insert_postings, postings)
+                    postings.clear()
+                count += 1
+                total_length += length
+            conn.executemany(insert_postings, postings)
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, ?)",
+                document_frequency.items()
+            )
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                (
+                    ("documents", str(count)),
+                    ("length", str(total_length)),
+                    ("version", INDEX_VERSION)
+                )
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"重建笔记索引时出错：{str(e)}")
+            return -1
+        return count
+
+    def _prepare(self) -> Optional[sqlite3.Connection]:
+        """返回可以查询的连接，索引尚未建立或版本不一致时先完整重建。"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        if not self._ready(conn) and self.rebuild() < 0:
+            return None
+        return conn
+
+    def _expand(
+        self, conn: sqlite3.Connection, term: str, prefix: bool
+    ) -> Dict[str, int]:
+        """把查询词项展开为索引中的词项。
+
+        Args:
+            conn: 数据库连接
+            term: 查询词项
+            prefix: 是否按前缀匹配
+
+        Returns:
+            Dict[str, int]: 匹配的词项到其文档频率的映射
+        """
+        if prefix:
+            rows = conn.execute(
+                "SELECT term, df FROM terms WHERE term >= ? AND term < ?",
+                (term, _prefix_end(term))
+            )
+        else:
+            rows = conn.execute("SELECT term, df FROM terms WHERE term = ?", (term,))
+        return dict(rows)
+
+    def _group_postings(
+        self,
+        conn: sqlite3.Connection,
+        group: Dict[str, int],
+        candidates: Optional[List[int]]
+    ) -> Dict[int, int]:
+        """读取一组词项的倒排列表，同一笔记的词频相加。
+
+        候选笔记比倒排列表短时按主键逐个查找候选笔记，否则顺序读取整个
+        倒排列表再过滤。
+
+        Args:
+            conn: 数据库连接
+            group: _expand 的结果
+            candidates: 只保留这些笔记，None 表示不限
+
+        Returns:
+            Dict[int, int]: 笔记到词频的映射
+        """
+        tfs: Dict[int, int] = {}
+        if candidates is not None and len(candidates) * len(group) < sum(group.values()):
+            for term in group:
+                for chunk in _chunks(candidates):
+                    rows = conn.execute(
+                        "SELECT doc, tf FROM postings WHERE term = ? AND doc IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        [term, *chunk]
+                    )
+                    for doc, tf in rows:
+                        tfs[doc] = tfs.get(doc, 0) + tf
+            return tfs
+
+        wanted = None if candidates is None else set(candidates)
+        for term in group:
+            rows = conn.execute("SELECT doc, tf FROM postings WHERE term = ?", (term,))
+            for doc, tf in rows:
+                if wanted is None or doc in wanted:
+                    tfs[doc] = tfs.get(doc, 0) + tf
+        return tfs
+
+    def _match(
+        self, conn: sqlite3.Connection, groups: List[Dict[str, int]]
+    ) -> Dict[int, List[int]]:
+        """找出每组词项都至少出现一个的笔记。
+
+        从文档频率最低的一组开始，后面各组只在已有的候选笔记中查找。
+
+        Returns:
+            Dict[int, List[int]]: 笔记到各组词频的映射
+        """
+        if not all(groups):
+            return {}
+        matched: Optional[Dict[int, List[int]]] = None
+        for i in sorted(range(len(groups)), key=lambda i: sum(groups[i].values())):
+            tfs = self._group_postings(
+                conn, groups[i], None if matched is None else list(matched)
+            )
+            if matched is None:
+                matched = {doc: [0] * len(groups) for doc in tfs}
+            else:
+                matched = {doc: matched[doc] for doc in tfs}
+            for doc, tf in tfs.items():
+                matched[doc][i] = tf
+            if not matched:
+                break
+        return matched or {}
+
+    def _fetch(
+        self, conn: sqlite3.Connection, docs: Iterable[int], columns: str
+    ) -> Iterator[Tuple]:
+        """分批读取笔记的指定列，columns 的第一列应为 doc。"""
+        for chunk in _chunks(list(docs)):
+            yield from conn.execute(
+                f"SELECT {columns} FROM notes WHERE doc IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk
+            )
+
+    def _facet_matches(
+        self, conn: sqlite3.Connection, query: str
+    ) -> Dict[int, Tuple[str, str]]:
+        """标签或主题包含查询的笔记。"""
+        group = {}
+        for prefix in (TAG_PREFIX, TOPIC_PREFIX):
+            group.update(
+                (term, df) for term, df in self._expand(conn, prefix, True).items()
+                if query in term[len(prefix):]
+            )
+        if not group:
+            return {}
+        docs = self._group_postings(conn, group, None)
+        return {
+            doc: (created_at, data)
+            for doc, created_at, data in self._fetch(conn, docs, "doc, created_at, data")
+        }
+
+    def search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """搜索内容、主题或标签包含查询（不区分大小写）的笔记。
+
+        索引尚未建立或版本不一致时先完整重建。
+
+        Args:
+            query: 搜索关键词
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 匹配的笔记，按创建时间从新到旧
+            排列；索引不可用时返回 None
+        """
+        try:
+            conn = self._prepare()
+            if conn is None:
+                return None
+
+            query = query.lower()
+            terms = query_terms(query)
+            if terms:
+                matched = self._match(
+                    conn, [self._expand(conn, term, prefix) for term, prefix in terms]
+                )
+                rows = self._fetch(conn, matched, "doc, created_at, body, data")
+            else:
+                # 查询中没有文字（例如只有标点），逐条检查内容
+                rows = conn.execute("SELECT doc, created_at, body, data FROM notes")
+            # 倒排列表只保证每个词项都出现，再用内容确认整个查询连续出现
+            matches = {
+                doc: (created_at, data)
+                for doc, created_at, body, data in rows
+                if query in body
+            }
+            matches.update(self._facet_matches(conn, query))
+        except sqlite3.Error as e:
+            print(f"搜索笔记索引时出错：{str(e)}")
+            return None
+
+        ordered = sorted(matches.values(), key=lambda item: item[0], reverse=True)
+        return [json.loads(data) for _, data in ordered]
+
+    def _top_phrases(
+        self,
+        conn: sqlite3.Connection,
+        scores: Dict[int, float],
+        phrases: List[str],
+        limit: int
+    ) -> List[int]:
+        """按分数从高到低确认短语连续出现，凑够 limit 条为止。
+
+        每次只读取分数最高的一批笔记的内容，不够时把这一批扩大到 4 倍。
+        """
+        window = limit * 4
+        while True:
+            top = heapq.nlargest(window, scores, key=lambda doc: (scores[doc], doc))
+            bodies = dict(self._fetch(conn, top, "doc, body"))
+            verified = [
+                doc for doc in top
+                if all(phrase in bodies[doc] for phrase in phrases)
+            ]
+            if len(verified) >= limit or window >= len(scores):
+                return verified[:limit]
+            window *= 4
+
+    def rank(
+        self, query: str, limit: int = 10
+    ) -> Optional[List[Tuple[float, Dict[str, Any]]]]:
+        """按 BM25 相关度搜索笔记，返回最相关的 limit 条。
+
+        普通词和短语中的所有词项都必须出现，短语还必须连续出现。
+        ``topic:`` 和 ``tag:`` 只过滤、不参与打分；查询中只有过滤条件时
+        按创建时间从新到旧返回。
+
+        Args:
+            query: 查询，语法见 parse_query
+            limit: 最多返回的笔记数
+
+        Returns:
+            Optional[List[Tuple[float, Dict[str, Any]]]]: (相关度, 笔记)，按
+            相关度从高到低排列；索引不可用时返回 None
+        """
+        parsed = parse_query(query)
+        phrases = [phrase.lower() for phrase in parsed["phrases"]]
+        terms = query_terms(" ".join(parsed["words"] + phrases))
+        try:
+            conn = self._prepare()
+            if conn is None:
+                return None
+
+            groups = [self._expand(conn, term, prefix) for term, prefix in terms]
+            filters = [
+                self._expand(conn, TOPIC_PREFIX + topic.lower(), False)
+                for topic in parsed["topics"]
+            ] + [
+                self._expand(conn, TAG_PREFIX + tag.lower(), False)
+                for tag in parsed["tags"]
+            ]
+            if not groups and not filters:
+                return []
+            matched = self._match(conn, groups + filters)
+
+            if groups:
+                documents, total_length = self._collection(conn)
+                average_length = total_length / documents if documents else 1.0
+                idf = []
+                for group in groups:
+                    # 按前缀匹配时把所有展开的词项看作同一个词
+                    df = min(sum(group.values()), documents)
+                    idf.append(math.log(1 + (documents - df + 0.5) / (df + 0.5)))
+
+                scores = {}
+                for doc, length in self._fetch(conn, matched, "doc, length"):
+                    norm = BM25_K1 * (
+                        1 - BM25_B + BM25_B * length / (average_length or 1.0)
+                    )
+                    tfs = matched[doc]
+                    scores[doc] = sum(
+                        idf[i] * tfs[i] * (BM25_K1 + 1) / (tfs[i] + norm)
+                        for i in range(len(groups))
+                    )
+                if phrases:
+                    top = self._top_phrases(conn, scores, phrases, limit)
+                else:
+                    top = heapq.nlargest(
+                        limit, scores, key=lambda doc: (scores[doc], doc)
+                    )
+            else:
+                created = dict(self._fetch(conn, matched, "doc, created_at"))
+                scores = dict.fromkeys(created, 0.0)
+                top = heapq.nlargest(
+                    limit, created, key=lambda doc: (created[doc], doc)
+                )
+
+            notes = dict(self._fetch(conn, top, "doc, data"))
+        except sqlite3.Error as e:
+            print(f"搜索笔记索引时出错：{str(e)}")
+            return None
+
+        return [(scores[doc], json.loads(notes[doc])) for doc in top]
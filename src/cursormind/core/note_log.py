@@ -0,0 +1,163 @@
+"""
+每日笔记日志模块，用只追加的 JSON Lines 文件保存每天的笔记。
+
+每天一个 ``daily/<日期>.jsonl`` 文件，每行一条笔记。添加笔记只在文件末尾
+追加一行，不需要读出并重写当天的所有笔记。写入时崩溃最多留下最后一行
+不完整的记录，读取时会跳过它，之前的笔记不受影响。
+
+旧版本的 ``daily/<日期>.json``（整个 JSON 数组）仍然可以读取，``compact``
+把它和日志合并成一个新的日志文件，并清除不完整的记录。
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from ..utils.helpers import atomic_write, fsync_dir
+
+# fsync 策略：always 在每次追加后把数据写入磁盘，断电也不会丢失已保存的
+# 笔记；never 交给操作系统决定何时写入，速度更快
+FSYNC_POLICIES = ("always", "never")
+
+LOG_SUFFIX = ".jsonl"
+LEGACY_SUFFIX = ".json"
+
+
+class DailyNoteLog:
+    """按日期分文件的只追加笔记日志。"""
+
+    def __init__(self, daily_dir: Path, fsync: str = "always"):
+        """初始化日志。
+
+        Args:
+            daily_dir: 每日笔记目录
+            fsync: fsync 策略，见 FSYNC_POLICIES
+        """
+        if fsync not in FSYNC_POLICIES:
+            print(f"未知的 fsync 策略 {fsync!r}，使用 always")
+            fsync = "always"
+        self.daily_dir = daily_dir
+        self.fsync = fsync
+
+    def _log_file(self, date: str) -> Path:
+        return self.daily_dir / f"{date}{LOG_SUFFIX}"
+
+    def _legacy_file(self, date: str) -> Path:
+        return self.daily_dir / f"{date}{LEGACY_SUFFIX}"
+
+    def append(self, date: str, note: Dict[str, Any]) -> int:
+        """在指定日期的日志末尾追加一条笔记。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD）
+            note: 笔记
+
+        Returns:
+            int: 写入的字节数
+        """
+        log_file = self._log_file(date)
+        line = json.dumps(note, ensure_ascii=False).encode("utf-8") + b"\n"
+        created = not log_file.exists()
+        with open(log_file, "ab+") as f:
+            # 上次写入中途崩溃时最后一行没有换行符，先补上，
+            # 避免新记录和不完整的记录连在同一行
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            if self.fsync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        if created and self.fsync == "always":
+            fsync_dir(self.daily_dir)
+        return len(line)
+
+    def size(self, date: str) -> int:
+        """指定日期的笔记文件（旧格式文件和日志）的总字节数，没有笔记时为 0。
+
+        只追加的日志每添加一条笔记都会变大，可以用来判断当天的笔记是否有变化。
+        """
+        size = 0
+        for path in (self._legacy_file(date), self._log_file(date)):
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return size
+
+    def _read_log(self, log_file: Path) -> Iterator[Dict[str, Any]]:
+        """读取日志中的笔记，跳过不完整或损坏的行。"""
+        with open(log_file, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    print(f"跳过 {log_file.name} 第 {number} 行损坏的笔记记录")
+
+    def read(self, date: str) -> List[Dict[str, Any]]:
+        """读取指定日期的所有笔记。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD）
+
+        Returns:
+            List[Dict[str, Any]]: 笔记列表，按添加顺序排列
+        """
+        notes = []
+        legacy_file = self._legacy_file(date)
+        if legacy_file.exists():
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                notes.extend(json.load(f))
+        legacy = {note.get("id"): note for note in notes}
+        log_file = self._log_file(date)
+        if log_file.exists():
+            # 合并时在删除旧格式文件前崩溃，日志中会有与它相同的笔记
+            notes.extend(
+                note for note in self._read_log(log_file)
+                if legacy.get(note.get("id")) != note
+            )
+        return notes
+
+    def dates(self) -> List[str]:
+        """有笔记的所有日期，从早到晚排列。"""
+        dates = set()
+        for path in self.daily_dir.iterdir():
+            if path.suffix in (LOG_SUFFIX, LEGACY_SUFFIX) and not path.name.startswith("."):
+                dates.add(path.stem)
+        return sorted(dates)
+
+    def compact(self, date: str) -> int:
+        """把指定日期的旧格式文件和日志合并为一个新的日志文件。
+
+        新文件先写入临时文件再原子地替换日志，然后才删除旧格式文件，
+        中途崩溃时不会丢失笔记。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD）
+
+        Returns:
+            int: 合并后的笔记数
+        """
+        notes = self.read(date)
+        atomic_write(
+            "".join(json.dumps(note, ensure_ascii=False) + "\n" for note in notes),
+            self._log_file(date),
+            fsync=self.fsync == "always"
+        )
+        legacy_file = self._legacy_file(date)
+        if legacy_file.exists():
+            legacy_file.unlink()
+            if self.fsync == "always":
+                fsync_dir(self.daily_dir)
+        return len(notes)
+
+    def compact_all(self) -> Dict[str, int]:
+        """合并所有日期的笔记。
+
+        Returns:
+            Dict[str, int]: 日期到笔记数的映射
+        """
+        return {date: self.compact(date) for date in self.dates()}
@@ -5,11 +5,16 @@ import os
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set
-import re
+from typing import Dict, List, Optional, Set, Tuple
 from ..config.settings import settings
-from ..utils.helpers import ensure_dir, get_timestamp
+from ..utils.helpers import atomic_write, ensure_dir, get_timestamp
+from ..utils.lazy import LazyInstance
+from ..utils.write_behind import WriteBehindStore
 from .achievement import achievement_manager
+from .note_index import NoteIndex
+from .note_log import DailyNoteLog
+from .note_summary import DailySummaryIndex
+from .note_text import count_words, extract_tags
 
 class NoteManager:
     """笔记管理类"""
@@ -20,44 +25,52 @@ class NoteManager:
         self._daily_dir = self._notes_dir / 'daily'
         self._topic_dir = self._notes_dir / 'topics'
         self._review_dir = self._notes_dir / 'reviews'
-        self._stats_file = self._notes_dir / 'stats.json'
+        self._index = NoteIndex(self._notes_dir / 'search.db', self._topic_dir)
+        self._daily_log = DailyNoteLog(self._daily_dir, settings.get('notes_fsync', 'always'))
         self._ensure_structure()
-        self._load_stats()
+        self._stats_store = WriteBehindStore(
+            self._notes_dir / 'stats.json',
+            self._default_stats,
+            flush_every=settings.get('stats_flush_every', 0),
+            flush_interval=settings.get('stats_flush_interval', 0)
+        )
+        self._stats = self._stats_store.data
+        self._summaries = DailySummaryIndex(
+            self._notes_dir / 'daily_summary.json',
+            self._daily_log,
+            flush_every=settings.get('stats_flush_every', 0),
+            flush_interval=settings.get('stats_flush_interval', 0)
+        )
         self._update_daily_streak()
+        # 当天日志中已有的笔记 ID，第一次添加笔记时读取
+        self._used_ids: Set[str] = set()
+        self._used_ids_date = ''
     
     def _ensure_structure(self) -> None:
         """确保笔记目录结构存在"""
         for dir_path in [self._daily_dir, self._topic_dir, self._review_dir]:
             ensure_dir(dir_path)
-        
-        if not self._stats_file.exists():
-            self._stats = {
-                'total_notes': 0,
-                'total_words': 0,
-                'topics': {},
-                'tags': {},
-                'daily_streak': 0,
-                'last_note_date': '',
-                'last_updated': get_timestamp()
-            }
-            self._save_stats()
     
-    def _load_stats(self) -> None:
-        """加载笔记统计数据"""
-        if self._stats_file.exists():
-            with open(self._stats_file, 'r', encoding='utf-8') as f:
-                self._stats = json.load(f)
+    @staticmethod
+    def _default_stats() -> Dict:
+        """新的笔记统计数据"""
+        return {
+            'total_notes': 0,
+            'total_words': 0,
+            'topics': {},
+            'tags': {},
+            'daily_streak': 0,
+            'last_note_date': '',
+            'last_updated': get_timestamp()
+        }
     
-    def _save_stats(self) -> None:
-        """保存笔记统计数据"""
-        with open(self._stats_file, 'w', encoding='utf-8') as f:
-            json.dump(self._stats, f, ensure_ascii=False, indent=2)
+    def flush_stats(self) -> None:
+        """立即写回统计数据，平时在命令结束时自动写回"""
+        self._stats_store.flush()
     
     def _update_daily_streak(self):
-        """更新连续记录天数"""
-        with open(self._stats_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
-        
+        """超过一天没有记录笔记时清零连续记录天数"""
+        stats = self._stats
         if not stats['last_note_date']:
             return
         
@@ -65,24 +78,21 @@ class NoteManager:
         today = datetime.now()
         
         # 如果最后一条笔记是昨天的
-        if (today - last_note).days > 1:
+        if (today - last_note).days > 1 and stats['daily_streak']:
             stats['daily_streak'] = 0
-        
-        with open(self._stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+            self._stats_store.mark_dirty()
     
     def _extract_tags(self, content: str) -> Set[str]:
-        """从内容中提取标签"""
-        return set(tag.strip() for tag in re.findall(r'#(\w+)', content))
+        """从内容中提取标签，支持 #python 和 #学习笔记# 两种写法"""
+        return extract_tags(content)
     
     def _update_stats(self, content: str, topic: str, tags: Set[str]):
-        """更新统计数据"""
-        with open(self._stats_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
+        """更新统计数据，在命令结束时统一写回"""
+        stats = self._stats
         
         # 更新基本统计
         stats['total_notes'] += 1
-        stats['total_words'] += len(content.split())
+        stats['total_words'] += count_words(content)
         
         # 更新主题统计
         if topic not in stats['topics']:
@@ -110,9 +120,7 @@ class NoteManager:
         
         stats['last_note_date'] = datetime.now().isoformat()
         stats['last_updated'] = get_timestamp()
-        
-        with open(self._stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        self._stats_store.mark_dirty()
         
         # 触发成就检查
         achievement_manager.update_stats('note_created', {
@@ -120,6 +128,29 @@ class NoteManager:
             'tags': list(tags)
         })
     
+    def _next_note_id(self, date: str, topic: str) -> str:
+        """
+        生成新笔记的 ID
+        统计数据在命令结束时才写回，进程被强行结束后 total_notes 可能偏小，
+        所以还要避开当天日志中已有的 ID 和主题目录中已有的文件
+        :param date: 日期字符串（YYYY-MM-DD）
+        :param topic: 主题
+        :return: 笔记 ID
+        """
+        if self._used_ids_date != date:
+            self._used_ids = {note.get('id') for note in self._daily_log.read(date)}
+            self._used_ids_date = date
+        
+        number = self._stats['total_notes'] + 1
+        while True:
+            note_id = f"{date}-{number:04d}"
+            if (note_id not in self._used_ids
+                    and not (self._topic_dir / topic / f"{note_id}.json").exists()):
+                break
+            number += 1
+        self._used_ids.add(note_id)
+        return note_id
+    
     def add_note(self, content: str, topic: str = 'general') -> Dict:
         """
         添加新笔记
@@ -133,7 +164,7 @@ class NoteManager:
         
         # 创建笔记数据
         note = {
-            'id': f"{date}-{self._stats['total_notes'] + 1:04d}",
+            'id': self._next_note_id(date, topic),
             'content': content,
             'topic': topic,
             'tags': list(tags),
@@ -141,21 +172,19 @@ class NoteManager:
             'updated_at': timestamp
         }
         
-        # 保存到日常笔记
-        daily_file = self._daily_dir / f"{date}.json"
-        daily_notes = []
-        if daily_file.exists():
-            with open(daily_file, 'r', encoding='utf-8') as f:
-                daily_notes = json.load(f)
-        daily_notes.append(note)
-        with open(daily_file, 'w', encoding='utf-8') as f:
-            json.dump(daily_notes, f, ensure_ascii=False, indent=2)
+        # 追加到当天的笔记日志，并计入当天的摘要
+        written = self._daily_log.append(date, note)
+        self._summaries.add(date, note, written)
         
         # 保存到主题目录
         topic_dir = ensure_dir(self._topic_dir / topic)
         topic_file = topic_dir / f"{note['id']}.json"
-        with open(topic_file, 'w', encoding='utf-8') as f:
-            json.dump(note, f, ensure_ascii=False, indent=2)
+        atomic_write(
+            json.dumps(note, ensure_ascii=False, indent=2),
+            topic_file,
+            fsync=self._daily_log.fsync == 'always'
+        )
+        self._index.add(note, topic_file.relative_to(self._topic_dir).as_posix())
         
         # 更新统计数据
         self._update_stats(content, topic, tags)
@@ -171,12 +200,14 @@ class NoteManager:
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
         
-        daily_file = self._daily_dir / f"{date}.json"
-        if not daily_file.exists():
-            return []
-        
-        with open(daily_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self._daily_log.read(date)
+    
+    def compact_daily_notes(self) -> Dict[str, int]:
+        """
+        把每日笔记整理为新格式，合并旧版本的 JSON 文件并清除写入中断留下的不完整记录
+        :return: 日期到笔记数的映射
+        """
+        return self._daily_log.compact_all()
     
     def get_topic_notes(self, topic: str) -> List[Dict]:
         """
@@ -197,10 +228,20 @@ class NoteManager:
     
     def search_notes(self, query: str) -> List[Dict]:
         """
-        搜索笔记
+        搜索笔记（不区分大小写）
+        
+        内容按词匹配：关键词中的每个英文单词须是笔记中某个单词的开头，
+        且整个关键词出现在内容中，例如 pyth 能匹配 python，thon 不能；
+        主题和标签包含关键词即匹配。索引不可用时退回逐个扫描笔记文件，
+        内容包含关键词即匹配。
         :param query: 搜索关键词
-        :return: 匹配的笔记列表
+        :return: 匹配的笔记列表，按创建时间从新到旧排列
         """
+        results = self._index.search(query)
+        if results is not None:
+            return results
+        
+        # 索引不可用时逐个扫描笔记文件
         results = []
         for topic_dir in self._topic_dir.iterdir():
             if topic_dir.is_dir():
@@ -214,10 +255,79 @@ class NoteManager:
         
         return sorted(results, key=lambda x: x['created_at'], reverse=True)
     
+    def rank_notes(self, query: str, limit: int = 10) -> List[Tuple[float, Dict]]:
+        """
+        按相关度搜索笔记
+        :param query: 查询，支持 "短语"、topic:主题 和 tag:标签
+        :param limit: 最多返回的笔记数
+        :return: (相关度, 笔记) 列表，按相关度从高到低排列；索引不可用时
+                 退回逐个扫描，相关度为 0，按创建时间从新到旧排列
+        """
+        results = self._index.rank(query, limit)
+        if results is not None:
+            return results
+        return [(0.0, note) for note in self.search_notes(query)[:limit]]
+    
+    def rebuild_index(self) -> int:
+        """
+        从主题目录中的笔记文件重建搜索索引
+        :return: 写入索引的笔记数，索引不可用时返回 -1
+        """
+        return self._index.rebuild()
+    
+    def rebuild_stats(self) -> Dict:
+        """
+        按当前的字数和标签规则，从主题目录中的笔记文件重新统计笔记数、
+        字数、主题和标签；连续记录天数不变
+        :return: 统计数据
+        """
+        stats = self._stats
+        stats['total_notes'] = 0
+        stats['total_words'] = 0
+        stats['topics'] = {}
+        stats['tags'] = {}
+        for topic_dir in self._topic_dir.iterdir():
+            if not topic_dir.is_dir():
+                continue
+            for note_file in topic_dir.glob('*.json'):
+                try:
+                    with open(note_file, 'r', encoding='utf-8') as f:
+                        note = json.load(f)
+                except (OSError, ValueError):
+                    print(f"跳过无法读取的笔记文件 {note_file.name}")
+                    continue
+                stats['total_notes'] += 1
+                stats['total_words'] += count_words(note['content'])
+                stats['topics'][note['topic']] = stats['topics'].get(note['topic'], 0) + 1
+                for tag in extract_tags(note['content']):
+                    stats['tags'][tag] = stats['tags'].get(tag, 0) + 1
+        stats['last_updated'] = get_timestamp()
+        self._stats_store.mark_dirty()
+        return stats
+    
     def get_stats(self) -> Dict:
         """获取笔记统计数据"""
         return self._stats
     
+    def _load_highlight(self, ref: str) -> Optional[Dict]:
+        """
+        读取摘要中记录的亮点笔记
+        :param ref: 笔记文件相对于主题目录的路径
+        :return: 笔记，文件不存在或无法读取时返回 None
+        """
+        try:
+            with open(self._topic_dir / ref, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def rebuild_summaries(self) -> int:
+        """
+        从每日笔记重建每日摘要
+        :return: 有笔记的天数
+        """
+        return self._summaries.rebuild()
+    
     def generate_review(self, days: int = 7) -> Dict:
         """
         生成复习报告
@@ -225,51 +335,38 @@ class NoteManager:
         :return: 复习报告
         """
         end_date = datetime.now()
-        start_date = end_date.replace(day=end_date.day - days + 1)
+        start_date = end_date - timedelta(days=days - 1)
+        dates = [
+            (start_date + timedelta(days=offset)).strftime('%Y-%m-%d')
+            for offset in range(max(days, 0))
+        ]
+        summary = self._summaries.merge(dates)
         
         review = {
             'period': f"{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}",
-            'total_notes': 0,
-            'total_words': 0,
-            'topics': {},
-            'tags': {},
-            'daily_notes': [],
-            'highlights': []
+            'total_notes': summary['count'],
+            'total_words': summary['words'],
+            'total_chars': summary['chars'],
+            'topics': summary['topics'],
+            'tags': summary['tags'],
+            # 每天一条摘要，不包含笔记内容
+            'daily_notes': [
+                {
+                    'date': date,
+                    'count': day['count'],
+                    'words': day['words'],
+                    'topics': day['topics'],
+                    'tags': day['tags']
+                }
+                for date, day in summary['days']
+            ],
+            # 只有超过 100 字的笔记才读取内容
+            'highlights': [
+                note for note in map(self._load_highlight, summary['highlights'])
+                if note is not None
+            ]
         }
         
-        current = start_date
-        while current <= end_date:
-            date = current.strftime('%Y-%m-%d')
-            daily_notes = self.get_daily_notes(date)
-            
-            if daily_notes:
-                review['total_notes'] += len(daily_notes)
-                for note in daily_notes:
-                    review['total_words'] += len(note['content'].split())
-                    
-                    # 更新主题统计
-                    if note['topic'] not in review['topics']:
-                        review['topics'][note['topic']] = 0
-                    review['topics'][note['topic']] += 1
-                    
-                    # 更新标签统计
-                    for tag in note['tags']:
-                        if tag not in review['tags']:
-                            review['tags'][tag] = 0
-                        review['tags'][tag] += 1
-                    
-                    # 添加到每日笔记列表
-                    review['daily_notes'].append({
-                        'date': date,
-                        'notes': daily_notes
-                    })
-                    
-                    # 如果笔记内容超过100字，添加到亮点列表
-                    if len(note['content'].split()) > 100:
-                        review['highlights'].append(note)
-            
-            current = current.replace(day=current.day + 1)
-        
         # 保存复习报告
         review_file = self._review_dir / f"review_{end_date.strftime('%Y%m%d')}.json"
         with open(review_file, 'w', encoding='utf-8') as f:
@@ -280,5 +377,5 @@ class NoteManager:
         
         return review
 
-# 创建全局实例
-note_manager = NoteManager() 
\ No newline at end of file
+# 创建全局实例，第一次使用时才初始化
+note_manager = LazyInstance(NoteManager) 
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+每日笔记摘要模块，按日期汇总笔记，生成回顾报告时不需要读取笔记内容。
+
+每天的摘要记录笔记数、字数、字符数、主题和标签的次数，以及长笔记
+（亮点）在主题目录中的位置。摘要在添加笔记时更新，保存在
+``learning_notes/daily_summary.json``，文件不存在时从每日笔记重建。
+回顾任意长度的时间段只需要查找对应日期的摘要，只有亮点需要读取笔记。
+
+摘要在命令结束时才写回，进程被强行结束后可能落后于每日笔记。每天的
+摘要同时记录汇总时笔记文件的字节数，读取摘要时与文件的当前大小比较，
+不一致就重新汇总这一天。
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.write_behind import WriteBehindStore
+from .note_log import DailyNoteLog
+from .note_text import count_words, extract_tags
+
+# 摘要格式变化时修改，旧摘要会在下次使用时自动重建
+SUMMARY_VERSION = 1
+
+# 字数超过这个值的笔记作为亮点
+HIGHLIGHT_WORDS = 100
+
+
+def note_ref(note: Dict[str, Any]) -> str:
+    """笔记文件相对于主题目录的路径。"""
+    return f"{note['topic']}/{note['id']}.json"
+
+
+def empty_summary() -> Dict[str, Any]:
+    """没有笔记的一天的摘要。"""
+    return {
+        "count": 0, "words": 0, "chars": 0, "topics": {}, "tags": {},
+        "highlights": [], "size": 0
+    }
+
+
+class DailySummaryIndex:
+    """按日期保存的笔记摘要。"""
+
+    def __init__(self, path: Path, daily_log: DailyNoteLog, **store_options: Any):
+        """加载摘要，文件不存在或格式过期时从每日笔记重建。
+
+        Args:
+            path: 摘要文件路径
+            daily_log: 每日笔记日志，用于重建
+            **store_options: 传给 WriteBehindStore 的写回选项
+        """
+        self.daily_log = daily_log
+        self._store = WriteBehindStore(path, self._empty, **store_options)
+        if self._store.data.get("version") != SUMMARY_VERSION or self._store.pending:
+            self.rebuild()
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"version": SUMMARY_VERSION, "days": {}}
+
+    @property
+    def days(self) -> Dict[str, Dict[str, Any]]:
+        return self._store.data["days"]
+
+    def _add(self, date: str, note: Dict[str, Any]) -> None:
+        """把一条笔记计入当天的摘要（不写回）。"""
+        summary = self.days.setdefault(date, empty_summary())
+        words = count_words(note["content"])
+        summary["count"] += 1
+        summary["words"] += words
+        summary["chars"] += len(note["content"])
+        summary["topics"][note["topic"]] = summary["topics"].get(note["topic"], 0) + 1
+        # 按当前的标签规则从内容中提取，重建摘要时旧笔记也使用新规则
+        for tag in extract_tags(note["content"]):
+            summary["tags"][tag] = summary["tags"].get(tag, 0) + 1
+        if words > HIGHLIGHT_WORDS:
+            summary["highlights"].append(note_ref(note))
+
+    def _summarize(self, date: str, size: int) -> None:
+        """从每日笔记重新汇总一天的摘要（不写回）。"""
+        self.days.pop(date, None)
+        for note in self.daily_log.read(date):
+            self._add(date, note)
+        if date in self.days:
+            self.days[date]["size"] = size
+
+    def add(self, date: str, note: Dict[str, Any], written: int) -> None:
+        """把刚追加到日志的新笔记计入当天的摘要。
+
+        Args:
+            date: 日期字符串（YYYY-MM-DD）
+            note: 笔记
+            written: DailyNoteLog.append 写入的字节数
+        """
+        size = self.daily_log.size(date)
+        summary = self.days.get(date)
+        if summary is not None and summary["size"] + written == size:
+            self._add(date, note)
+            summary["size"] = size
+        else:
+            # 追加之前摘要就已经落后于日志，重新汇总这一天
+            self._summarize(date, size)
+        self._store.mark_dirty()
+
+    def rebuild(self) -> int:
+        """从每日笔记重建所有摘要。
+
+        Returns:
+            int: 重建的天数
+        """
+        self._store.data = self._empty()
+        for date in self.daily_log.dates():
+            self._summarize(date, self.daily_log.size(date))
+        self._store.mark_dirty()
+        return len(self.days)
+
+    def get(self, date: str) -> Optional[Dict[str, Any]]:
+        """指定日期的摘要，当天没有笔记时返回 None。
+
+        当天的笔记文件在汇总之后有变化时先重新汇总。
+        """
+        size = self.daily_log.size(date)
+        summary = self.days.get(date)
+        if summary is None and size == 0:
+            return None
+        if summary is None or summary["size"] != size:
+            self._summarize(date, size)
+            self._store.mark_dirty()
+        return self.days.get(date)
+
+    def merge(self, dates: Iterable[str]) -> Dict[str, Any]:
+        """合并多天的摘要。
+
+        Args:
+            dates: 日期字符串
+
+        Returns:
+            Dict[str, Any]: 与单日摘要格式相同，另有 ``days`` 为有笔记的
+            每一天的 (日期, 摘要)
+        """
+        total = empty_summary()
+        del total["size"]
+        total["days"] = []
+        for date in dates:
+            summary = self.get(date)
+            if summary is None:
+                continue
+            total["days"].append((date, summary))
+            for key in ("count", "words", "chars"):
+                total[key] += summary[key]
+            for key in ("topics", "tags"):
+                counter = total[key]
+                for name, count in summary[key].items():
+                    counter[name] = counter.get(name, 0) + count
+            total["highlights"].extend(summary["highlights"])
+        return total
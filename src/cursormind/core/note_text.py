@@ -0,0 +1,110 @@
+"""
+笔记文本处理模块，提供兼顾中日韩文字和拉丁文字的分词、字数统计和标签提取。
+
+中文等文字之间没有空格，``str.split()`` 会把整段话当成一个词，``#(\\w+)``
+也会把标签后面的整段文字吞进标签。这里把文本切分为连续的中日韩文字
+片段和连续的字母、数字片段，分别处理。
+"""
+import re
+from typing import List, Set, Tuple
+
+# 中日韩文字：假名、汉字（含扩展 A 区和兼容区）和谚文
+_CJK = "\\u3040-\\u30ff\\u3400-\\u4dbf\\u4e00-\\u9fff\\uac00-\\ud7af\\uf900-\\ufaff"
+CJK_RE = re.compile(f"[{_CJK}]")
+
+# 连续的中日韩文字片段，或连续的其他文字（字母、数字和下划线）片段
+_RUN_RE = re.compile(f"[{_CJK}]+|[^\\W{_CJK}]+")
+
+# 标签：成对的 ``#标签#``，或 ``#`` 后面同一种文字的连续片段
+_TAG_RE = re.compile(f"#([^#\\s]+)#|#([{_CJK}]+|[^\\W{_CJK}]+)")
+
+
+def text_runs(text: str) -> List[str]:
+    """把文本切分为中日韩文字片段和其他文字片段，统一转为小写。
+
+    Args:
+        text: 文本
+
+    Returns:
+        List[str]: 片段，保持原有顺序
+    """
+    return _RUN_RE.findall(text.lower())
+
+
+def is_cjk(run: str) -> bool:
+    """片段是否由中日韩文字组成。"""
+    return CJK_RE.match(run) is not None
+
+
+def analyze(text: str) -> List[str]:
+    """把文本切分为索引词项。
+
+    中日韩文字片段切分为重叠的二元组，片段的最后一个字再单独作为一个
+    词项，这样每个字的每一处出现都是某个词项的开头，单字查询可以按前缀
+    找到；其他文字片段整体作为一个词项。
+
+    Args:
+        text: 文本
+
+    Returns:
+        List[str]: 词项，保持原有顺序，可能重复
+    """
+    terms = []
+    for run in text_runs(text):
+        if is_cjk(run):
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+            terms.append(run[-1])
+        else:
+            terms.append(run)
+    return terms
+
+
+def query_terms(text: str) -> List[Tuple[str, bool]]:
+    """把查询文本切分为 (词项, 是否按前缀匹配)。
+
+    中日韩文字片段切分为二元组精确匹配，单个字按前缀匹配；其他文字
+    片段按前缀匹配，查询 ``pyth`` 能找到 ``python``。
+
+    Args:
+        text: 查询文本
+
+    Returns:
+        List[Tuple[str, bool]]: 去重后的词项
+    """
+    terms = []
+    for run in text_runs(text):
+        if is_cjk(run) and len(run) > 1:
+            terms.extend((run[i:i + 2], False) for i in range(len(run) - 1))
+        else:
+            terms.append((run, True))
+    return list(dict.fromkeys(terms))
+
+
+def count_words(text: str) -> int:
+    """统计字数：每个中日韩文字算一个字，其他文字每个单词算一个字。
+
+    Args:
+        text: 文本
+
+    Returns:
+        int: 字数
+    """
+    return sum(len(run) if is_cjk(run) else 1 for run in text_runs(text))
+
+
+def extract_tags(text: str) -> Set[str]:
+    """从文本中提取标签。
+
+    支持 ``#python`` 和 ``#学习笔记#`` 两种写法。不成对的 ``#`` 后面只取
+    同一种文字的连续片段，``#python装饰器`` 的标签是 ``python``。
+
+    Args:
+        text: 文本
+
+    Returns:
+        Set[str]: 标签
+    """
+    return {
+        (paired or single).strip()
+        for paired, single in _TAG_RE.findall(text)
+    }
@@ -6,6 +6,7 @@ import json
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
+from ..utils.lazy import LazyInstance
 
 class ProjectManager:
     def __init__(self):
@@ -241,4 +242,4 @@ class ProjectManager:
         
         return stats
 
-project_manager = ProjectManager() 
\ No newline at end of file
+project_manager = LazyInstance(ProjectManager) 
\ No newline at end of file
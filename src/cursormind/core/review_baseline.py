@@ -0,0 +1,259 @@
+"""
+代码审查基线模块，按稳定的问题指纹比较两次审查，只输出新增和已修复的问题。
+
+问题指纹由文件的相对路径、规则名和问题所在行归一化后的内容组成，
+不包含行号，在文件其他位置增删代码不会让已有问题被当作新问题。
+"""
+import zlib
+from collections import Counter, defaultdict
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .review_shard import relative_path
+
+
+def line_context(text: str) -> int:
+    """计算一行代码的上下文哈希。
+
+    忽略缩进和空白的差异，只改变缩进层级或对齐方式不会改变结果。
+
+    Args:
+        text: 行文本
+
+    Returns:
+        int: 31 位的哈希值
+    """
+    normalized = " ".join(text.split())
+    return zlib.crc32(normalized.encode("utf-8")) & 0x7FFFFFFF
+
+
+def add_context(
+    issues: Iterable[Dict[str, Any]], lines: List[str], first_line: int = 1
+) -> None:
+    """为问题补充所在行的上下文哈希（``context`` 字段）。
+
+    Args:
+        issues: 问题列表，已有 context 或行号不在 lines 范围内的问题不变
+        lines: 连续若干行的文本
+        first_line: lines 中第一行的行号
+    """
+    for issue in issues:
+        if "context" in issue:
+            continue
+        index = (issue.get("line") or 1) - first_line
+        if 0 <= index < len(lines):
+            issue["context"] = line_context(lines[index])
+
+
+def issue_fingerprint(issue: Dict[str, Any]) -> Tuple:
+    """同一文件内问题的指纹。
+
+    旧版本的报告中没有上下文哈希，以问题说明代替。
+    """
+    return (issue["rule"], issue.get("context", issue["message"]))
+
+
+def subtract_issues(
+    issues: List[Dict[str, Any]],
+    others: List[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], Hashable] = issue_fingerprint
+) -> List[Dict[str, Any]]:
+    """按问题标识的多重集合求差，返回 issues 中多出来的问题。
+
+    Args:
+        issues: 问题列表
+        others: 要减去的问题列表
+        key: 问题标识
+
+    Returns:
+        List[Dict[str, Any]]: issues 中多出来的问题，保持原有顺序
+    """
+    remaining = Counter(key(issue) for issue in others)
+    extra = []
+    for issue in issues:
+        k = key(issue)
+        if remaining[k]:
+            remaining[k] -= 1
+        else:
+            extra.append(issue)
+    return extra
+
+
+def report_root(report: Dict[str, Any]) -> str:
+    """返回报告的审查根目录，早期报告只记录了命令行中的目录参数。"""
+    return report.get("root") or str(Path(report.get("directory") or ".").resolve())
+
+
+class Baseline:
+    """作为比较基准的审查报告。
+
+    问题按文件的相对路径分组。报告记录了每个文件的内容哈希，且生成
+    报告时的规则指纹与当前一致时，内容未变的文件可以直接沿用基线中
+    的结果而不必重新审查。
+    """
+
+    def __init__(
+        self,
+        report: Dict[str, Any],
+        rules_fingerprint: Optional[str] = None
+    ):
+        """按文件整理基线报告中的问题。
+
+        Args:
+            report: 基线报告
+            rules_fingerprint: 当前的规则指纹，与报告中的不一致时不沿用
+                任何文件的结果
+        """
+        root = report_root(report)
+        self.files: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        # 不属于任何文件的问题（例如目录无法访问），不参与比较
+        for issue in report.get("issues", []):
+            file_path = issue.get("file")
+            if file_path is None:
+                continue
+            issue = {k: v for k, v in issue.items() if k != "file"}
+            self.files[relative_path(file_path, root)].append(issue)
+
+        self.digests: Dict[str, str] = {}
+        if rules_fingerprint is not None and report.get("rules") == rules_fingerprint:
+            self.digests = report.get("digests", {})
+
+    def reusable(
+        self, rel_path: str, digest: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """文件内容与基线中的相同时返回基线中的问题。
+
+        Args:
+            rel_path: 文件的相对路径
+            digest: 文件当前的内容哈希
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 可以沿用的问题列表，不能沿用时返回 None
+        """
+        if digest is None or self.digests.get(rel_path) != digest:
+            return None
+        return [dict(issue) for issue in self.files.get(rel_path, [])]
+
+    def compare(
+        self, rel_path: str, issues: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """比较一个文件的问题与基线。
+
+        Args:
+            rel_path: 文件的相对路径
+            issues: 该文件当前的问题
+
+        Returns:
+            (新增的问题, 已修复的问题)
+        """
+        old = self.files.get(rel_path, [])
+        return subtract_issues(issues, old), subtract_issues(old, issues)
+
+    def missing(self, seen: Iterable[str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """返回基线中有问题、但本次没有审查到的文件（通常已被删除）。
+
+        Args:
+            seen: 本次审查的文件的相对路径
+
+        Returns:
+            (相对路径, 基线中的问题) 列表，按路径排序
+        """
+        seen = set(seen)
+        return sorted(
+            (
+                (rel_path, issues)
+                for rel_path, issues in self.files.items()
+                if rel_path not in seen
+            ),
+            key=lambda item: PurePath(item[0]).parts
+        )
+
+
+def diff_reports(
+    old: Dict[str, Any], new: Dict[str, Any]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """比较两份审查报告。
+
+    Args:
+        old: 旧报告
+        new: 新报告
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: ``new`` 为新增的问题，``fixed`` 为
+        已修复的问题，均带有 file 字段，分别使用新旧报告中的文件路径
+    """
+    baseline = Baseline(old)
+    old_root = report_root(old)
+    current = Baseline(new)
+    new_root = report_root(new)
+
+    new_issues: List[Dict[str, Any]] = []
+    fixed_issues: List[Dict[str, Any]] = []
+    rel_paths = sorted(
+        current.files.keys() | baseline.files.keys(),
+        key=lambda rel_path: PurePath(rel_path).parts
+    )
+    for rel_path in rel_paths:
+        added, fixed = baseline.compare(rel_path, current.files.get(rel_path, []))
+        new_file = str(Path(new_root, rel_path))
+        old_file = str(Path(old_root, rel_path))
+        new_issues.extend({"file": new_file, **issue} for issue in added)
+        fixed_issues.extend({"file": old_file, **issue} for issue in fixed)
+    return {"new": new_issues, "fixed": fixed_issues}
+
+
+class BaselineDiff:
+    """逐个文件累计一次目录审查相对基线新增和已修复的问题。"""
+
+    def __init__(self, baseline: Baseline, root: str):
+        """初始化。
+
+        Args:
+            baseline: 基线
+            root: 本次审查的根目录
+        """
+        self.baseline = baseline
+        self.root = root
+        self.new: List[Dict[str, Any]] = []
+        self.fixed: List[Dict[str, Any]] = []
+        self.reused_files = 0
+        self._seen: List[str] = []
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """记录一个文件的审查结果。
+
+        Args:
+            result: iter_review_directory 产出的结果
+        """
+        file_path = result["file"]
+        rel_path = relative_path(file_path, self.root)
+        self._seen.append(rel_path)
+        if result.get("baseline"):
+            # 沿用基线结果的文件不会有变化
+            self.reused_files += 1
+            return
+        added, fixed = self.baseline.compare(rel_path, result["issues"])
+        self.new.extend({"file": file_path, **issue} for issue in added)
+        self.fixed.extend({"file": file_path, **issue} for issue in fixed)
+
+    def finish(self, complete: bool = True) -> Dict[str, Any]:
+        """返回比较结果。
+
+        Args:
+            complete: 本次是否审查了整个目录；为 True 时基线中有、本次
+                没有的文件视为已删除，其中的问题都算已修复。分片审查时
+                应为 False
+
+        Returns:
+            Dict[str, Any]: 新增的问题、已修复的问题和沿用基线结果的文件数
+        """
+        fixed = list(self.fixed)
+        if complete:
+            for rel_path, issues in self.baseline.missing(self._seen):
+                file_path = str(Path(self.root, rel_path))
+                fixed.extend({"file": file_path, **issue} for issue in issues)
+        return {
+            "new": self.new,
+            "fixed": fixed,
+            "reused_files": self.reused_files
+        }
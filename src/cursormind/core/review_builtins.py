@@ -0,0 +1,196 @@
+"""
+代码审查的内置规则，与第三方规则插件使用同一套 ReviewRule 接口。
+
+规则的注册顺序决定同一类型中各规则问题的输出顺序。函数度量规则
+和函数调用的安全规则分别归为一组，问题按函数或调用节点的顺序交错
+输出。
+"""
+import ast
+from typing import Any, Dict, Optional
+
+from .review_lexer import DOUBLE_QUOTED, SINGLE_QUOTED, LexicalTable
+from .review_rules import FunctionMetrics, ReviewRule, register_rule
+
+
+@register_rule
+class LineLengthRule(ReviewRule):
+    """检查行长度。"""
+
+    name = "line_length"
+    category = "style"
+    severity = "warning"
+    lexical = True
+
+    def check_line(
+        self, line_no: int, lexical: LexicalTable
+    ) -> Optional[Dict[str, Any]]:
+        max_length = self.config["style"]["max_line_length"]
+        if lexical.lengths[line_no - lexical.first_line] > max_length:
+            return self.issue(f"行长度超过 {max_length} 个字符", line_no)
+        return None
+
+
+@register_rule
+class IndentationRule(ReviewRule):
+    """检查函数、类和控制流语句的缩进。"""
+
+    name = "indentation"
+    category = "style"
+    severity = "warning"
+    node_types = (ast.FunctionDef, ast.ClassDef, ast.If, ast.For, ast.While)
+
+    def visit(self, node: ast.AST) -> Optional[Dict[str, Any]]:
+        indent_size = self.config["style"]["indent_size"]
+        if node.col_offset % indent_size != 0:
+            return self.issue(f"缩进应该是 {indent_size} 的倍数", node.lineno)
+        return None
+
+
+@register_rule
+class DocstringRule(ReviewRule):
+    """检查模块、函数和类的文档字符串。"""
+
+    name = "docstring"
+    category = "style"
+    node_types = (ast.FunctionDef, ast.ClassDef, ast.Module)
+
+    def visit(self, node: ast.AST) -> Optional[Dict[str, Any]]:
+        if not ast.get_docstring(node):
+            # 模块节点没有 lineno
+            return self.issue("缺少文档字符串", getattr(node, "lineno", 1))
+        return None
+
+
+@register_rule
+class QuotesRule(ReviewRule):
+    """检查引号使用。
+
+    只检查在该行开始的普通字符串和 f-string；三引号字符串、注释，
+    以及内容中含有建议引号（改用后需要转义）的字符串不报告。
+    """
+
+    name = "quotes"
+    category = "style"
+    lexical = True
+
+    def check_line(
+        self, line_no: int, lexical: LexicalTable
+    ) -> Optional[Dict[str, Any]]:
+        quote_type = self.config["style"]["quote_type"]
+        flags = lexical.flags[line_no - lexical.first_line]
+        if quote_type == "double" and flags & SINGLE_QUOTED:
+            return self.issue("建议使用双引号", line_no)
+        if quote_type == "single" and flags & DOUBLE_QUOTED:
+            return self.issue("建议使用单引号", line_no)
+        return None
+
+
+class _FunctionLimitRule(ReviewRule):
+    """函数度量超过配置上限时报告问题。"""
+
+    category = "performance"
+    severity = "warning"
+    functions = True
+    group = "functions"
+    # 度量属性名、配置项和问题说明中的度量名称
+    metric = ""
+    limit_key = ""
+    label = ""
+
+    def check_function(
+        self, metrics: FunctionMetrics
+    ) -> Optional[Dict[str, Any]]:
+        value = getattr(metrics, self.metric)
+        limit = self.config["performance"][self.limit_key]
+        if value > limit:
+            return self.issue(
+                f"{self.label}为 {value}，超过最大值 {limit}",
+                metrics.node.lineno
+            )
+        return None
+
+
+@register_rule
+class ComplexityRule(_FunctionLimitRule):
+    """检查函数复杂度。"""
+
+    name = "complexity"
+    metric = "complexity"
+    limit_key = "max_complexity"
+    label = "函数复杂度"
+
+
+@register_rule
+class LocalsRule(_FunctionLimitRule):
+    """检查局部变量数量。"""
+
+    name = "locals"
+    metric = "locals"
+    limit_key = "max_locals"
+    label = "局部变量数量"
+
+
+@register_rule
+class ReturnsRule(_FunctionLimitRule):
+    """检查 return 语句数量。"""
+
+    name = "returns"
+    metric = "returns"
+    limit_key = "max_returns"
+    label = "return语句数量"
+
+
+@register_rule
+class StatementsRule(_FunctionLimitRule):
+    """检查语句数量。"""
+
+    name = "statements"
+    metric = "statements"
+    limit_key = "max_statements"
+    label = "语句数量"
+
+
+class _RiskyCallRule(ReviewRule):
+    """调用配置中列出的危险函数时报告问题。"""
+
+    category = "security"
+    severity = "error"
+    node_types = (ast.Call,)
+    group = "calls"
+    # 配置项和问题说明
+    functions_key = ""
+    message = ""
+
+    def visit(self, node: ast.Call) -> Optional[Dict[str, Any]]:
+        if (isinstance(node.func, ast.Name) and
+                node.func.id in self.config["security"][self.functions_key]):
+            return self.issue(self.message, node.lineno)
+        return None
+
+
+@register_rule
+class SqlInjectionRule(_RiskyCallRule):
+    """检查 SQL 注入风险。"""
+
+    name = "sql_injection"
+    functions_key = "sql_risk_functions"
+    message = "可能存在SQL注入风险"
+
+
+@register_rule
+class CommandInjectionRule(_RiskyCallRule):
+    """检查命令注入风险。"""
+
+    name = "command_injection"
+    functions_key = "shell_risk_functions"
+    message = "可能存在命令注入风险"
+
+
+@register_rule
+class FileAccessRule(_RiskyCallRule):
+    """检查文件访问风险。"""
+
+    name = "file_access"
+    severity = "warning"
+    functions_key = "file_risk_functions"
+    message = "可能存在不安全的文件访问"
@@ -0,0 +1,292 @@
+"""
+代码审查结果缓存模块，跳过未修改文件的重复审查。
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 命中时若上次使用时间早于该间隔才刷新，避免每次命中都写库
+TOUCH_INTERVAL = 3600
+
+# 每写入多少条结果检查一次缓存大小
+EVICT_CHECK_INTERVAL = 256
+
+
+def content_digest(content: str) -> str:
+    """计算文件内容的哈希值。
+
+    Args:
+        content: 文件内容
+
+    Returns:
+        十六进制哈希字符串
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ReviewCache:
+    """基于内容哈希的审查结果缓存。
+
+    结果以 (内容哈希, 规则指纹) 为键保存在 SQLite 中；另外记录每个路径
+    最近一次的 size、mtime_ns 和 inode，元数据未变时无需读取和哈希文件。
+    缓存总大小超过上限时按最近使用时间淘汰。
+    """
+
+    def __init__(self, db_file: Path, fingerprint: str, max_size: int):
+        """初始化缓存。
+
+        Args:
+            db_file: SQLite 数据库文件路径
+            fingerprint: 规则配置和工具版本的指纹
+            max_size: 缓存结果的最大总字节数
+        """
+        self.db_file = db_file
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._stores = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """按需打开数据库连接，出错时禁用缓存。
+
+        Returns:
+            Optional[sqlite3.Connection]: 数据库连接，缓存不可用时返回 None
+        """
+        if self._conn is not None or self._disabled:
+            return self._conn
+
+        try:
+            conn = sqlite3.connect(
+                str(self.db_file), timeout=30, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    digest TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    issues TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (digest, fingerprint)
+                );
+                CREATE INDEX IF NOT EXISTS results_last_used
+                    ON results (last_used);
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    digest TEXT NOT NULL
+                );
+            """)
+        except sqlite3.Error as e:
+            print(f"审查缓存不可用：{str(e)}")
+            self._disabled = True
+            return None
+
+        self._conn = conn
+        self._evict(conn)
+        return conn
+
+    def _fetch(
+        self, conn: sqlite3.Connection, digest: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """按内容哈希读取缓存结果，并按需刷新使用时间。
+
+        Args:
+            conn: 数据库连接
+            digest: 内容哈希
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 缓存的问题列表
+        """
+        row = conn.execute(
+            "SELECT issues, last_used FROM results "
+            "WHERE digest = ? AND fingerprint = ?",
+            (digest, self.fingerprint)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row[1] > TOUCH_INTERVAL:
+            conn.execute(
+                "UPDATE results SET last_used = ? "
+                "WHERE digest = ? AND fingerprint = ?",
+                (now, digest, self.fingerprint)
+            )
+        return json.loads(row[0])
+
+    def known_digest(self, path: Path, st: os.stat_result) -> Optional[str]:
+        """仅凭文件元数据查询上次记录的内容哈希，不读取文件内容。
+
+        Args:
+            path: 文件路径
+            st: 文件的 stat 结果
+
+        Returns:
+            Optional[str]: 内容哈希，元数据与记录不一致时返回 None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        try:
+            row = conn.execute(
+                "SELECT digest FROM files "
+                "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (str(path), st.st_size, st.st_mtime_ns, st.st_ino)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return None if row is None else row[0]
+
+    def lookup(
+        self, path: Path, st: os.stat_result
+    ) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """仅凭文件元数据查询缓存，不读取文件内容。
+
+        Args:
+            path: 文件路径
+            st: 文件的 stat 结果
+
+        Returns:
+            Optional[Tuple[str, List[Dict[str, Any]]]]: (内容哈希, 缓存的
+            问题列表)，未命中返回 None
+        """
+        digest = self.known_digest(path, st)
+        if digest is None:
+            return None
+
+        try:
+            issues = self._fetch(self._conn, digest)
+        except sqlite3.Error:
+            return None
+        return None if issues is None else (digest, issues)
+
+    def lookup_content(
+        self, path: Path, st: os.stat_result, digest: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """按内容哈希查询缓存，命中时记录文件的新元数据。
+
+        Args:
+            path: 文件路径
+            st: 读取文件前的 stat 结果
+            digest: 内容哈希
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 缓存的问题列表，未命中返回 None
+        """
+        conn = self._connect()
+        if conn is None:
+            return None
+
+        try:
+            issues = self._fetch(conn, digest)
+            if issues is not None:
+                self._record_file(conn, path, st, digest)
+            return issues
+        except sqlite3.Error:
+            return None
+
+    def store(
+        self,
+        path: Path,
+        st: os.stat_result,
+        digest: str,
+        issues: List[Dict[str, Any]]
+    ) -> None:
+        """保存审查结果。
+
+        Args:
+            path: 文件路径
+            st: 读取文件前的 stat 结果
+            digest: 内容哈希
+            issues: 问题列表
+        """
+        conn = self._connect()
+        if conn is None:
+            return
+
+        data = json.dumps(issues, ensure_ascii=False)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO results "
+                "(digest, fingerprint, issues, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (digest, self.fingerprint, data, len(data), time.time())
+            )
+            self._record_file(conn, path, st, digest)
+            self._stores += 1
+            if self._stores % EVICT_CHECK_INTERVAL == 0:
+                self._evict(conn)
+        except sqlite3.Error:
+            pass
+
+    def _record_file(
+        self,
+        conn: sqlite3.Connection,
+        path: Path,
+        st: os.stat_result,
+        digest: str
+    ) -> None:
+        """记录路径的元数据与内容哈希的对应关系。"""
+        conn.execute(
+            "INSERT OR REPLACE INTO files "
+            "(path, size, mtime_ns, inode, digest) VALUES (?, ?, ?, ?, ?)",
+            (str(path), st.st_size, st.st_mtime_ns, st.st_ino, digest)
+        )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """缓存超过上限时淘汰最久未使用的结果。
+
+        Args:
+            conn: 数据库连接
+        """
+        try:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+            if total <= self.max_size:
+                return
+
+            # 淘汰到上限的 90%，避免每次写入都触发淘汰
+            excess = total - self.max_size * 9 // 10
+            cutoff = None
+            freed = 0
+            cursor = conn.execute(
+                "SELECT size, last_used FROM results ORDER BY last_used"
+            )
+            for size, last_used in cursor:
+                freed += size
+                cutoff = last_used
+                if freed >= excess:
+                    break
+            cursor.close()
+
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM results WHERE last_used <= ?", (cutoff,))
+            conn.execute(
+                "DELETE FROM files WHERE digest NOT IN "
+                "(SELECT digest FROM results)"
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        conn = self._connect()
+        if conn is None:
+            return
+
+        conn.execute("DELETE FROM results")
+        conn.execute("DELETE FROM files")
+        conn.execute("VACUUM")
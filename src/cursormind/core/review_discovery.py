@@ -0,0 +1,226 @@
+"""
+代码审查文件发现模块，遍历目录时尽早剪除被忽略的子目录。
+"""
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# 默认排除的目录和文件，语法与 .gitignore 相同
+DEFAULT_EXCLUDES = [
+    ".git", ".hg", ".svn",
+    ".venv", "venv", ".env", "env",
+    "node_modules", "site-packages", "__pycache__",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "build", "dist", "*.egg-info",
+]
+
+
+class IgnorePattern:
+    """一条 .gitignore 风格的忽略规则。"""
+
+    def __init__(self, pattern: str, base: str = ""):
+        """解析忽略规则。
+
+        Args:
+            pattern: 规则文本
+            base: 定义该规则的 .gitignore 所在目录（相对于审查根目录）
+        """
+        self.base = base
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+
+        # 含有斜杠（末尾除外）的规则相对于所在目录匹配，否则匹配任意层级的名称
+        self.anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        self.regex = re.compile(self._translate(pattern))
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """把 glob 规则转换为正则表达式。
+
+        Args:
+            pattern: glob 规则
+
+        Returns:
+            str: 正则表达式
+        """
+        parts = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if pattern.startswith("**/", i):
+                parts.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                parts.append(".*")
+                i += 2
+            elif char == "*":
+                parts.append("[^/]*")
+                i += 1
+            elif char == "?":
+                parts.append("[^/]")
+                i += 1
+            elif char == "[":
+                end = pattern.find("]", i + 1)
+                if end == -1:
+                    parts.append(re.escape(char))
+                    i += 1
+                else:
+                    body = pattern[i + 1:end]
+                    if body.startswith("!"):
+                        body = "^" + body[1:]
+                    parts.append(f"[{body}]")
+                    i = end + 1
+            elif char == "\\" and i + 1 < len(pattern):
+                parts.append(re.escape(pattern[i + 1]))
+                i += 2
+            else:
+                parts.append(re.escape(char))
+                i += 1
+        return "".join(parts)
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        """判断路径是否匹配该规则。
+
+        Args:
+            rel_path: 相对于审查根目录的路径
+            name: 文件或目录名
+            is_dir: 是否为目录
+
+        Returns:
+            bool: 是否匹配
+        """
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+
+        target = rel_path if self.anchored else name
+        return self.regex.fullmatch(target) is not None
+
+
+def compile_patterns(lines: List[str], base: str = "") -> List[IgnorePattern]:
+    """编译一组忽略规则，跳过空行和注释。
+
+    Args:
+        lines: 规则文本列表
+        base: 规则所在目录（相对于审查根目录）
+
+    Returns:
+        List[IgnorePattern]: 规则列表
+    """
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        patterns.append(IgnorePattern(line, base))
+    return patterns
+
+
+def _load_gitignore(directory: str, base: str) -> List[IgnorePattern]:
+    """读取目录下的 .gitignore。
+
+    Args:
+        directory: 目录路径
+        base: 目录相对于审查根目录的路径
+
+    Returns:
+        List[IgnorePattern]: 规则列表，文件不存在时为空
+    """
+    try:
+        with open(
+            os.path.join(directory, ".gitignore"), "r", encoding="utf-8"
+        ) as f:
+            return compile_patterns(f.readlines(), base)
+    except (OSError, UnicodeError):
+        return []
+
+
+def _is_ignored(
+    patterns: List[IgnorePattern], rel_path: str, name: str, is_dir: bool
+) -> bool:
+    """按 .gitignore 语义判断路径是否被忽略，后出现的规则优先。"""
+    ignored = False
+    for pattern in patterns:
+        if pattern.matches(rel_path, name, is_dir):
+            ignored = not pattern.negate
+    return ignored
+
+
+def iter_python_files(
+    root: str,
+    excludes: Optional[List[str]] = None,
+    use_gitignore: bool = True,
+    start: str = "",
+    visit_dir: Optional[Callable[[str], bool]] = None
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """遍历目录中的 Python 文件。
+
+    使用 ``os.scandir`` 按名称顺序深度优先遍历，产出顺序与
+    ``sorted(Path(root).rglob("*.py"))`` 一致。被排除的目录不会进入，
+    符号链接的目录和文件都不会跟随，与审查单个文件时拒绝符号链接一致。
+    每个文件附带遍历时取得的 stat 结果，后续审查无需再次查询。
+
+    Args:
+        root: 根目录
+        excludes: 排除规则，语法与 .gitignore 相同，默认为 DEFAULT_EXCLUDES
+        use_gitignore: 是否遵循各级目录中的 .gitignore
+        start: 只遍历根目录下的这个子目录（以 / 分隔的相对路径），上级
+            目录中的 .gitignore 仍然生效
+        visit_dir: 进入每个目录（包括起始目录）前调用，参数为目录路径，
+            返回 False 时跳过该目录
+
+    Yields:
+        (文件路径, stat 结果)
+    """
+    if excludes is None:
+        excludes = DEFAULT_EXCLUDES
+    root_patterns = compile_patterns(excludes)
+
+    def walk(
+        directory: str, rel_dir: str, patterns: List[IgnorePattern]
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        if visit_dir is not None and not visit_dir(directory):
+            return
+        if use_gitignore:
+            patterns = patterns + _load_gitignore(directory, rel_dir)
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not _is_ignored(patterns, rel_path, entry.name, True):
+                        yield from walk(entry.path, rel_path, patterns)
+                elif entry.name.endswith(".py") and entry.is_file(
+                    follow_symlinks=False
+                ):
+                    if not _is_ignored(patterns, rel_path, entry.name, False):
+                        yield entry.path, entry.stat()
+            except OSError:
+                continue
+
+    # 从子目录开始时先加载各级上级目录中的 .gitignore
+    directory = str(Path(root))
+    rel_dir = ""
+    for name in filter(None, start.split("/")):
+        if use_gitignore:
+            root_patterns = root_patterns + _load_gitignore(directory, rel_dir)
+        directory = os.path.join(directory, name)
+        rel_dir = f"{rel_dir}/{name}" if rel_dir else name
+
+    yield from walk(directory, rel_dir, root_patterns)
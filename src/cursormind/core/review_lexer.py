@@ -0,0 +1,256 @@
+"""
+代码审查词法分析模块，一次遍历生成供逐行规则共用的行信息表。
+"""
+import re
+import tokenize
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+# 行标志位
+# 该行开始了一个可以改用双引号的单引号字符串（内容中没有双引号）
+SINGLE_QUOTED = 1
+# 该行开始了一个可以改用单引号的双引号字符串（内容中没有单引号）
+DOUBLE_QUOTED = 2
+# 该行开始了一个三引号字符串（文档字符串等）
+TRIPLE_QUOTED = 4
+# 该行开始了一个 f-string
+FORMATTED = 8
+# 该行有注释
+COMMENT = 16
+
+# 字符串或注释可能开始的位置
+_LEXEME_START = re.compile(r"[#'\"]")
+
+# 字符串前缀可以使用的字母
+_PREFIX_CHARS = frozenset("rRbBuUfF")
+
+# 从开头引号之后匹配到结尾引号，直接使用 tokenize 模块的定义
+_STRING_END = {
+    "'": re.compile(tokenize.Single, re.DOTALL),
+    '"': re.compile(tokenize.Double, re.DOTALL),
+    "'''": re.compile(tokenize.Single3, re.DOTALL),
+    '"""': re.compile(tokenize.Double3, re.DOTALL),
+}
+
+
+class LexicalTable:
+    """一段连续行的词法信息。
+
+    整个文件一次分析时 first_line 为 1；流式分析大文件时每个分块
+    一张表，行号从 first_line 开始。各列表按表内位置索引，即行号减去
+    first_line。
+
+    Attributes:
+        first_line: 表中第一行的行号
+        lines: 每行的文本
+        lengths: 每行去掉行尾空白后的长度
+        flags: 每行的标志位，字符串按开始所在的行记录
+        comments: 有注释的行号到注释起始列的映射
+    """
+
+    __slots__ = ("first_line", "lines", "lengths", "flags", "comments")
+
+    def __init__(
+        self,
+        lines: List[str],
+        lengths: array,
+        flags: bytearray,
+        comments: Dict[int, int],
+        first_line: int = 1
+    ):
+        self.first_line = first_line
+        self.lines = lines
+        self.lengths = lengths
+        self.flags = flags
+        self.comments = comments
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def line_numbers(self) -> range:
+        """返回表中所有行的行号。"""
+        return range(self.first_line, self.first_line + len(self.lengths))
+
+    def text(self, line_no: int) -> str:
+        """返回某一行的文本。
+
+        Args:
+            line_no: 行号
+
+        Returns:
+            str: 该行文本，不含换行符
+        """
+        return self.lines[line_no - self.first_line]
+
+
+def _string_flags(prefix: str, quotes: str, body: str) -> int:
+    """计算一个字符串字面量的标志位。
+
+    Args:
+        prefix: 字符串前缀，例如 ``rb``
+        quotes: 开头的引号
+        body: 引号之间的内容
+
+    Returns:
+        int: 标志位
+    """
+    flags = FORMATTED if "f" in prefix.lower() else 0
+    if len(quotes) == 3:
+        return flags | TRIPLE_QUOTED
+    if quotes == "'" and '"' not in body:
+        return flags | SINGLE_QUOTED
+    if quotes == '"' and "'" not in body:
+        return flags | DOUBLE_QUOTED
+    return flags
+
+
+def scan(content: str) -> LexicalTable:
+    """对代码做一次词法分析，生成行信息表。
+
+    逐个词法单元调用 ``tokenize.generate_tokens`` 在纯 Python 实现下
+    比解析 AST 还慢，而行规则只关心字符串和注释。这里用 tokenize 对
+    字符串的定义，以正则表达式依次跳到下一个字符串或注释，其余代码
+    不逐个处理。输入须是能够解析的代码。
+
+    Args:
+        content: 代码内容
+
+    Returns:
+        LexicalTable: 行信息表
+    """
+    return _scan(content, 1, True)[0]
+
+
+def iter_scan(data, chunk_size: int = 4 * 1024 * 1024) -> Iterator[LexicalTable]:
+    """分块对大文件做词法分析，内存占用与分块大小相当。
+
+    每块在换行处切分后解码；块末尾未结束的字符串（例如跨块的三引号
+    字符串）从其开始的行起并入下一块重新分析。
+
+    Args:
+        data: 文件内容，支持 ``find`` 和切片的字节对象，通常为 mmap
+        chunk_size: 每块的近似字节数
+
+    Yields:
+        LexicalTable: 每块的行信息表，行号连续
+
+    Raises:
+        UnicodeDecodeError: 文件不是 UTF-8 编码时抛出
+    """
+    size = len(data)
+    pos = 0
+    carry = ""
+    # 并入下一块的行中已经分析过的部分：继续分析的位置和已有的标志位
+    resume = 0
+    carry_flags = 0
+    first_line = 1
+    while True:
+        end = data.find(b"\n", min(pos + chunk_size, size))
+        end = size if end == -1 else end + 1
+        final = end >= size
+        text = carry + data[pos:end].decode("utf-8").replace("\r\n", "\n")
+        pos = end
+
+        table, consumed, resume, carry_flags = _scan(
+            text, first_line, final, resume, carry_flags
+        )
+        if len(table):
+            yield table
+        if final:
+            return
+        first_line += len(table)
+        carry = text[consumed:]
+
+
+def _scan(
+    content: str,
+    first_line: int,
+    final: bool,
+    pos: int = 0,
+    first_flags: int = 0
+) -> Tuple[LexicalTable, int, int, int]:
+    """分析一段以行首开始的代码。
+
+    Args:
+        content: 代码内容；final 为 False 时以换行符结尾
+        first_line: 第一行的行号
+        final: 是否为文件的最后一段
+        pos: 开始分析的位置，第一行在此之前的部分已经分析过
+        first_flags: 第一行已有的标志位
+
+    Returns:
+        (行信息表, 已分析部分的长度, 继续分析的位置, 该行已有的标志位)。
+        final 为 False 且末尾有未结束的字符串时，表中只包含该字符串
+        开始之前的行；剩余部分从该行开头开始，后两项用于下一块从该
+        字符串处继续分析
+    """
+    lines = content.split("\n")
+    if not final:
+        # 以换行符结尾时最后一个元素是空串，属于下一段
+        lines.pop()
+    flags = bytearray(len(lines))
+    if lines:
+        flags[0] = first_flags
+    comments: Dict[int, int] = {}
+    consumed = len(content)
+    resume = 0
+    resume_flags = 0
+
+    search = _LEXEME_START.search
+    row = 0
+    line_start = 0
+    while True:
+        match = search(content, pos)
+        if match is None:
+            break
+
+        start = match.start()
+        newlines = content.count("\n", pos, start)
+        if newlines:
+            row += newlines
+            line_start = content.rindex("\n", pos, start) + 1
+
+        char = content[start]
+        if char == "#":
+            flags[row] |= COMMENT
+            comments[first_line + row] = start - line_start
+            pos = content.find("\n", start)
+            if pos == -1:
+                break
+            continue
+
+        quote = char * 3 if content.startswith(char * 3, start) else char
+        end = _STRING_END[quote].match(content, start + len(quote))
+        if end is None:
+            if not final:
+                resume_flags = flags[row]
+                del lines[row:]
+                del flags[row:]
+                consumed = line_start
+                resume = start - line_start
+            break
+
+        # 向前最多取两个前缀字母；前面紧跟标识符字符时（如 ``if'a'``）
+        # 这些字母属于标识符
+        prefix_start = start
+        while (start - prefix_start < 2 and prefix_start > line_start and
+               content[prefix_start - 1] in _PREFIX_CHARS):
+            prefix_start -= 1
+        if prefix_start > line_start and (
+            content[prefix_start - 1].isalnum() or
+            content[prefix_start - 1] == "_"
+        ):
+            prefix_start = start
+
+        body = content[start + len(quote):end.end() - len(quote)]
+        flags[row] |= _string_flags(content[prefix_start:start], quote, body)
+
+        pos = end.end()
+        newlines = body.count("\n")
+        if newlines:
+            row += newlines
+            line_start = content.rindex("\n", start, pos) + 1
+
+    lengths = array("I", [len(line.rstrip()) for line in lines])
+    table = LexicalTable(lines, lengths, flags, comments, first_line)
+    return table, consumed, resume, resume_flags
@@ -0,0 +1,157 @@
+"""
+代码审查性能分析模块，统计各规则、各阶段和各文件的耗时。
+"""
+import heapq
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+
+class ReviewProfiler:
+    """审查过程的耗时统计。
+
+    规则和阶段按名称累计调用次数与总耗时（秒），文件按路径记录总耗时。
+    统计数据可以通过 ``drain`` / ``merge`` 在进程之间传递。
+    """
+
+    def __init__(self):
+        """初始化空的统计数据。"""
+        self.rules: Dict[str, List[float]] = {}
+        self.phases: Dict[str, List[float]] = {}
+        self.files: Dict[str, float] = {}
+
+    @staticmethod
+    def _record(table: Dict[str, List[float]], name: str, elapsed: float) -> None:
+        """累计一次调用。"""
+        entry = table.get(name)
+        if entry is None:
+            table[name] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """包装规则函数，记录每次调用的耗时。
+
+        Args:
+            name: 规则名称
+            func: 规则函数
+
+        Returns:
+            Callable: 包装后的函数
+        """
+        rules = self.rules
+        record = self._record
+        perf_counter = time.perf_counter
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(rules, name, perf_counter() - start)
+
+        return timed
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """统计一个阶段的耗时。
+
+        Args:
+            name: 阶段名称
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(self.phases, name, time.perf_counter() - start)
+
+    def time_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """统计从可迭代对象中取出每个元素的耗时，计入对应阶段。
+
+        Args:
+            name: 阶段名称
+            iterable: 可迭代对象
+
+        Yields:
+            原可迭代对象中的元素
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._record(self.phases, name, time.perf_counter() - start)
+                return
+            self._record(self.phases, name, time.perf_counter() - start)
+            yield item
+
+    def add_file(self, file_path: str, elapsed: float) -> None:
+        """记录单个文件的总耗时。
+
+        Args:
+            file_path: 文件路径
+            elapsed: 耗时（秒）
+        """
+        self.files[file_path] = self.files.get(file_path, 0.0) + elapsed
+
+    def drain(self) -> Dict[str, Any]:
+        """取出并清空当前的统计数据，用于从工作进程传回主进程。
+
+        Returns:
+            Dict[str, Any]: 统计数据
+        """
+        data = {"rules": self.rules, "phases": self.phases, "files": self.files}
+        self.rules = {}
+        self.phases = {}
+        self.files = {}
+        return data
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """合并其他进程的统计数据。
+
+        Args:
+            data: ``drain`` 返回的统计数据
+        """
+        for table_name in ("rules", "phases"):
+            table = getattr(self, table_name)
+            for name, (calls, elapsed) in data[table_name].items():
+                entry = table.setdefault(name, [0, 0.0])
+                entry[0] += calls
+                entry[1] += elapsed
+        for file_path, elapsed in data["files"].items():
+            self.add_file(file_path, elapsed)
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """生成可以写入报告的统计结果。
+
+        Args:
+            top: 列出最慢的文件数量
+
+        Returns:
+            Dict[str, Any]: 统计结果，耗时单位为秒
+        """
+        def summarize(table: Dict[str, List[float]]) -> Dict[str, Dict]:
+            return {
+                name: {"calls": int(calls), "seconds": round(elapsed, 6)}
+                for name, (calls, elapsed) in sorted(
+                    table.items(), key=lambda x: x[1][1], reverse=True
+                )
+            }
+
+        slowest = heapq.nlargest(
+            top, self.files.items(), key=lambda x: x[1]
+        )
+        return {
+            "rules": summarize(self.rules),
+            "phases": summarize(self.phases),
+            "files": len(self.files),
+            "total_seconds": round(sum(self.files.values()), 6),
+            "slowest_files": [
+                {"file": file_path, "seconds": round(elapsed, 6)}
+                for file_path, elapsed in slowest
+            ]
+        }
@@ -0,0 +1,278 @@
+"""
+代码审查报告渲染模块，先输出汇总，再分页输出问题。
+
+问题很多时逐条调用 ``console.print`` 并解析标记非常慢，而且会淹没终端
+的滚动缓冲区。这里的渲染器每个问题只占一行：富文本模式下一页问题
+拼成一个 Text 对象一次输出，不解析标记；纯文本模式直接写入输出流，
+格式为 ``文件:行号: 级别 [规则] 说明``，便于 grep 和编辑器跳转。
+rich 只在富文本模式下才导入，纯文本模式不需要它。
+"""
+import sys
+from collections import Counter
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# 富文本模式下未指定 --limit 时每页显示的问题数
+DEFAULT_PAGE_SIZE = 50
+
+# 纯文本模式每次写入输出流的行数
+_WRITE_BATCH = 4096
+
+SEVERITY_COLORS = {
+    "error": "red",
+    "warning": "yellow",
+    "info": "blue"
+}
+
+# 问题分组方式到分组键的映射
+GROUP_KEYS = {
+    "file": lambda issue: issue.get("file", ""),
+    "rule": lambda issue: issue["rule"],
+}
+
+
+def summarize(issues: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """一次遍历统计问题的各类分布。
+
+    Args:
+        issues: 问题
+
+    Returns:
+        Dict[str, Any]: 问题总数，以及按类型、严重程度、规则和文件的计数
+    """
+    by_type: Counter = Counter()
+    by_severity: Counter = Counter()
+    by_rule: Counter = Counter()
+    by_file: Counter = Counter()
+    total = 0
+    for issue in issues:
+        total += 1
+        by_type[issue["type"]] += 1
+        by_severity[issue["severity"]] += 1
+        by_rule[issue["rule"]] += 1
+        if "file" in issue:
+            by_file[issue["file"]] += 1
+    return {
+        "total": total,
+        "by_type": by_type,
+        "by_severity": by_severity,
+        "by_rule": by_rule,
+        "by_file": by_file
+    }
+
+
+def page_issues(
+    issues: Iterable[Dict[str, Any]],
+    offset: int = 0,
+    limit: Optional[int] = None,
+    group_by: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """按分组排序后取出一页问题。
+
+    目录报告中的问题本来就按文件排列，按文件分组时排序不会打乱
+    同一文件内的顺序。
+
+    Args:
+        issues: 问题
+        offset: 起始位置
+        limit: 最多取出的数量，None 表示取到末尾
+        group_by: 分组方式，file、rule 或 None
+
+    Returns:
+        List[Dict[str, Any]]: 这一页的问题
+    """
+    if group_by is not None:
+        issues = sorted(issues, key=GROUP_KEYS[group_by])
+    stop = None if limit is None else offset + limit
+    return list(islice(issues, offset, stop))
+
+
+class ReviewRenderer:
+    """审查报告渲染器。"""
+
+    def __init__(
+        self,
+        console: "Console",
+        plain: bool = False,
+        stream: Optional[TextIO] = None,
+        file_path: Optional[str] = None
+    ):
+        """初始化渲染器。
+
+        Args:
+            console: 富文本模式使用的控制台
+            plain: 是否使用纯文本模式
+            stream: 纯文本模式的输出流，默认为标准输出
+            file_path: 单文件报告的文件路径，纯文本模式下用于问题没有
+                file 字段时补全位置
+        """
+        self.console = console
+        self.plain = plain
+        self.stream = stream or sys.stdout
+        self.file_path = file_path
+
+    def default_limit(self, limit: Optional[int]) -> Optional[int]:
+        """富文本模式默认只显示一页，纯文本模式默认输出全部问题。"""
+        if limit is not None or self.plain:
+            return limit
+        return DEFAULT_PAGE_SIZE
+
+    def _write(self, lines: Iterable[str]) -> None:
+        """分批写入纯文本行。"""
+        lines = iter(lines)
+        while True:
+            batch = list(islice(lines, _WRITE_BATCH))
+            if not batch:
+                break
+            self.stream.write("\n".join(batch) + "\n")
+        self.stream.flush()
+
+    def header(self, title: str, fields: List[Tuple[str, Any]]) -> None:
+        """输出报告标题和基本信息。
+
+        Args:
+            title: 标题，例如“目录审查报告”
+            fields: (名称, 值) 列表
+        """
+        if self.plain:
+            self._write(f"# {name}：{value}" for name, value in fields)
+            return
+        from rich.text import Text
+
+        self.console.print(f"\n[cyan]== {title} ==[/cyan]")
+        for name, value in fields:
+            self.console.print(f"{name}：", Text(str(value), style="blue"), sep="")
+
+    def summary(self, stats: Dict[str, Any], top: int = 10) -> None:
+        """输出问题统计和问题最多的文件、规则。
+
+        Args:
+            stats: summarize 的返回值
+            top: 列出的文件和规则数量，为 0 时不列出
+        """
+        if self.plain:
+            lines = [f"# 总问题数：{stats['total']}"]
+            for key, name in (("by_type", "类型"), ("by_severity", "严重程度")):
+                lines.extend(
+                    f"# {name} {k}：{count}" for k, count in stats[key].items()
+                )
+            if top:
+                for key, name in (("by_file", "文件"), ("by_rule", "规则")):
+                    lines.extend(
+                        f"# 问题最多的{name} {k}：{count}"
+                        for k, count in stats[key].most_common(top)
+                    )
+            self._write(lines)
+            return
+
+        self.console.print(f"\n总问题数：[red]{stats['total']}[/red]")
+        if stats["by_type"]:
+            self.console.print("\n[yellow]问题类型分布：[/yellow]")
+            for type_name, count in stats["by_type"].items():
+                self.console.print(f"- {type_name}: [blue]{count}[/blue]")
+        if stats["by_severity"]:
+            self.console.print("\n[yellow]严重程度分布：[/yellow]")
+            for severity, count in stats["by_severity"].items():
+                color = SEVERITY_COLORS.get(severity, "white")
+                self.console.print(f"- {severity}: [{color}]{count}[/{color}]")
+
+        if not top:
+            return
+        # 单文件报告没有文件分布
+        if len(stats["by_file"]) > 1:
+            self._top_table("问题最多的文件", "文件", stats["by_file"], top)
+        if stats["by_rule"]:
+            self._top_table("问题最多的规则", "规则", stats["by_rule"], top)
+
+    def _top_table(self, title: str, column: str, counts: Counter, top: int) -> None:
+        """输出计数最多的前 top 项。"""
+        from rich.table import Table
+
+        table = Table(title=f"{title}（前 {min(top, len(counts))} 个，共 {len(counts)} 个）")
+        table.add_column(column, style="blue")
+        table.add_column("问题数", style="red", justify="right")
+        for name, count in counts.most_common(top):
+            table.add_row(name, str(count))
+        self.console.print(table)
+
+    def _plain_line(self, issue: Dict[str, Any]) -> str:
+        """格式化为 ``文件:行号: 级别 [规则] 说明``。"""
+        file_path = issue.get("file", self.file_path)
+        location = f"{file_path}:{issue['line']}" if file_path else str(issue["line"])
+        return (
+            f"{location}: {issue['severity'].upper()} "
+            f"[{issue['rule']}] {issue['message']}"
+        )
+
+    def issues(
+        self, issues: List[Dict[str, Any]], group_by: Optional[str] = None
+    ) -> None:
+        """输出一页问题，每个问题一行。
+
+        Args:
+            issues: 这一页的问题，分组时应已按分组排序
+            group_by: 分组方式，分组变化时输出分组标题
+        """
+        if self.plain:
+            self._write(self._plain_line(issue) for issue in issues)
+            return
+        from rich.text import Text
+
+        key = GROUP_KEYS.get(group_by)
+        text = Text()
+        current = None
+        for issue in issues:
+            if key is not None:
+                group = key(issue)
+                if group != current:
+                    current = group
+                    text.append(f"\n{group}\n", style="bold cyan")
+            severity = issue["severity"]
+            text.append(f"{severity.upper():<8}", style=SEVERITY_COLORS.get(severity, "white"))
+            if group_by != "file" and "file" in issue:
+                text.append(f"{issue['file']}:{issue['line']} ", style="blue")
+            else:
+                text.append(f"第 {issue['line']} 行 ", style="blue")
+            if group_by != "rule":
+                text.append(f"[{issue['rule']}] ", style="yellow")
+            text.append(issue["message"])
+            text.append("\n")
+        text.rstrip()
+        # 不折行、不解析标记，一页只输出一次
+        self.console.print(text, markup=False, highlight=False, soft_wrap=True)
+
+    def page(
+        self,
+        issues: List[Dict[str, Any]],
+        offset: int,
+        total: int,
+        group_by: Optional[str] = None
+    ) -> None:
+        """输出一页问题及其位置，后面还有问题时提示如何翻页。
+
+        Args:
+            issues: 这一页的问题
+            offset: 这一页的起始位置
+            total: 问题总数
+            group_by: 分组方式
+        """
+        if not issues:
+            if not self.plain and total:
+                self.console.print(f"\n没有更多问题（共 {total} 个）")
+            return
+
+        shown = len(issues)
+        if not self.plain:
+            self.console.print(
+                f"\n[cyan]具体问题（第 {offset + 1} - {offset + shown} 个，"
+                f"共 {total} 个）：[/cyan]\n"
+            )
+        self.issues(issues, group_by)
+        if not self.plain and offset + shown < total:
+            self.console.print(
+                f"\n[dim]使用 --offset {offset + shown} 查看下一页，"
+                f"--limit 调整每页数量[/dim]"
+            )
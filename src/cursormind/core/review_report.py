@@ -0,0 +1,272 @@
+"""
+代码审查报告存储模块，提供紧凑的压缩报告格式和按页读取问题的接口。
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# 紧凑报告文件头
+MAGIC = b"CMRPT\x00\x01\n"
+
+# 每个压缩块包含的问题数，决定按页读取时的最小解压单位
+CHUNK_SIZE = 4096
+
+# 问题中按列存储的字段，其余字段组合后放入去重表
+_COLUMN_FIELDS = ("file", "line", "context")
+
+# 每个压缩块中的列；早期的报告没有 context 列
+_COLUMNS = ("file", "line", "kind", "context")
+_LEGACY_COLUMNS = ("file", "line", "kind")
+
+
+class JsonReport:
+    """普通 JSON 报告，提供与 CompactReport 相同的读取接口。"""
+
+    def __init__(self, path: Path):
+        """读取整个报告。
+
+        Args:
+            path: 报告文件路径
+        """
+        with path.open("r", encoding="utf-8") as f:
+            report = json.load(f)
+        self._issues = report.pop("issues", [])
+        self.meta = report
+        self.total = len(self._issues)
+
+    def iter_issues(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """按位置读取问题。
+
+        Args:
+            offset: 起始位置
+            limit: 最多读取的数量，None 表示读到末尾
+
+        Yields:
+            问题字典
+        """
+        end = self.total if limit is None else min(self.total, offset + limit)
+        for i in range(offset, end):
+            yield self._issues[i]
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """报告的问题统计；问题已全部读入内存，返回 None 由调用方统计。"""
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """返回完整的报告字典。"""
+        return {**self.meta, "issues": self._issues}
+
+
+class CompactReport:
+    """紧凑格式报告的读取器。
+
+    文件结构为 ``MAGIC | 头部长度 | 压缩的头部 JSON | 压缩块...``。
+    头部保存报告元数据、文件路径表和问题类型表；每个压缩块按列保存
+    一段问题的文件序号、行号、问题类型序号和上下文哈希。打开报告只
+    读取头部，读取问题时只解压涉及的块。
+    """
+
+    def __init__(self, path: Path):
+        """读取报告头部。
+
+        Args:
+            path: 报告文件路径
+
+        Raises:
+            ValueError: 文件不是紧凑格式报告时抛出
+        """
+        self.path = path
+        with path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"不是紧凑格式的审查报告：{path}")
+            (header_size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(zlib.decompress(f.read(header_size)))
+            self._data_start = f.tell()
+
+        self.meta: Dict[str, Any] = header["meta"]
+        self.total: int = header["total"]
+        self._files: List[Optional[str]] = header["files"]
+        self._kinds: List[Dict[str, Any]] = header["kinds"]
+        self._chunks: List[List[int]] = header["chunks"]
+        self._chunk_size: int = header["chunk_size"]
+        self._swap = header["byteorder"] != sys.byteorder
+        self._columns = tuple(header.get("columns", _LEGACY_COLUMNS))
+        # 早期的报告头部没有按文件和问题类型的计数
+        self._file_counts: Optional[List[int]] = header.get("file_counts")
+        self._kind_counts: Optional[List[int]] = header.get("kind_counts")
+
+    def _read_chunk(self, f, index: int) -> Dict[str, array]:
+        """解压一个块，返回列名到该列数据的映射。"""
+        offset, size = self._chunks[index]
+        f.seek(self._data_start + offset)
+        data = array("I")
+        data.frombytes(zlib.decompress(f.read(size)))
+        if self._swap:
+            data.byteswap()
+        count = len(data) // len(self._columns)
+        return {
+            name: data[i * count:(i + 1) * count]
+            for i, name in enumerate(self._columns)
+        }
+
+    def iter_issues(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """按位置读取问题，只解压涉及的块。
+
+        Args:
+            offset: 起始位置
+            limit: 最多读取的数量，None 表示读到末尾
+
+        Yields:
+            问题字典
+        """
+        end = self.total if limit is None else min(self.total, offset + limit)
+        if offset >= end:
+            return
+
+        with self.path.open("rb") as f:
+            first = offset // self._chunk_size
+            last = (end - 1) // self._chunk_size
+            for index in range(first, last + 1):
+                columns = self._read_chunk(f, index)
+                file_col = columns["file"]
+                line_col = columns["line"]
+                kind_col = columns["kind"]
+                context_col = columns.get("context")
+                base = index * self._chunk_size
+                start = max(offset - base, 0)
+                stop = min(end - base, len(line_col))
+                for i in range(start, stop):
+                    issue = {}
+                    file_path = self._files[file_col[i]]
+                    if file_path is not None:
+                        issue["file"] = file_path
+                    issue.update(self._kinds[kind_col[i]])
+                    issue["line"] = line_col[i]
+                    # 上下文哈希加 1 存储，0 表示没有
+                    if context_col is not None and context_col[i]:
+                        issue["context"] = context_col[i] - 1
+                    yield issue
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """用头部中的计数统计问题，不解压任何块。
+
+        Returns:
+            Optional[Dict[str, Any]]: 与 review_render.summarize 的返回值格式
+            相同；早期的报告没有计数，返回 None
+        """
+        if self._file_counts is None or self._kind_counts is None:
+            return None
+        by_type: Counter = Counter()
+        by_severity: Counter = Counter()
+        by_rule: Counter = Counter()
+        for kind, count in zip(self._kinds, self._kind_counts):
+            by_type[kind["type"]] += count
+            by_severity[kind["severity"]] += count
+            by_rule[kind["rule"]] += count
+        return {
+            "total": self.total,
+            "by_type": by_type,
+            "by_severity": by_severity,
+            "by_rule": by_rule,
+            "by_file": Counter({
+                file_path: count
+                for file_path, count in zip(self._files, self._file_counts)
+                if file_path is not None
+            })
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """解压全部问题，返回完整的报告字典。"""
+        return {**self.meta, "issues": list(self.iter_issues())}
+
+
+def write_compact_report(path: Path, report: Dict[str, Any]) -> None:
+    """以紧凑格式写入报告。
+
+    文件路径和除行号、上下文哈希外的问题字段（类型、规则、严重程度、
+    说明等）分别去重成表，每个问题只保存四个整数，按块用 zlib 压缩。先写入临时
+    文件再替换，写入中断不会留下损坏的报告。
+
+    Args:
+        path: 报告文件路径
+        report: 报告内容
+    """
+    files: Dict[Optional[str], int] = {}
+    kinds: Dict[str, int] = {}
+    kind_table: List[Dict[str, Any]] = []
+    file_counts: List[int] = []
+    kind_counts: List[int] = []
+    file_col = array("I")
+    line_col = array("I")
+    kind_col = array("I")
+    context_col = array("I")
+
+    issues = report.get("issues", [])
+    for issue in issues:
+        file_index = files.setdefault(issue.get("file"), len(files))
+        if file_index == len(file_counts):
+            file_counts.append(0)
+        file_counts[file_index] += 1
+        file_col.append(file_index)
+        line_col.append(max(int(issue.get("line") or 0), 0))
+        context = issue.get("context")
+        context_col.append(0 if context is None else context + 1)
+
+        kind = {k: v for k, v in issue.items() if k not in _COLUMN_FIELDS}
+        key = json.dumps(kind, ensure_ascii=False, sort_keys=True)
+        index = kinds.get(key)
+        if index is None:
+            index = kinds[key] = len(kind_table)
+            kind_table.append(kind)
+            kind_counts.append(0)
+        kind_counts[index] += 1
+        kind_col.append(index)
+
+    chunks = []
+    blobs = []
+    offset = 0
+    for start in range(0, len(issues), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        blob = zlib.compress(
+            file_col[start:stop].tobytes() +
+            line_col[start:stop].tobytes() +
+            kind_col[start:stop].tobytes() +
+            context_col[start:stop].tobytes(),
+            6
+        )
+        chunks.append([offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = zlib.compress(json.dumps({
+        "meta": {k: v for k, v in report.items() if k != "issues"},
+        "total": len(issues),
+        "files": list(files),
+        "kinds": kind_table,
+        # 查看报告时据此统计问题分布，不需要解压问题
+        "file_counts": file_counts,
+        "kind_counts": kind_counts,
+        "chunks": chunks,
+        "chunk_size": CHUNK_SIZE,
+        "columns": list(_COLUMNS),
+        "byteorder": sys.byteorder,
+    }, ensure_ascii=False).encode("utf-8"), 6)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
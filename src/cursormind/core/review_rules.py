@@ -0,0 +1,316 @@
+"""
+代码审查规则插件模块，定义规则插件接口，并从入口点加载第三方规则。
+
+编写规则时继承 ReviewRule，声明关心的 AST 节点类型和/或逐行词法事件::
+
+    class NoPrintRule(ReviewRule):
+        name = "no_print"
+        category = "style"
+        severity = "warning"
+        node_types = (ast.Call,)
+
+        def visit(self, node):
+            if isinstance(node.func, ast.Name) and node.func.id == "print":
+                return self.issue("不要使用 print", node.lineno)
+
+然后在插件包的 pyproject.toml 中注册入口点::
+
+    [project.entry-points."cursormind.review_rules"]
+    no_print = "my_rules:NoPrintRule"
+
+内置规则（review_builtins 模块）同样是 ReviewRule 的子类，通过
+register_rule 注册。审查引擎创建规则时一次建好节点类型分发表，所有
+规则共用一次语法树遍历和一次词法分析。
+"""
+import ast
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+)
+
+from .review_lexer import LexicalTable
+
+# 规则插件的入口点分组
+ENTRY_POINT_GROUP = "cursormind.review_rules"
+
+# 规则可以归入的问题类型
+CATEGORIES = ("style", "performance", "security")
+
+# 规则返回值：单个问题、多个问题或没有问题
+RuleResult = Union[None, Dict[str, Any], Iterable[Dict[str, Any]]]
+
+
+class FunctionMetrics:
+    """单个函数的度量值，在语法树遍历过程中累计。
+
+    Attributes:
+        node: 函数定义节点
+        parent: 外层函数的度量，不在函数中时为 None
+        complexity: 圈复杂度
+        locals: 被赋值的名称数
+        returns: return 语句数
+        statements: 语句数（包括函数定义本身）
+    """
+
+    __slots__ = (
+        "node", "parent", "complexity", "locals", "returns", "statements"
+    )
+
+    def __init__(
+        self,
+        node: ast.FunctionDef,
+        parent: Optional["FunctionMetrics"]
+    ):
+        self.node = node
+        self.parent = parent
+        self.complexity = 1
+        self.locals = 0
+        self.returns = 0
+        self.statements = 0
+
+    def merge(self, other: "FunctionMetrics") -> None:
+        """把嵌套函数的度量累加到当前函数。"""
+        # 复杂度的初始值 1 只属于函数自身
+        self.complexity += other.complexity - 1
+        self.locals += other.locals
+        self.returns += other.returns
+        self.statements += other.statements
+
+
+class ReviewRule:
+    """审查规则插件的基类。
+
+    Attributes:
+        name: 规则名称，写入问题的 rule 字段，也用于在配置中禁用规则
+        category: 问题类型，style / performance / security 之一
+        severity: 默认的严重程度
+        node_types: 订阅的 AST 节点类型，遍历到这些类型（含子类）的节点时
+            调用 visit
+        lexical: 是否订阅逐行词法事件，为 True 时对每一行调用 check_line
+        functions: 是否订阅函数度量，为 True 时在遍历结束后对每个函数
+            调用 check_function
+        group: 问题分组。同一类型的问题按分组依次输出，组内按触发顺序
+            排列；为空时每条规则单独一组
+        version: 规则版本，规则逻辑变化时修改，使缓存的审查结果失效
+    """
+
+    name = ""
+    category = "style"
+    severity = "info"
+    node_types: Tuple[Type[ast.AST], ...] = ()
+    lexical = False
+    functions = False
+    group = ""
+    version = "1"
+
+    def __init__(self, config: Dict[str, Any]):
+        """初始化规则。
+
+        Args:
+            config: 完整的审查配置；规则自己的选项在
+                ``config["plugins"]["options"][name]`` 中
+        """
+        self.config = config
+        self.options: Dict[str, Any] = (
+            config.get("plugins", {}).get("options", {}).get(self.name, {})
+        )
+
+    def issue(
+        self, message: str, line: int, severity: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """生成一个问题字典。
+
+        Args:
+            message: 问题说明
+            line: 行号
+            severity: 严重程度，默认为规则的 severity
+
+        Returns:
+            Dict[str, Any]: 问题字典
+        """
+        return {
+            "type": self.category,
+            "rule": self.name,
+            "message": message,
+            "line": line,
+            "severity": severity or self.severity
+        }
+
+    def visit(self, node: ast.AST) -> RuleResult:
+        """检查一个 AST 节点。
+
+        Args:
+            node: 订阅类型的节点
+
+        Returns:
+            问题字典、问题字典的序列或 None
+        """
+        return None
+
+    def check_line(self, line_no: int, lexical: LexicalTable) -> RuleResult:
+        """检查一行代码。
+
+        大文件以降级模式审查时，行信息表是文件的一个分块，只包含部分
+        行，因此应通过 ``lexical.text(line_no)`` 等方法按行号取值。
+
+        Args:
+            line_no: 行号
+            lexical: 行信息表
+
+        Returns:
+            问题字典、问题字典的序列或 None
+        """
+        return None
+
+    def check_function(self, metrics: FunctionMetrics) -> RuleResult:
+        """检查一个函数的度量值。
+
+        Args:
+            metrics: 函数度量，已包含嵌套函数的度量
+
+        Returns:
+            问题字典、问题字典的序列或 None
+        """
+        return None
+
+
+_registered: List[Type[ReviewRule]] = []
+_entry_point_rules: Optional[List[Type[ReviewRule]]] = None
+
+
+def register_rule(rule_class: Type[ReviewRule]) -> Type[ReviewRule]:
+    """在当前进程中注册规则，可以作为类装饰器使用。
+
+    并行审查的工作进程不一定继承这里的注册，需要在所有进程中生效的
+    规则应当通过入口点发布。
+
+    Args:
+        rule_class: 规则类
+
+    Returns:
+        Type[ReviewRule]: 原规则类
+    """
+    if rule_class not in _registered:
+        _registered.append(rule_class)
+    return rule_class
+
+
+def _load_entry_points() -> List[Type[ReviewRule]]:
+    """加载入口点中声明的规则类，每个进程只加载一次。"""
+    global _entry_point_rules
+    if _entry_point_rules is not None:
+        return _entry_point_rules
+
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        selected = eps.select(group=ENTRY_POINT_GROUP)
+    else:
+        # Python 3.9 返回按分组索引的字典
+        selected = eps.get(ENTRY_POINT_GROUP, [])
+
+    rules = []
+    for ep in selected:
+        try:
+            rule_class = ep.load()
+        except Exception as e:
+            print(f"加载审查规则插件 {ep.name} 时出错：{str(e)}")
+            continue
+        if not (isinstance(rule_class, type) and issubclass(rule_class, ReviewRule)):
+            print(f"审查规则插件 {ep.name} 不是 ReviewRule 的子类，已忽略")
+            continue
+        rules.append(rule_class)
+
+    _entry_point_rules = rules
+    return rules
+
+
+def is_builtin(rule_class: Type[ReviewRule]) -> bool:
+    """判断是否为内置规则。"""
+    return rule_class.__module__ == f"{__package__}.review_builtins"
+
+
+def create_rules(config: Dict[str, Any]) -> List[ReviewRule]:
+    """按配置创建所有启用的规则实例。
+
+    Args:
+        config: 审查配置，``plugins.enabled`` 为 False 时只使用内置规则，
+            ``plugins.disabled`` 中列出的规则（包括内置规则）不启用
+
+    Returns:
+        List[ReviewRule]: 规则实例，依次为内置规则、当前进程中注册的
+        规则和入口点中的规则
+    """
+    plugins = config.get("plugins", {})
+    disabled = set(plugins.get("disabled", []))
+    candidates = list(_registered)
+    if plugins.get("enabled", True):
+        candidates += _load_entry_points()
+    else:
+        candidates = [cls for cls in candidates if is_builtin(cls)]
+
+    rules = []
+    seen = set()
+    for rule_class in candidates:
+        if rule_class in seen or rule_class.name in disabled:
+            continue
+        seen.add(rule_class)
+        if not rule_class.name or rule_class.category not in CATEGORIES:
+            print(f"审查规则插件 {rule_class.__name__} 缺少名称或类型无效，已忽略")
+            continue
+        try:
+            rules.append(rule_class(config))
+        except Exception as e:
+            print(f"初始化审查规则插件 {rule_class.name} 时出错：{str(e)}")
+    return rules
+
+
+def _node_classes() -> List[Type[ast.AST]]:
+    """返回所有 AST 节点类型（含抽象基类）。"""
+    classes = []
+    todo = [ast.AST]
+    while todo:
+        cls = todo.pop()
+        classes.append(cls)
+        todo.extend(cls.__subclasses__())
+    return classes
+
+
+def build_dispatch(
+    subscriptions: Sequence[Tuple[Any, Callable]]
+) -> Dict[type, Tuple[Callable, ...]]:
+    """一次算出每种 AST 节点类型对应的处理函数。
+
+    Args:
+        subscriptions: (节点类型或节点类型元组, 处理函数) 列表，顺序即
+            同一节点上处理函数的调用顺序
+
+    Returns:
+        Dict[type, Tuple[Callable, ...]]: 节点类型到处理函数元组的映射，
+        没有处理函数的节点类型不在其中
+    """
+    dispatch = {}
+    for node_type in _node_classes():
+        handlers = tuple(
+            handler
+            for node_types, handler in subscriptions
+            if issubclass(node_type, node_types)
+        )
+        if handlers:
+            dispatch[node_type] = handlers
+    return dispatch
+
+
+def rule_group(rule: ReviewRule) -> str:
+    """返回规则的问题分组。"""
+    return rule.group or rule.name
+
+
+def rule_signature(rule: ReviewRule) -> str:
+    """返回规则的标识，用于计算缓存指纹。"""
+    cls = type(rule)
+    return f"{cls.__module__}.{cls.__qualname__}:{rule.name}:{rule.version}"
+
+
+# 导入内置规则模块即完成注册，内置规则总是排在插件之前
+from . import review_builtins  # noqa: E402,F401
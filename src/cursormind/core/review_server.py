@@ -0,0 +1,199 @@
+"""
+代码审查守护进程模块，通过 Unix 域套接字复用常驻进程中的审查实例。
+
+常驻进程保持规则分发表、配置和结果缓存连接，命令行只需把文件路径
+发给守护进程，省去每次启动时加载配置和建立缓存的开销。协议为逐行
+JSON：每个请求和响应各占一行。
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .. import __version__
+
+# 客户端等待守护进程响应的最长时间（秒）
+CLIENT_TIMEOUT = 30.0
+
+# 不支持 Unix 域套接字的平台上没有 UnixStreamServer，此时守护进程不可用，
+# 客户端总是回退到当前进程中审查
+_UnixStreamServer = getattr(
+    socketserver, "UnixStreamServer", socketserver.BaseServer
+)
+
+
+def default_socket_path() -> Path:
+    """返回默认的套接字路径。"""
+    return Path.home() / ".cursormind" / "code_review" / "review.sock"
+
+
+def send_request(
+    request: Dict[str, Any],
+    socket_path: Optional[Path] = None,
+    timeout: float = CLIENT_TIMEOUT
+) -> Optional[Dict[str, Any]]:
+    """向守护进程发送一个请求。
+
+    Args:
+        request: 请求内容
+        socket_path: 套接字路径，默认为 default_socket_path()
+        timeout: 等待响应的最长时间（秒）
+
+    Returns:
+        Optional[Dict[str, Any]]: 响应内容，守护进程未运行或通信失败时返回 None
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    path = socket_path or default_socket_path()
+    if not path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(
+                json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n"
+            )
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        return json.loads(line)
+    except (OSError, ValueError):
+        return None
+
+
+def review_via_daemon(
+    file_path: str, socket_path: Optional[Path] = None
+) -> Optional[Dict[str, Any]]:
+    """请求守护进程审查单个文件。
+
+    Args:
+        file_path: 文件路径，发送前转换为绝对路径
+        socket_path: 套接字路径
+
+    Returns:
+        Optional[Dict[str, Any]]: 审查结果，守护进程不可用或版本不一致时
+        返回 None，由调用方改为在当前进程中审查
+    """
+    response = send_request({
+        "op": "review",
+        "path": os.path.abspath(file_path),
+        "version": __version__
+    }, socket_path)
+    if not response or not response.get("ok"):
+        return None
+    return response["result"]
+
+
+class _ReviewHandler(socketserver.StreamRequestHandler):
+    """处理一个客户端连接，连接内可以依次发送多个请求。"""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = self.server.dispatch(request)
+            except ValueError:
+                response = {"ok": False, "error": "无法解析的请求"}
+            except Exception as e:
+                response = {"ok": False, "error": f"处理请求时出错：{str(e)}"}
+            self.wfile.write(
+                json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+            )
+
+
+class ReviewServer(_UnixStreamServer):
+    """代码审查守护进程。
+
+    请求按顺序处理，审查实例和缓存连接只在一个线程中使用。配置文件
+    修改后，下一个请求会重新创建审查实例。
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        """绑定套接字。
+
+        Args:
+            socket_path: 套接字路径，默认为 default_socket_path()
+
+        Raises:
+            RuntimeError: 平台不支持或已有守护进程在该路径上运行时抛出
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("当前平台不支持 Unix 域套接字")
+
+        self.socket_path = socket_path or default_socket_path()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if send_request({"op": "ping"}, self.socket_path, 1.0) is not None:
+                raise RuntimeError(f"审查守护进程已在运行：{self.socket_path}")
+            # 上次异常退出留下的套接字文件
+            self.socket_path.unlink()
+
+        super().__init__(str(self.socket_path), _ReviewHandler)
+        os.chmod(self.socket_path, 0o600)
+
+        self._reviewer = None
+        self._config_mtime: Optional[int] = None
+        self.requests = 0
+
+    def _get_reviewer(self):
+        """返回审查实例，配置文件变化时重新创建。"""
+        from .code_review import CodeReview
+
+        config_file = Path.home() / ".cursormind" / "code_review" / "config.json"
+        try:
+            mtime = config_file.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if self._reviewer is None or mtime != self._config_mtime:
+            self._reviewer = CodeReview()
+            self._config_mtime = mtime
+        return self._reviewer
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """处理一个请求。
+
+        Args:
+            request: 请求内容，``op`` 为 ping、review 或 shutdown
+
+        Returns:
+            Dict[str, Any]: 响应内容
+        """
+        op = request.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "version": __version__,
+                "requests": self.requests
+            }
+
+        if op == "review":
+            # 版本不一致时拒绝，客户端会改为在当前进程中审查
+            if request.get("version") != __version__:
+                return {"ok": False, "error": "版本不一致"}
+            self.requests += 1
+            return {
+                "ok": True,
+                "result": self._get_reviewer().review_file(request["path"])
+            }
+
+        if op == "shutdown":
+            # shutdown() 会等待 serve_forever 退出，不能在处理请求的线程中调用
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        return {"ok": False, "error": f"未知的请求：{op}"}
+
+    def server_close(self) -> None:
+        """关闭套接字并删除套接字文件。"""
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,317 @@
+"""
+代码审查分片模块，把目录中的文件确定性地分给多个 CI 任务，并合并各分片的报告。
+
+每个分片任务独立遍历同一个目录，按相同的规则只审查属于自己的文件，
+因此任务之间无需通信。默认按相对路径的哈希值分片，文件增删只影响
+该文件本身的归属；也可以按文件大小或上一次运行记录的耗时做负载均衡。
+"""
+import hashlib
+import heapq
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .review_report import MAGIC, CompactReport
+
+# (文件路径, stat 结果)
+_Entry = Tuple[str, os.stat_result]
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """解析 ``i/N`` 形式的分片参数。
+
+    Args:
+        spec: 分片参数，i 从 1 开始，例如 ``2/4``
+
+    Returns:
+        Tuple[int, int]: (分片序号, 分片总数)
+
+    Raises:
+        ValueError: 格式不正确或序号超出范围时抛出
+    """
+    index, sep, count = spec.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"分片参数应为 i/N 的形式：{spec}") from None
+    if not sep or count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号应在 1 到 N 之间：{spec}")
+    return index, count
+
+
+def relative_path(file_path: str, root: str) -> str:
+    """返回文件相对于审查根目录的路径，统一使用 ``/`` 分隔。
+
+    分片和耗时记录都以相对路径为键，不受各 CI 任务检出目录不同的影响。
+    """
+    return PurePath(os.path.relpath(file_path, root)).as_posix()
+
+
+def _path_hash(rel_path: str) -> int:
+    """相对路径的稳定哈希值，不受 PYTHONHASHSEED 影响。"""
+    digest = hashlib.blake2b(rel_path.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _balanced_assignment(
+    weights: Dict[str, float], count: int
+) -> Dict[str, int]:
+    """按权重从大到小把文件分给当前负载最小的分片（LPT 贪心）。
+
+    权重相同时按路径排序，分片负载相同时取序号小的，结果只取决于
+    输入，各分片任务计算出的分配完全一致。
+
+    Args:
+        weights: 相对路径到权重的映射
+        count: 分片总数
+
+    Returns:
+        Dict[str, int]: 相对路径到分片序号（从 0 开始）的映射
+    """
+    loads = [(0.0, shard) for shard in range(count)]
+    assignment = {}
+    for rel_path, weight in sorted(weights.items(), key=lambda x: (-x[1], x[0])):
+        load, shard = heapq.heappop(loads)
+        assignment[rel_path] = shard
+        heapq.heappush(loads, (load + weight, shard))
+    return assignment
+
+
+def select_shard(
+    files: Sequence[_Entry],
+    root: str,
+    index: int,
+    count: int,
+    balance: bool = False,
+    timings: Optional[Dict[str, float]] = None
+) -> List[_Entry]:
+    """选出属于某个分片的文件，保持原有顺序。
+
+    不做负载均衡时每个文件的归属只取决于它的相对路径。负载均衡时以
+    上一次运行记录的耗时为权重，没有记录的文件按大小和已知文件的
+    平均审查速度估算；没有耗时记录时直接以文件大小为权重。负载均衡
+    依赖完整的文件列表，各分片任务必须审查相同的文件集合。
+
+    Args:
+        files: 目录中所有待审查的文件
+        root: 审查根目录
+        index: 分片序号，从 1 开始
+        count: 分片总数
+        balance: 是否做负载均衡
+        timings: 上一次运行中每个文件的耗时（秒），键为相对路径；
+            提供时自动做负载均衡
+
+    Returns:
+        List[_Entry]: 属于该分片的文件
+    """
+    shard = index - 1
+    rel_paths = [relative_path(file_path, root) for file_path, _ in files]
+
+    if not balance and not timings:
+        return [
+            entry for entry, rel_path in zip(files, rel_paths)
+            if _path_hash(rel_path) % count == shard
+        ]
+
+    sizes = {rel_path: st.st_size for rel_path, (_, st) in zip(rel_paths, files)}
+    weights: Dict[str, float] = {}
+    if timings:
+        known = [rel_path for rel_path in rel_paths if rel_path in timings]
+        known_size = sum(sizes[rel_path] for rel_path in known)
+        known_seconds = sum(timings[rel_path] for rel_path in known)
+        # 每字节的审查耗时，用于估算新文件
+        rate = known_seconds / known_size if known_size else 0.0
+        for rel_path in rel_paths:
+            if rel_path in timings:
+                weights[rel_path] = timings[rel_path]
+            else:
+                weights[rel_path] = sizes[rel_path] * rate
+    # 没有可用的耗时数据时退回按文件大小均衡
+    if not any(weights.values()):
+        weights = {rel_path: float(size) for rel_path, size in sizes.items()}
+
+    assignment = _balanced_assignment(weights, count)
+    return [
+        entry for entry, rel_path in zip(files, rel_paths)
+        if assignment[rel_path] == shard
+    ]
+
+
+def _load_jsonl_report(lines: List[str]) -> Dict[str, Any]:
+    """把 ``review dir --format jsonl`` 的输出还原为报告字典。"""
+    issues = []
+    files = []
+    report: Dict[str, Any] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "summary" in record:
+            # 最后一行为汇总
+            report = {k: v for k, v in record.items() if k != "summary"}
+            report.update(record["summary"])
+        else:
+            files.append(record)
+            issues.extend(
+                {"file": record["file"], **issue} for issue in record["issues"]
+            )
+    if not report:
+        raise ValueError("缺少汇总行，输出可能不完整")
+    if "root" in report:
+        report["digests"] = {
+            relative_path(record["file"], report["root"]): record["digest"]
+            for record in files if "digest" in record
+        }
+    report["issues"] = issues
+    return report
+
+
+def load_report_file(path: str) -> Dict[str, Any]:
+    """读取报告文件，支持 JSON 报告、紧凑格式报告和 jsonl 输出。
+
+    Args:
+        path: 报告文件路径
+
+    Returns:
+        Dict[str, Any]: 报告字典
+
+    Raises:
+        ValueError: 文件格式无法识别时抛出
+        OSError: 文件无法读取时抛出
+    """
+    report_file = Path(path)
+    with report_file.open("rb") as f:
+        is_compact = f.read(len(MAGIC)) == MAGIC
+    if is_compact:
+        return CompactReport(report_file).to_dict()
+
+    with report_file.open("r", encoding="utf-8") as f:
+        content = f.read()
+    try:
+        report = json.loads(content)
+    except ValueError:
+        try:
+            return _load_jsonl_report(content.splitlines())
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"无法识别的报告格式：{path}（{str(e)}）") from None
+    if not isinstance(report, dict) or "issues" not in report:
+        raise ValueError(f"无法识别的报告格式：{path}")
+    return report
+
+
+def _file_order(issue: Dict[str, Any]) -> Tuple[str, ...]:
+    """问题在合并报告中的顺序，与单个任务审查整个目录时一致。"""
+    file_path = issue.get("file")
+    return () if file_path is None else PurePath(file_path).parts
+
+
+def _rebase_issue(
+    issue: Dict[str, Any], root: Optional[str], new_root: Optional[str]
+) -> Dict[str, Any]:
+    """把分片报告中问题的文件路径换到合并后报告的根目录下。
+
+    各 CI 任务的检出目录可能不同，问题的文件路径是各自检出目录中的
+    绝对路径。不在分片根目录下的路径保持不变。
+    """
+    file_path = issue.get("file")
+    if file_path is None or not root or not new_root or root == new_root:
+        return issue
+    rel_path = relative_path(file_path, root)
+    if rel_path == ".." or rel_path.startswith("../"):
+        return issue
+    return {**issue, "file": str(PurePath(new_root, rel_path))}
+
+
+def merge_reports(
+    reports: List[Dict[str, Any]], allow_partial: bool = False
+) -> Dict[str, Any]:
+    """合并各分片的审查报告。
+
+    问题按文件路径排序，与不分片审查整个目录的顺序一致；问题总数和
+    各类分布从合并后的问题重新统计，审查文件数为各分片之和。合并后
+    的根目录取第一份报告的根目录，其他分片中问题的文件路径按相对
+    路径换到这个根目录下。
+
+    Args:
+        reports: 各分片的报告
+        allow_partial: 是否允许缺少部分分片
+
+    Returns:
+        Dict[str, Any]: 合并后的报告，``shards`` 记录分片总数、已合并和
+        缺少的分片，``timings`` 为所有文件的耗时，可供下一次运行做负载均衡；
+        ``digests`` 为所有文件的内容哈希，合并后的报告可以作为基线
+
+    Raises:
+        ValueError: 报告不是分片报告、分片总数不一致、分片重复，或缺少
+            分片且 allow_partial 为 False 时抛出
+    """
+    if not reports:
+        raise ValueError("没有要合并的报告")
+
+    count = None
+    merged_indices = []
+    for report in reports:
+        shard = report.get("shard")
+        if not shard:
+            raise ValueError(
+                f"报告不是分片报告：{report.get('directory', '未知目录')}"
+            )
+        if count is None:
+            count = shard["count"]
+        elif shard["count"] != count:
+            raise ValueError(f"分片总数不一致：{count} 与 {shard['count']}")
+        if shard["index"] in merged_indices:
+            raise ValueError(f"分片 {shard['index']}/{count} 重复")
+        merged_indices.append(shard["index"])
+
+    missing = sorted(set(range(1, count + 1)) - set(merged_indices))
+    if missing and not allow_partial:
+        raise ValueError(
+            "缺少分片：" + "、".join(f"{i}/{count}" for i in missing)
+        )
+
+    root = reports[0].get("root")
+    issues = []
+    timings: Dict[str, float] = {}
+    digests: Dict[str, str] = {}
+    files_reviewed = 0
+    for report in reports:
+        issues.extend(
+            _rebase_issue(issue, report.get("root"), root)
+            for issue in report.get("issues", [])
+        )
+        timings.update(report.get("timings", {}))
+        digests.update(report.get("digests", {}))
+        files_reviewed += report.get("files_reviewed", 0)
+    # 各分片内部已按文件排序，稳定排序保持同一文件内问题的顺序
+    issues.sort(key=_file_order)
+
+    issue_types: Dict[str, int] = defaultdict(int)
+    issue_severities: Dict[str, int] = defaultdict(int)
+    for issue in issues:
+        issue_types[issue["type"]] += 1
+        issue_severities[issue["severity"]] += 1
+
+    rules = {report.get("rules") for report in reports}
+    return {
+        "directory": reports[0].get("directory"),
+        "root": root,
+        "time": datetime.now().isoformat(),
+        "files_reviewed": files_reviewed,
+        "total_issues": len(issues),
+        "issue_types": dict(issue_types),
+        "issue_severities": dict(issue_severities),
+        # 各分片的规则配置不一致时，合并后的报告不能用于跳过未修改的文件
+        "rules": rules.pop() if len(rules) == 1 else None,
+        "digests": digests,
+        "shards": {
+            "count": count,
+            "merged": sorted(merged_indices),
+            "missing": missing
+        },
+        "timings": timings,
+        "issues": issues
+    }
@@ -0,0 +1,353 @@
+"""
+代码审查监视模块，目录中的文件变化后只重新审查变化的文件。
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .review_baseline import subtract_issues
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # watchdog 是可选依赖，没有安装时轮询文件和目录的 stat 信息
+    FileSystemEventHandler = object
+    Observer = None
+
+# 修改时间距今不足这么久（纳秒）的目录视为修改时间不可靠
+_RACY_NS = 2 * 10 ** 9
+
+# 文件签名：大小、修改时间和 inode，任一变化都视为文件可能被修改
+_Signature = Tuple[int, int, int]
+
+
+def _signature(st: os.stat_result) -> _Signature:
+    """返回文件签名。"""
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class _EventCollector(FileSystemEventHandler):
+    """收集 watchdog 报告的变化路径，由监视线程在轮询时取走。"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._paths: Set[str] = set()
+
+    def on_any_event(self, event) -> None:
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        with self._lock:
+            self._paths.update(os.fsdecode(path) for path in paths if path)
+
+    def take(self) -> Set[str]:
+        """取走目前收集到的路径。"""
+        with self._lock:
+            paths, self._paths = self._paths, set()
+        return paths
+
+
+class ReviewWatcher:
+    """监视目录并增量审查。
+
+    先完整审查一次目录，之后定期检查变化。安装了 watchdog 时根据文件
+    系统事件只检查发生变化的文件和目录；否则轮询已知文件的 stat 信息，
+    只有修改时间变化的目录（其中有文件新增、删除或改名）才重新列出。
+    检测到变化后等待一段时间没有新的变化（去抖），把这期间所有变化的
+    文件合并为一批重新审查，并与上一次的结果比较得出新增和已修复的
+    问题；问题按与基线比较相同的指纹（规则和所在行的上下文）匹配，
+    不受行号变化影响。内容未变的文件（例如只更新了修改时间）会命中审查缓存，不会
+    产生变化。
+    """
+
+    def __init__(
+        self,
+        reviewer,
+        directory: str,
+        exclude: Optional[List[str]] = None,
+        jobs: Optional[int] = 1,
+        interval: float = 0.5,
+        debounce: float = 0.5,
+        use_events: bool = True
+    ):
+        """初始化监视器。
+
+        Args:
+            reviewer: CodeReview 实例
+            directory: 要监视的目录
+            exclude: 额外的排除规则，语法与 .gitignore 相同
+            jobs: 并行进程数
+            interval: 轮询间隔（秒）
+            debounce: 最后一次变化后等待的时间（秒）
+            use_events: 安装了 watchdog 时是否使用文件系统事件
+        """
+        self.reviewer = reviewer
+        self.directory = directory
+        self.exclude = exclude
+        self.jobs = jobs
+        self.interval = interval
+        self.debounce = debounce
+        self.use_events = use_events and Observer is not None
+        self._root = str(Path(directory).resolve())
+        self._entries: Dict[str, os.stat_result] = {}  # 目录中当前的文件
+        self._dirs: Dict[str, Optional[int]] = {}  # 遍历过的目录及其修改时间
+        self._signatures: Dict[str, _Signature] = {}  # 上次审查时的文件签名
+        self._events: Optional[_EventCollector] = None
+        self._observer = None
+        self.issues: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _visit_dir(self, directory: str) -> bool:
+        """遍历进入目录时记录它的修改时间。"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return False
+        # 文件系统的时间戳精度有限，刚修改过的目录再次修改后修改时间
+        # 可能不变，记为未知，下次检查时总是重新列出
+        if time.time_ns() - mtime < _RACY_NS:
+            mtime = None
+        self._dirs[directory] = mtime
+        return True
+
+    def _scan(self) -> Dict[str, os.stat_result]:
+        """完整遍历目录，返回每个文件的 stat 结果。"""
+        self._dirs = {}
+        self._entries = dict(self.reviewer.discover_files(
+            self._root, self.exclude, visit_dir=self._visit_dir
+        ))
+        return dict(self._entries)
+
+    def _rescan(self, directory: str) -> None:
+        """重新列出一个目录中的文件。
+
+        只更新直接位于该目录中的文件和新出现的子目录，已知的子目录
+        由它们自己的修改时间决定是否需要重新列出。
+        """
+        prefix = directory + os.sep
+        if not os.path.isdir(directory):
+            # 目录被删除，其中的文件和子目录都不再存在
+            for path in [d for d in self._dirs if d.startswith(prefix)]:
+                del self._dirs[path]
+            for path in [f for f in self._entries if f.startswith(prefix)]:
+                del self._entries[path]
+            self._dirs.pop(directory, None)
+            return
+
+        for path in [
+            f for f in self._entries if os.path.dirname(f) == directory
+        ]:
+            del self._entries[path]
+
+        def visit(path: str) -> bool:
+            if path != directory and path in self._dirs:
+                return False
+            return self._visit_dir(path)
+
+        rel_dir = os.path.relpath(directory, self._root)
+        start = "" if rel_dir == "." else rel_dir.replace(os.sep, "/")
+        self._entries.update(self.reviewer.discover_files(
+            self._root, self.exclude, start, visit
+        ))
+
+    def _stat_files(self, paths: List[str]) -> None:
+        """重新获取文件的 stat 信息，已删除的文件从记录中移除。"""
+        for path in paths:
+            try:
+                self._entries[path] = os.lstat(path)
+            except OSError:
+                self._entries.pop(path, None)
+
+    def _refresh_by_polling(self) -> None:
+        """轮询已知目录的修改时间和已知文件的 stat 信息。"""
+        changed_dirs = []
+        for directory, mtime in list(self._dirs.items()):
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if mtime is None or current != mtime:
+                changed_dirs.append(directory)
+
+        for directory in changed_dirs:
+            self._rescan(directory)
+        rescanned = set(changed_dirs)
+        self._stat_files([
+            f for f in self._entries if os.path.dirname(f) not in rescanned
+        ])
+
+    def _refresh_by_events(self) -> None:
+        """根据文件系统事件只检查变化的文件和目录。"""
+        changed_dirs = set()
+        changed_files = []
+        for path in self._events.take():
+            parent = os.path.dirname(path)
+            if path in self._dirs:
+                changed_dirs.add(path)
+            elif path in self._entries:
+                changed_files.append(path)
+            elif parent in self._dirs and (
+                path.endswith(".py") or os.path.isdir(path)
+            ):
+                # 新建或移入的文件和目录，重新列出所在目录
+                changed_dirs.add(parent)
+
+        for directory in sorted(changed_dirs):
+            self._rescan(directory)
+        self._stat_files([
+            f for f in changed_files if os.path.dirname(f) not in changed_dirs
+        ])
+
+    def summary(self) -> Dict[str, Any]:
+        """返回当前所有文件的问题统计。"""
+        issue_severities: Dict[str, int] = {}
+        total_issues = 0
+        for issues in self.issues.values():
+            total_issues += len(issues)
+            for issue in issues:
+                severity = issue["severity"]
+                issue_severities[severity] = issue_severities.get(severity, 0) + 1
+        return {
+            "files_reviewed": len(self.issues),
+            "total_issues": total_issues,
+            "issue_severities": issue_severities
+        }
+
+    def start(self) -> Dict[str, Any]:
+        """开始接收文件系统事件，并完整审查一次目录。
+
+        Returns:
+            Dict[str, Any]: 问题统计
+        """
+        if self.use_events and self._observer is None:
+            # 先开始接收事件再遍历，遍历期间的修改不会遗漏
+            self._events = _EventCollector()
+            observer = Observer()
+            try:
+                observer.schedule(self._events, self._root, recursive=True)
+                observer.start()
+            except OSError:
+                # 例如超出 inotify 的监视数量限制，改为轮询
+                self.use_events = False
+            else:
+                self._observer = observer
+
+        entries = self._scan()
+        self._signatures = {
+            file_path: _signature(st) for file_path, st in entries.items()
+        }
+        self.issues = {}
+        for result in self.reviewer._review_files(entries.items(), self.jobs):
+            self.issues[result["file"]] = result["issues"]
+        return self.summary()
+
+    def close(self) -> None:
+        """停止接收文件系统事件。"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _changes(self) -> Dict[str, Optional[os.stat_result]]:
+        """比较当前目录与上次审查时记录的签名。
+
+        Returns:
+            Dict[str, Optional[os.stat_result]]: 新增或修改的文件及其 stat
+            结果，已删除的文件对应 None
+        """
+        if self._observer is not None:
+            self._refresh_by_events()
+        else:
+            self._refresh_by_polling()
+
+        changes: Dict[str, Optional[os.stat_result]] = {
+            file_path: st
+            for file_path, st in self._entries.items()
+            if self._signatures.get(file_path) != _signature(st)
+        }
+        for file_path in self._signatures.keys() - self._entries.keys():
+            changes[file_path] = None
+        return changes
+
+    def apply(
+        self, changes: Dict[str, Optional[os.stat_result]]
+    ) -> Dict[str, Any]:
+        """重新审查一批变化的文件，更新结果并计算差异。
+
+        Args:
+            changes: ``_changes`` 返回的变化
+
+        Returns:
+            Dict[str, Any]: 本批的文件列表、新增问题、已修复问题和最新统计
+        """
+        new_issues: List[Dict[str, Any]] = []
+        fixed_issues: List[Dict[str, Any]] = []
+
+        def record(file_path: str, issues: List[Dict[str, Any]]) -> None:
+            old = self.issues.get(file_path, [])
+            new_issues.extend(
+                {"file": file_path, **issue}
+                for issue in subtract_issues(issues, old)
+            )
+            fixed_issues.extend(
+                {"file": file_path, **issue}
+                for issue in subtract_issues(old, issues)
+            )
+
+        for file_path, st in sorted(changes.items()):
+            if st is None:
+                record(file_path, [])
+                self.issues.pop(file_path, None)
+                self._signatures.pop(file_path, None)
+
+        modified = sorted(
+            (file_path, st) for file_path, st in changes.items() if st is not None
+        )
+        for result in self.reviewer._review_files(modified, self.jobs):
+            record(result["file"], result["issues"])
+            self.issues[result["file"]] = result["issues"]
+        for file_path, st in modified:
+            self._signatures[file_path] = _signature(st)
+
+        return {
+            "files": sorted(changes),
+            "new": new_issues,
+            "fixed": fixed_issues,
+            "summary": self.summary()
+        }
+
+    def watch(
+        self, should_stop: Callable[[], bool] = lambda: False
+    ) -> Iterator[Dict[str, Any]]:
+        """持续监视目录，每处理完一批变化产出一次结果。
+
+        Args:
+            should_stop: 每次轮询前调用，返回 True 时停止监视
+
+        Yields:
+            ``apply`` 返回的每批结果
+        """
+        # 与上次记录相比的变化本身就是待处理的批次，这里只需判断它
+        # 是否已经稳定了 debounce 秒；改回原样的文件会自然从中消失
+        previous: Dict[str, Optional[_Signature]] = {}
+        last_change = 0.0
+
+        try:
+            while not should_stop():
+                time.sleep(self.interval)
+                changes = self._changes()
+                state = {
+                    file_path: None if st is None else _signature(st)
+                    for file_path, st in changes.items()
+                }
+                if state != previous:
+                    previous = state
+                    last_change = time.monotonic()
+                    continue
+
+                if changes and time.monotonic() - last_change >= self.debounce:
+                    previous = {}
+                    yield self.apply(changes)
+        finally:
+            self.close()
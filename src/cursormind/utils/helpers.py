@@ -89,4 +89,45 @@ def save_file(content: str, file_path: str) -> None:
     path_obj.parent.mkdir(parents=True, exist_ok=True)
     
     with open(path_obj, 'w', encoding='utf-8') as f:
-        f.write(content) 
\ No newline at end of file
+        f.write(content) 
+
+def fsync_dir(path: Path) -> None:
+    """
+    把目录项的变化（新建、重命名文件）写入磁盘，不支持的平台上什么也不做
+
+    Args:
+        path: 目录路径
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write(content: str, file_path: Union[str, Path], fsync: bool = True) -> None:
+    """
+    原子地替换文件内容：先写入同目录下的临时文件，再重命名为目标文件，
+    中途崩溃时目标文件保持原样
+
+    Args:
+        content: 文件内容
+        file_path: 文件路径
+        fsync: 是否在重命名前后把数据写入磁盘
+    """
+    path_obj = Path(file_path)
+    path_obj.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path_obj.with_name(f".{path_obj.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path_obj)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if fsync:
+        fsync_dir(path_obj.parent)
@@ -0,0 +1,48 @@
+"""
+延迟初始化工具 - 第一次用到时才创建全局实例 💤
+"""
+from typing import Any, Callable
+
+
+class LazyInstance:
+    """全局实例的延迟代理。
+
+    模块导入时只记录工厂函数，第一次访问属性时才创建真正的实例，之后的
+    属性读写都转发给它。各管理器在初始化时会创建目录、读写 JSON 文件，
+    通过代理导出全局实例后，导入模块本身不再有这些副作用，调用方的写法
+    （例如 ``note_manager.add_note(...)``）保持不变。
+    """
+
+    __slots__ = ("_factory", "_instance")
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: 创建实例的函数，通常就是类本身
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+
+    def _lazy_instance(self) -> Any:
+        """返回真正的实例，尚未创建时先创建。"""
+        instance = self._instance
+        if instance is None:
+            instance = self._factory()
+            object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        """实例是否已经创建。"""
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_instance(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._lazy_instance(), name, value)
+
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<未初始化的 {getattr(self._factory, '__name__', '实例')}>"
+        return repr(self._instance)
@@ -8,6 +8,7 @@ from typing import List, Dict
 import json
 from ..config.settings import settings
 from .helpers import get_timestamp, ensure_dir
+from .lazy import LazyInstance
 
 class NoteManager:
     """笔记管理类"""
@@ -139,5 +140,5 @@ class NoteManager:
             
         return notes
 
-# 创建全局笔记管理器实例
-note_manager = NoteManager() 
\ No newline at end of file
+# 创建全局笔记管理器实例，第一次使用时才初始化
+note_manager = LazyInstance(NoteManager) 
\ No newline at end of file
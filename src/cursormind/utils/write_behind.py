@@ -0,0 +1,174 @@
+"""
+延迟写入模块 - 在内存中汇总统计数据，集中写回文件 💾
+
+统计文件（笔记统计、成就统计）每次更新都读一遍、写一遍的话，批量添加
+笔记时同一个文件会被重写很多次。WriteBehindStore 把数据保存在内存中，
+只记录有多少次修改还没有写回，在每个命令结束时（见 cli）和进程退出时
+写回；也可以设置修改次数或时间间隔，达到后提前写回。写回时先写临时文件
+再替换，不会留下写了一半的文件。
+
+多个命令可能同时运行，写回前会在文件锁内重新读取文件，把本进程的修改
+合并进去：数字按本进程的增量累加，列表和集合合并新增的元素，其他值只有
+本进程修改过时才覆盖，其他进程写入的统计数据不会丢失。
+"""
+import atexit
+import copy
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .helpers import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows 上没有 fcntl，写回时不加锁
+    fcntl = None
+
+# 当前进程中创建的所有数据文件，命令结束和进程退出时统一写回
+_stores: List['WriteBehindStore'] = []
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_changes(base: Any, ours: Any, theirs: Any) -> Any:
+    """
+    三方合并：把本进程相对 base 的修改应用到文件中的最新数据上
+
+    Args:
+        base: 本进程上次读取或写回时的数据
+        ours: 本进程内存中的数据
+        theirs: 文件中的最新数据
+
+    Returns:
+        合并后的数据，列表和集合保持 ours 的类型
+    """
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = dict(theirs)
+        for key, value in ours.items():
+            if key in theirs:
+                merged[key] = merge_changes(base.get(key), value, theirs[key])
+            elif key not in base or value != base[key]:
+                merged[key] = value
+        # 本进程删除的键，其他进程没有修改过时一并删除
+        for key in base.keys() - ours.keys():
+            if key in merged and merged[key] == base[key]:
+                del merged[key]
+        return merged
+    if _is_number(ours) and _is_number(theirs):
+        return theirs + ours - (base if _is_number(base) else 0)
+    if isinstance(ours, (list, set)) and isinstance(theirs, (list, set)):
+        base_items = list(base) if isinstance(base, (list, set)) else []
+        removed = [item for item in base_items if item not in ours]
+        merged = [item for item in theirs if item not in removed]
+        merged.extend(item for item in ours if item not in base_items and item not in merged)
+        return set(merged) if isinstance(ours, set) else merged
+    return ours if ours != base else theirs
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """在读取、合并和写回数据文件期间持有排他锁"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f".{path.name}.lock"), 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+class WriteBehindStore:
+    """延迟写回的 JSON 数据文件"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        default: Callable[[], Dict[str, Any]],
+        flush_every: int = 0,
+        flush_interval: float = 0,
+        json_default: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        读取数据文件，文件不存在时使用默认数据（写回时创建文件）
+
+        Args:
+            path: 数据文件路径
+            default: 返回默认数据的函数
+            flush_every: 累计多少次修改后写回，0 表示不按次数写回
+            flush_interval: 距离上次写回多少秒后写回，0 表示不按时间写回
+            json_default: 序列化 JSON 不支持的类型（例如集合）的函数
+        """
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.json_default = json_default
+        self.pending = 0
+        self.writes = 0
+        self._last_flush = time.monotonic()
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data: Dict[str, Any] = json.load(f)
+        else:
+            self.data = default()
+            self.pending = 1
+        # 合并时用来计算本进程做了哪些修改
+        self._base = copy.deepcopy(self.data)
+
+        _stores.append(self)
+
+    def mark_dirty(self) -> None:
+        """记录一次修改，达到设置的次数或时间间隔时写回"""
+        self.pending += 1
+        if self.flush_every and self.pending >= self.flush_every:
+            self.flush()
+        elif self.flush_interval and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _read_latest(self) -> Optional[Dict[str, Any]]:
+        """读取文件中的最新数据，文件不存在或已损坏时返回 None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"读取 {self.path.name} 失败，将用内存中的数据覆盖：{str(e)}")
+            return None
+
+    def flush(self) -> None:
+        """把未写回的修改合并到文件中的最新数据后写入文件"""
+        if not self.pending:
+            return
+        with _locked(self.path):
+            latest = self._read_latest()
+            if latest is not None:
+                merged = merge_changes(self._base, self.data, latest)
+                # 调用方持有 data 的引用，原地更新
+                self.data.clear()
+                self.data.update(merged)
+            atomic_write(
+                json.dumps(self.data, ensure_ascii=False, indent=2, default=self.json_default),
+                self.path
+            )
+        self._base = copy.deepcopy(self.data)
+        self.pending = 0
+        self.writes += 1
+        self._last_flush = time.monotonic()
+
+
+def flush_all() -> None:
+    """写回当前进程中所有数据文件未写回的修改"""
+    for store in _stores:
+        store.flush()
+
+
+atexit.register(flush_all)
@@ -0,0 +1,49 @@
+"""
+测试公共夹具
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """使用临时的 HOME，避免读写用户自己的 ~/.cursormind"""
+    home_dir = tmp_path / 'home'
+    home_dir.mkdir()
+    monkeypatch.setenv('HOME', str(home_dir))
+    return home_dir
+
+
+@pytest.fixture
+def run_python(tmp_path, home):
+    """
+    在新的进程中运行一段代码，工作目录和 HOME 都是临时目录
+
+    笔记、成就等模块使用进程内的全局实例，并在命令结束和进程退出时写回
+    统计数据，需要在独立的进程中测试；也用于检查导入了哪些模块等与进程
+    状态有关的行为。
+    """
+    work_dir = tmp_path / 'work'
+    work_dir.mkdir()
+    env = dict(os.environ, HOME=str(home))
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(SRC_DIR), os.environ.get('PYTHONPATH')])
+    )
+
+    def run(code: str) -> str:
+        result = subprocess.run(
+            [sys.executable, '-c', textwrap.dedent(code)],
+            cwd=work_dir, env=env, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    run.work_dir = work_dir
+    return run
@@ -0,0 +1,96 @@
+"""性能规则的样例：复杂度、局部变量、返回语句和语句数量。"""
+
+
+def branchy(a, b, c, d, e, f):
+    """分支很多的函数。"""
+    if a:
+        return 1
+    if b:
+        return 2
+    if c:
+        return 3
+    for x in range(a):
+        if x:
+            continue
+    while b:
+        b -= 1
+    try:
+        pass
+    except ValueError:
+        pass
+    if d:
+        return 4
+    if e:
+        return 5
+    if f:
+        return 6
+    return 0
+
+
+def many_locals():
+    """局部变量很多的函数。"""
+    v1 = v2 = v3 = v4 = v5 = v6 = v7 = v8 = 1
+    v9 = v10 = v11 = v12 = v13 = v14 = v15 = v16 = 2
+    return v1 + v2 + v3 + v4 + v5 + v6 + v7 + v8 + v9 + v10 + v11 + v12 + v13 + v14 + v15 + v16
+
+
+def outer():
+    """嵌套函数的度量同时计入外层函数。"""
+
+    def inner(flag):
+        """内层函数。"""
+        if flag:
+            return 1
+        if not flag:
+            return 2
+        return 3
+
+    total = 0
+    for step in range(3):
+        total += inner(step)
+        total += 1
+        total += 2
+        total += 3
+        total += 4
+        total += 5
+        total += 6
+        total += 7
+        total += 8
+        total += 9
+        total += 10
+        total += 11
+        total += 12
+        total += 13
+        total += 14
+        total += 15
+        total += 16
+        total += 17
+        total += 18
+        total += 19
+        total += 20
+        total += 21
+        total += 22
+        total += 23
+        total += 24
+        total += 25
+        total += 26
+        total += 27
+        total += 28
+        total += 29
+        total += 30
+        total += 31
+        total += 32
+        total += 33
+        total += 34
+        total += 35
+        total += 36
+        total += 37
+        total += 38
+        total += 39
+        total += 40
+        total += 41
+        total += 42
+        total += 43
+        total += 44
+        total += 45
+    return total
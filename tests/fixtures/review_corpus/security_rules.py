@@ -0,0 +1,20 @@
+"""安全规则的样例：SQL、命令和文件访问。"""
+
+
+def run(cursor, command, path):
+    """调用各种有风险的函数。"""
+    cursor.execute("SELECT 1")
+    execute("DELETE FROM users")
+    eval(command)
+    data = open(path).read()
+    write(data)
+    return [raw_query(part) for part in data.split(",")]
+
+
+class Handler:
+    """方法中的调用。"""
+
+    def handle(self, payload):
+        """处理请求。"""
+        exec(payload)
+        return system("ls")
@@ -0,0 +1,28 @@
+"""风格规则的样例：行长度、缩进、文档字符串和引号。"""
+import os
+
+
+class Config:
+  """两个空格缩进的类。"""
+
+  def load(self, path):
+      if path:
+          return open(path).read()
+      return ''
+
+
+def undocumented(value):
+    message = 'this line is deliberately long so that it goes past the default limit of eighty-eight'
+    for item in value:
+        while item:
+            item -= 1
+    return message
+
+
+class Empty:
+    pass
+
+
+def mixed():
+    """同时包含两种引号。"""
+    return "it's" + 'x'
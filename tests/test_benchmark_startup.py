@@ -0,0 +1,52 @@
+"""
+启动基准测试脚本的回归测试
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'benchmark_startup.py'
+
+
+@pytest.fixture(scope='module')
+def bench():
+    spec = importlib.util.spec_from_file_location('benchmark_startup', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_parse_importtime(bench):
+    stderr = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       100 |        100 |   _io',
+        'import time:       300 |        400 | site',
+        'import time:       200 |        200 |     cursormind.utils',
+        'import time:      1000 |       1200 | cursormind.cli',
+        '其他输出',
+    ])
+    result = bench.parse_importtime(stderr, top=1)
+    assert result['modules'] == 4
+    assert result['import_ms'] == 1.6
+    assert result['cursormind_ms'] == 1.2
+    assert result['top_imports'] == [{'module': 'cursormind.cli', 'cumulative_ms': 1.2}]
+
+
+def test_check_budget_applies_patterns_in_order(bench):
+    budget = {
+        'default': {'modules': 100, 'files_written': 5},
+        'cases': {'* --help': {'files_written': 0}, 'note --help': {'modules': 10}},
+    }
+    results = [
+        {'name': 'note --help', 'modules': 20, 'files_written': 0},
+        {'name': 'note today', 'modules': 20, 'files_written': 3},
+    ]
+    assert bench.check_budget(results, budget) == ['note --help: modules = 20，预算 10']
+    assert results[1]['budget'] == budget['default']
+
+
+def test_help_writes_no_files(bench, tmp_path):
+    trace = bench.trace_files(['--help'], str(tmp_path))
+    assert trace['files_written'] == trace['dirs_created'] == 0
+    assert trace['created'] == []
@@ -0,0 +1,60 @@
+"""
+命令行启动开销的回归测试
+"""
+
+
+def test_review_command_defers_heavy_imports(run_python):
+    # 守护进程客户端只需要 click 和套接字协议
+    output = run_python('''
+        import sys
+        import cursormind.commands.review
+        heavy = ['rich', 'cursormind.core.code_review', 'cursormind.core.review_watch',
+                 'cursormind.core.review_shard', 'cursormind.core.review_baseline']
+        print(sorted(name for name in heavy if name in sys.modules))
+    ''')
+    assert output.strip() == '[]'
+
+
+def test_help_imports_no_command_groups(run_python, home):
+    output = run_python('''
+        import sys
+        from click.testing import CliRunner
+        from cursormind.cli import main
+        result = CliRunner().invoke(main, ['--help'])
+        assert result.exit_code == 0, result.output
+        assert 'review' in result.output and '笔记管理' in result.output
+        loaded = [name for name in sys.modules
+                  if name == 'rich' or name.startswith(('cursormind.commands', 'cursormind.core'))]
+        print(sorted(loaded))
+    ''')
+    assert output.strip() == '[]'
+    # 查看帮助不创建配置文件和数据目录
+    assert not (home / '.cursormind').exists()
+
+
+def test_group_summaries_match_docstrings():
+    import importlib
+
+    from cursormind.cli import COMMAND_GROUPS
+
+    for name, (module_name, summary) in COMMAND_GROUPS.items():
+        group = getattr(importlib.import_module(module_name), name)
+        assert group.get_short_help_str() == summary, name
+        assert group.name == name
+
+
+def test_lazy_instance_creates_on_first_use():
+    from cursormind.utils.lazy import LazyInstance
+
+    created = []
+
+    class Manager:
+        def __init__(self):
+            created.append(self)
+            self.value = 1
+
+    manager = LazyInstance(Manager)
+    assert not manager.initialized and created == []
+    manager.value = 2
+    assert manager.value == 2
+    assert len(created) == 1 and created[0].value == 2
@@ -0,0 +1,294 @@
+"""
+代码审查的回归测试
+"""
+import ast
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_lexer import scan
+
+FIXTURES = Path(__file__).parent / "fixtures"
+CORPUS = FIXTURES / "review_corpus"
+
+# 样例代码在改为单次遍历之前（逐项规则各自遍历语法树）的审查结果，
+# 之后只随有意修正的规则行为更新（引号规则不再因同一行的其他字符串漏报）
+BASELINE_ISSUES = json.loads(
+    (FIXTURES / "review_corpus_issues.json").read_text(encoding="utf-8")
+)
+
+
+def _without_context(issues):
+    # 基线结果早于问题的上下文哈希字段
+    return [
+        {key: value for key, value in issue.items() if key != "context"}
+        for issue in issues
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE_ISSUES))
+def test_single_walk_matches_baseline(home, name):
+    issues = CodeReview().review_file(str(CORPUS / name))["issues"]
+    assert _without_context(issues) == BASELINE_ISSUES[name]
+
+
+def test_module_without_docstring(home, tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("x = 'a'\n", encoding="utf-8")
+
+    issues = CodeReview().review_file(str(source))["issues"]
+    # 以前模块节点没有 lineno 会让风格检查整体报解析错误，现在报在第 1 行
+    assert [(issue["rule"], issue["line"]) for issue in issues] == [
+        ("docstring", 1), ("quotes", 1)
+    ]
+
+
+def test_parallel_review_matches_serial(home):
+    reviewer = CodeReview()
+    serial = reviewer.review_directory(str(CORPUS), jobs=1)
+    parallel = reviewer.review_directory(str(CORPUS), jobs=2)
+    assert parallel["files_reviewed"] == serial["files_reviewed"] == 3
+    assert parallel["issues"] == serial["issues"]
+
+
+def test_cache_hit_and_rule_invalidation(home, tmp_path, monkeypatch):
+    from cursormind.core import code_review
+
+    source = tmp_path / "module.py"
+    source.write_text('"""模块。"""\nx = 1\n', encoding="utf-8")
+    first = CodeReview().review_file(str(source))["issues"]
+
+    def fail(self, content):
+        raise AssertionError("应当命中缓存")
+
+    # 内容和规则都没有变化时直接返回缓存的结果
+    with monkeypatch.context() as patch:
+        patch.setattr(CodeReview, "_review_source", fail)
+        assert CodeReview().review_file(str(source))["issues"] == first
+
+    reviewed = []
+    original = CodeReview._review_source
+
+    def record(self, content):
+        reviewed.append(content)
+        return original(self, content)
+
+    monkeypatch.setattr(CodeReview, "_review_source", record)
+    # 规则配置变化后重新审查
+    reviewer = CodeReview()
+    reviewer.config["style"]["max_line_length"] = 5
+    reviewer.cache = reviewer._create_cache()
+    assert {issue["rule"] for issue in reviewer.review_file(str(source))["issues"]} == {
+        "line_length"
+    }
+    # 规则实现的版本变化后同样重新审查
+    monkeypatch.setattr(code_review, "RULES_REVISION", code_review.RULES_REVISION + 1)
+    assert CodeReview().review_file(str(source))["issues"] == first
+    assert len(reviewed) == 2
+
+
+def test_parallel_review_streams_cached_results(home):
+    reviewer = CodeReview()
+    paths = [str(p) for p in sorted(CORPUS.glob("*.py"))]
+    serial = list(reviewer._review_files([(p, None) for p in paths], jobs=1))
+
+    consumed = []
+
+    def source():
+        for path in paths:
+            consumed.append(path)
+            yield path, None
+
+    # 全部命中缓存时，每读入一个文件就产出一个结果，无需先遍历完目录
+    results = reviewer._review_files(source(), jobs=2)
+    assert next(results)["file"] == paths[0]
+    assert consumed == paths[:1]
+    rest = list(results)
+    assert [r["issues"] for r in [serial[0]] + rest] == [r["issues"] for r in serial]
+
+
+def test_parallel_review_without_cache_keeps_order(home, tmp_path):
+    for index in range(20):
+        (tmp_path / f"m{index:02d}.py").write_text(
+            f"x{index} = 'a'\n", encoding="utf-8"
+        )
+    paths = [str(p) for p in sorted(tmp_path.glob("*.py"))]
+    reviewer = CodeReview()
+    reviewer.cache = None
+    entries = [(path, None) for path in paths]
+    serial = list(reviewer._review_files(entries, jobs=1))
+    parallel = list(reviewer._review_files(iter(entries), jobs=2))
+    assert [r["file"] for r in parallel] == paths
+    assert [r["issues"] for r in parallel] == [r["issues"] for r in serial]
+
+
+def _git(cwd, *args):
+    import subprocess
+
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _git_repo(path):
+    _git(path, "init", "-q")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+
+
+def test_changed_lines_ignore_noprefix_config(home, tmp_path):
+    _git_repo(tmp_path)
+    # 仓库配置去掉了 diff 输出中的 a/ b/ 前缀
+    _git(tmp_path, "config", "diff.noprefix", "true")
+    source = tmp_path / "pkg" / "module.py"
+    source.parent.mkdir()
+    source.write_text("a = 1\nb = 2\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    source.write_text("a = 1\nb = 3\n", encoding="utf-8")
+
+    changes = CodeReview()._git_changed_lines(str(tmp_path), "HEAD")
+    assert changes == {"pkg/module.py": [(2, 2)]}
+
+
+def test_review_diff_keeps_issues_on_changed_lines(home, tmp_path):
+    _git_repo(tmp_path)
+    source = tmp_path / "module.py"
+    source.write_text('"""模块。"""\na = \'x\'\n', encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    source.write_text('"""模块。"""\na = \'x\'\nb = \'y\'\n', encoding="utf-8")
+    (tmp_path / "new.py").write_text("c = 'z'\n", encoding="utf-8")
+
+    report = CodeReview().review_diff(directory=str(tmp_path), jobs=1)
+    assert report["files_reviewed"] == 2
+    # 未修改的第 2 行不报告，未跟踪的文件整体审查
+    assert {(i["file"], i["line"], i["rule"]) for i in report["issues"]} == {
+        ("module.py", 3, "quotes"),
+        ("new.py", 1, "docstring"),
+        ("new.py", 1, "quotes"),
+    }
+
+
+def test_profile_merges_worker_timings(home):
+    def calls(jobs):
+        reviewer = CodeReview(use_cache=False, profile=True)
+        profile = reviewer.review_directory(str(CORPUS), jobs=jobs)["profile"]
+        assert profile["files"] == 3
+        assert len(profile["slowest_files"]) == 3
+        return {name: stats["calls"] for name, stats in profile["rules"].items()}
+
+    # 工作进程统计的规则调用次数与串行审查一致
+    serial = calls(1)
+    assert serial and all(count > 0 for count in serial.values())
+    assert calls(2) == serial
+
+
+def test_list_reports_reads_index(home, tmp_path, monkeypatch):
+    reviewer = CodeReview()
+    source = tmp_path / "module.py"
+    source.write_text("x = 'a'\n", encoding="utf-8")
+    report_id = reviewer.save_report(reviewer.review_file(str(source)))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应读取报告文件")
+
+    # 列出报告只读取索引
+    monkeypatch.setattr(json, "load", fail)
+    [entry] = reviewer.list_reports()
+    assert entry["id"] == report_id
+
+
+def test_save_report_seeds_missing_index(home, tmp_path):
+    reviewer = CodeReview()
+    source = tmp_path / "module.py"
+    source.write_text('def f():\n    return 1\n', encoding="utf-8")
+
+    # 升级前保存的报告：报告文件存在，但还没有索引
+    old_id = reviewer.save_report(reviewer.review_file(str(source)))
+    reviewer._report_index_file.unlink()
+
+    new_id = reviewer.save_report(reviewer.review_file(str(source)))
+    assert {entry["id"] for entry in reviewer.list_reports()} == {old_id, new_id}
+
+
+def _limited_reviewer(**limits):
+    config = copy.deepcopy(CodeReview().config)
+    config["limits"].update(limits)
+    return CodeReview(config=config)
+
+
+def test_large_file_runs_line_rules_in_chunks(home, monkeypatch):
+    from cursormind.core import code_review
+
+    source = CORPUS / "style_rules.py"
+    expected = [
+        issue for issue in BASELINE_ISSUES[source.name]
+        if issue["rule"] in ("line_length", "quotes")
+    ]
+
+    # 超过解析大小上限的文件分块做词法分析，只执行逐行规则
+    monkeypatch.setattr(code_review, "LARGE_FILE_CHUNK_SIZE", 64)
+    reviewer = _limited_reviewer(max_parse_size_mb=0)
+    issues = reviewer.review_file(str(source))["issues"]
+    assert _without_context(issues[:-1]) == expected
+    assert issues[-1]["rule"] == "large_file"
+    assert "docstring" in issues[-1]["message"]
+    # 完整执行了逐行规则的结果可以缓存
+    assert reviewer.cache.lookup(source.resolve(), source.stat())[1] == issues
+
+
+def test_time_budget_result_not_cached(home, tmp_path):
+    reviewer = _limited_reviewer(time_budget_seconds=0)
+    source = tmp_path / "module.py"
+    source.write_text('def f():\n    return 1\n', encoding="utf-8")
+
+    result = reviewer.review_file(str(source))
+    assert [issue["rule"] for issue in result["issues"]] == ["time_budget"]
+    # 只执行了逐行规则的结果不能进入缓存
+    assert reviewer.cache.lookup(source.resolve(), source.stat()) is None
+
+
+def test_walk_stops_at_deadline(home, monkeypatch):
+    from cursormind.core import code_review
+
+    content = (CORPUS / "style_rules.py").read_text(encoding="utf-8")
+    tree = ast.parse(content)
+    lexical = scan(content)
+    reviewer = CodeReview(use_cache=False)
+
+    full, complete = reviewer._run_rules(tree, lexical)
+    assert complete
+
+    # 遍历途中超过截止时刻时放弃 AST 规则的问题，只保留逐行规则的结果
+    monkeypatch.setattr(code_review, "DEADLINE_CHECK_NODES", 1)
+    partial, complete = reviewer._run_rules(tree, lexical, deadline=0.0)
+    assert not complete
+    assert partial["style"] == [
+        issue for issue in full["style"]
+        if issue["rule"] in ("line_length", "quotes")
+    ]
+    assert partial["performance"] == partial["security"] == []
+
+
+def test_large_file_issues_keep_context_across_chunks(home, tmp_path, monkeypatch):
+    from cursormind.core import code_review
+    from cursormind.core.review_baseline import line_context
+
+    monkeypatch.setattr(code_review, "LARGE_FILE_CHUNK_SIZE", 256)
+    reviewer = CodeReview(use_cache=False)
+    reviewer.max_parse_size = 100
+
+    lines = [f"value_{number} = 'text {number}'" for number in range(200)]
+    source = tmp_path / "large.py"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    issues = [
+        issue for issue in reviewer.review_file(str(source))["issues"]
+        if issue["rule"] != "large_file"
+    ]
+    assert len(issues) == len(lines)
+    # 每一块的问题都在本块处理时补充了所在行的上下文
+    for issue in issues:
+        assert issue["context"] == line_context(lines[issue["line"] - 1])
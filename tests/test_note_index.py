@@ -0,0 +1,88 @@
+"""
+笔记搜索索引的回归测试
+"""
+import json
+import random
+
+import pytest
+
+from cursormind.core.note_index import NoteIndex
+
+# 词表中没有单词出现在另一个单词的中间，整词查询的子串匹配只会发生在
+# 单词开头，索引的结果应与逐个扫描笔记文件完全一致
+WORDS = [
+    "python", "pythonic", "rust", "sqlite", "index", "search", "note",
+    "notes", "query", "Cache", "async", "await", "学习", "笔记", "索引",
+]
+TOPICS = ["python", "数据库", "Rust"]
+TAGS = ["todo", "review", "重要"]
+
+
+def _substring_search(notes, query):
+    # 引入索引之前 search_notes 的匹配方式
+    query = query.lower()
+    return sorted(
+        (
+            note for note in notes
+            if query in note["content"].lower()
+            or query in note["topic"].lower()
+            or any(query in tag.lower() for tag in note["tags"])
+        ),
+        key=lambda note: note["created_at"], reverse=True
+    )
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    rng = random.Random(0)
+    topic_dir = tmp_path / "topics"
+    notes = []
+    for number in range(200):
+        words = rng.choices(WORDS, k=rng.randint(1, 12))
+        note = {
+            "content": " ".join(words) + rng.choice(["", ".", "！"]),
+            "topic": rng.choice(TOPICS),
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "created_at": f"2026-01-01T00:{number // 60:02d}:{number % 60:02d}",
+        }
+        path = topic_dir / note["topic"] / f"{number}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(note, ensure_ascii=False), encoding="utf-8")
+        notes.append(note)
+    return NoteIndex(tmp_path / "search.db", topic_dir), notes
+
+
+def test_whole_word_queries_match_substring_search(corpus):
+    for word in WORDS:
+        for other in WORDS:
+            assert other == word or word not in other[1:], (word, other)
+
+    index, notes = corpus
+    queries = WORDS + TOPICS + TAGS + [
+        "PYTHON", "python rust", "sqlite index search", "学习笔记", "笔记 索引",
+    ]
+    for query in queries:
+        assert index.search(query) == _substring_search(notes, query), query
+
+
+def test_prefix_matches_and_infix_does_not(corpus):
+    index, notes = corpus
+    # 英文按单词开头匹配，从单词中间开始的片段不匹配
+    assert index.search("sql") == _substring_search(notes, "sql")
+    assert index.search("qlite") == []
+    assert _substring_search(notes, "qlite")
+
+
+def test_added_note_is_searchable(corpus, tmp_path):
+    index, notes = corpus
+    assert index.search("zig") == []
+
+    note = {
+        "content": "learning zig", "topic": "python", "tags": [],
+        "created_at": "2026-02-01T00:00:00",
+    }
+    index.add(note, "python/new.json")
+    assert index.search("zig") == [note]
+    # 重建索引后仍然保留笔记文件中的笔记
+    assert index.rebuild() == len(notes)
+    assert index.search("zig") == []
@@ -0,0 +1,85 @@
+"""
+只追加的每日笔记日志的回归测试
+"""
+import json
+
+from cursormind.core.note_log import DailyNoteLog
+
+DATE = "2026-01-01"
+
+
+def _note(number):
+    return {"id": f"{DATE}-{number:04d}", "content": f"note {number}", "topic": "t", "tags": []}
+
+
+def test_append_keeps_existing_bytes(tmp_path):
+    log = DailyNoteLog(tmp_path, "never")
+    log.append(DATE, _note(1))
+    log_file = tmp_path / f"{DATE}.jsonl"
+    before = log_file.read_bytes()
+
+    log.append(DATE, _note(2))
+    after = log_file.read_bytes()
+    # 只在文件末尾追加，之前写入的内容一个字节都不变
+    assert after.startswith(before)
+    assert after[len(before):].count(b"\n") == 1
+    assert log.read(DATE) == [_note(1), _note(2)]
+
+
+def test_truncated_record_is_skipped(tmp_path):
+    log = DailyNoteLog(tmp_path, "never")
+    log.append(DATE, _note(1))
+    log_file = tmp_path / f"{DATE}.jsonl"
+    # 写入第二条记录时崩溃，只留下一半
+    line = json.dumps(_note(2)).encode("utf-8")
+    with open(log_file, "ab") as f:
+        f.write(line[:len(line) // 2])
+    assert log.read(DATE) == [_note(1)]
+
+    log.append(DATE, _note(3))
+    assert log.read(DATE) == [_note(1), _note(3)]
+
+    assert log.compact(DATE) == 2
+    assert log_file.read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_legacy_file_is_merged(tmp_path):
+    legacy_file = tmp_path / f"{DATE}.json"
+    legacy_file.write_text(json.dumps([_note(1), _note(2)]), encoding="utf-8")
+    log = DailyNoteLog(tmp_path, "always")
+    log.append(DATE, _note(3))
+    assert log.read(DATE) == [_note(1), _note(2), _note(3)]
+    assert log.dates() == [DATE]
+
+    assert log.compact_all() == {DATE: 3}
+    assert not legacy_file.exists()
+    assert log.read(DATE) == [_note(1), _note(2), _note(3)]
+
+
+def test_compact_interrupted_before_removing_legacy_file(tmp_path):
+    notes = [_note(1), _note(2)]
+    (tmp_path / f"{DATE}.json").write_text(json.dumps(notes), encoding="utf-8")
+    # 合并后的日志已经写入，旧格式文件还没删除
+    (tmp_path / f"{DATE}.jsonl").write_text(
+        "".join(json.dumps(note) + "\n" for note in notes), encoding="utf-8"
+    )
+    assert DailyNoteLog(tmp_path).read(DATE) == notes
+
+
+def test_size_tracks_bytes_appended(tmp_path):
+    log = DailyNoteLog(tmp_path, "never")
+    assert log.size(DATE) == 0
+
+    written = log.append(DATE, _note(1))
+    assert written == log.size(DATE) == (tmp_path / f"{DATE}.jsonl").stat().st_size
+
+    # 补上不完整记录的换行符也计入写入的字节数
+    with open(tmp_path / f"{DATE}.jsonl", "ab") as f:
+        f.write(b'{"id": ')
+    before = log.size(DATE)
+    assert before + log.append(DATE, _note(2)) == log.size(DATE)
+
+    log_size = log.size(DATE)
+    legacy_file = tmp_path / f"{DATE}.json"
+    legacy_file.write_text(json.dumps([_note(0)]), encoding="utf-8")
+    assert log.size(DATE) == log_size + legacy_file.stat().st_size
@@ -0,0 +1,118 @@
+"""
+笔记管理的回归测试
+"""
+import json
+
+
+def test_note_id_not_reused_after_unflushed_exit(run_python):
+    # 第一个进程添加笔记后被强行结束，统计数据没有写回
+    run_python("""
+        import os
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('first note', 't')
+        os._exit(0)
+    """)
+    out = run_python("""
+        import json
+        from cursormind.core.note_manager import note_manager
+        note = note_manager.add_note('second note', 't')
+        print(json.dumps([n['id'] for n in note_manager.get_daily_notes()]))
+    """)
+    ids = json.loads(out.splitlines()[-1])
+    assert len(ids) == 2 and len(set(ids)) == 2
+
+    topic_dir = run_python.work_dir / 'learning_notes' / 'topics' / 't'
+    contents = sorted(
+        json.loads(path.read_text(encoding='utf-8'))['content']
+        for path in topic_dir.glob('*.json')
+    )
+    assert contents == ['first note', 'second note']
+
+
+def test_rebuild_stats_uses_current_rules(run_python):
+    out = run_python("""
+        import json
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('#python装饰器 很好用', 't')
+        # 旧版本按空格分词统计的数据
+        stats = note_manager.get_stats()
+        stats['total_words'] = 2
+        stats['tags'] = {'python装饰器': 1}
+        stats = note_manager.rebuild_stats()
+        print(json.dumps([stats['total_notes'], stats['total_words'], stats['tags']]))
+    """)
+    assert json.loads(out.splitlines()[-1]) == [1, 7, {'python': 1}]
+    stats_file = run_python.work_dir / 'learning_notes' / 'stats.json'
+    assert json.loads(stats_file.read_text(encoding='utf-8'))['total_words'] == 7
+
+
+def test_stats_flushed_when_command_ends(run_python):
+    out = run_python("""
+        import json, os
+        from click.testing import CliRunner
+        from cursormind.cli import main
+        result = CliRunner().invoke(main, ['note', 'add', 'first note', '-t', 't'])
+        assert result.exit_code == 0, result.output
+        with open('learning_notes/stats.json', encoding='utf-8') as f:
+            print(json.load(f)['total_notes'])
+        # 不执行退出时的写回
+        os._exit(0)
+    """)
+    assert out.splitlines()[-1] == '1'
+
+
+def test_summary_catches_up_after_unflushed_exit(run_python):
+    run_python("""
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('one', 't')
+        note_manager.add_note('two', 't')
+    """)
+    # 追加到日志之后、摘要写回之前进程被强行结束
+    run_python("""
+        import os
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('three', 't')
+        os._exit(0)
+    """)
+    out = run_python("""
+        from cursormind.core.note_manager import note_manager
+        print(len(note_manager.get_daily_notes()), note_manager.generate_review(1)['total_notes'])
+        note_manager.add_note('four', 't')
+        print(len(note_manager.get_daily_notes()), note_manager.generate_review(1)['total_notes'])
+    """)
+    assert out.split() == ['3', '3', '4', '4']
+
+
+def test_summary_add_after_unflushed_exit(run_python):
+    run_python("""
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('one', 't')
+    """)
+    run_python("""
+        import os
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('two', 't')
+        os._exit(0)
+    """)
+    # 不先读取摘要，直接在落后的摘要上添加笔记
+    out = run_python("""
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('three', 't')
+        print(note_manager.generate_review(1)['total_notes'])
+    """)
+    assert out.split() == ['3']
+
+
+def test_review_across_month_boundary(run_python):
+    out = run_python("""
+        import json
+        from cursormind.core.note_manager import note_manager
+        note_manager.add_note('#python 装饰器 ' + 'word ' * 120, 't')
+        note_manager.add_note('short note', 'u')
+        review = note_manager.generate_review(45)
+        print(json.dumps([
+            review['total_notes'], review['topics'], review['tags'],
+            len(review['daily_notes']), len(review['highlights'])
+        ]))
+    """)
+    assert json.loads(out.splitlines()[-1]) == [2, {'t': 1, 'u': 1}, {'python': 1}, 1, 1]
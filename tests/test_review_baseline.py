@@ -0,0 +1,83 @@
+"""
+基线审查和报告比较的回归测试
+"""
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_baseline import (
+    Baseline, diff_reports, line_context
+)
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _repo(root):
+    for number in range(4):
+        _write(
+            root / f"module_{number}.py",
+            f'"""模块。"""\nvalue_{number} = \'x\'\n'
+        )
+    return root.resolve()
+
+
+def test_line_context_ignores_whitespace():
+    assert line_context("x = 'a'") == line_context("    x  =  'a'  ")
+    assert line_context("x = 'a'") != line_context("y = 'a'")
+
+
+def test_diff_ignores_moved_issues(home, tmp_path):
+    root = _repo(tmp_path / "repo")
+    reviewer = CodeReview(use_cache=False)
+    old = reviewer.review_directory(str(root))
+
+    # 在问题上方插入代码不改变问题的指纹；新增一个问题、修复一个问题
+    _write(root / "module_0.py", '"""模块。"""\n\n\nvalue_0 = \'x\'\n')
+    _write(root / "module_1.py", '"""模块。"""\nvalue_1 = "x"\nother = \'y\'\n')
+    _write(root / "module_2.py", '"""模块。"""\nvalue_2 = "x"\n')
+    diff = diff_reports(old, reviewer.review_directory(str(root)))
+
+    assert [(i["file"], i["line"]) for i in diff["new"]] == [
+        (str(root / "module_1.py"), 3)
+    ]
+    assert [(i["file"], i["line"]) for i in diff["fixed"]] == [
+        (str(root / "module_1.py"), 2), (str(root / "module_2.py"), 2)
+    ]
+
+
+def test_baseline_reuses_unchanged_files(home, tmp_path, monkeypatch):
+    root = _repo(tmp_path / "repo")
+    reviewer = CodeReview()
+    report = reviewer.review_directory(str(root))
+    baseline = Baseline(report, reviewer._rules_fingerprint())
+
+    _write(root / "module_3.py", '"""模块。"""\nvalue_3 = "x"\n')
+    (root / "module_2.py").unlink()
+
+    # 基线在审查流水线中逐个文件判断，不必先遍历完整个目录
+    discovered = []
+    discover = reviewer.discover_files
+
+    def record(*args, **kwargs):
+        for entry in discover(*args, **kwargs):
+            discovered.append(entry[0])
+            yield entry
+
+    monkeypatch.setattr(reviewer, "discover_files", record)
+    results = reviewer.iter_review_directory(str(root), jobs=1, baseline=baseline)
+    first = next(results)
+    assert first["baseline"] is True
+    assert discovered == [first["file"]]
+    results = [first, *results]
+    assert [bool(r.get("baseline")) for r in results] == [True, True, False]
+
+    current = reviewer.review_directory(str(root), jobs=2, baseline=baseline)
+    assert current["baseline"]["reused_files"] == 2
+    # 已删除文件的问题排在最后
+    assert [i["file"] for i in current["baseline"]["fixed"]] == [
+        str(root / "module_3.py"), str(root / "module_2.py")
+    ]
+    assert current["baseline"]["new"] == []
+    # 沿用的结果与重新审查的结果相同
+    fresh = CodeReview(use_cache=False).review_directory(str(root))
+    assert current["issues"] == fresh["issues"]
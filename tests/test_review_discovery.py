@@ -0,0 +1,48 @@
+"""
+审查文件发现的回归测试
+"""
+import os
+
+import pytest
+
+from cursormind.core.review_discovery import iter_python_files
+
+
+def _names(root, **kwargs):
+    return [
+        os.path.relpath(path, root).replace(os.sep, "/")
+        for path, _ in iter_python_files(str(root), **kwargs)
+    ]
+
+
+def test_excludes_and_gitignore_prune_directories(tmp_path):
+    for rel_path in [
+        "b.py", "a.py", "pkg/mod.py", "pkg/gen.py", "pkg/notes.txt",
+        ".venv/lib/site.py", "build/out.py", "pkg/__pycache__/mod.py",
+    ]:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "pkg" / ".gitignore").write_text("gen.py\n", encoding="utf-8")
+
+    # 顺序与 sorted(rglob) 一致，默认排除目录和 .gitignore 中的文件被跳过
+    assert _names(tmp_path) == ["a.py", "b.py", "pkg/mod.py"]
+    assert _names(tmp_path, use_gitignore=False) == [
+        "a.py", "b.py", "pkg/gen.py", "pkg/mod.py"
+    ]
+    assert "build/out.py" in _names(tmp_path, excludes=[])
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="需要符号链接")
+def test_symlinked_files_are_skipped(tmp_path):
+    outside = tmp_path / "outside.py"
+    outside.write_text("secret = 1\n", encoding="utf-8")
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "real.py").write_text("a = 1\n", encoding="utf-8")
+    try:
+        (root / "link.py").symlink_to(outside)
+    except OSError:
+        pytest.skip("无法创建符号链接")
+
+    assert _names(root) == ["real.py"]
@@ -0,0 +1,94 @@
+"""
+代码审查词法分析的回归测试
+"""
+import pytest
+
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_lexer import (
+    COMMENT, DOUBLE_QUOTED, FORMATTED, SINGLE_QUOTED, TRIPLE_QUOTED, iter_scan,
+    scan
+)
+
+
+@pytest.mark.parametrize("code, flags", [
+    ("x = 'a'", SINGLE_QUOTED),
+    ('x = "a"', DOUBLE_QUOTED),
+    # 内容中含有另一种引号，改用后需要转义
+    ("x = 'say \"hi\"'", 0),
+    ('x = "it\'s"', 0),
+    ("x = 'it\\'s'", SINGLE_QUOTED),
+    ("x = f'{a}'", SINGLE_QUOTED | FORMATTED),
+    ('x = F"{a!r:>10}"', DOUBLE_QUOTED | FORMATTED),
+    ("x = rf'\\d{a}'", SINGLE_QUOTED | FORMATTED),
+    ('x = f"{a[\'k\']}"', FORMATTED),
+    ("x = b'a' + \"b\"", SINGLE_QUOTED | DOUBLE_QUOTED),
+    # if 后面紧跟的字符串没有前缀
+    ("x = 1 if'a' else 2", SINGLE_QUOTED),
+    ("x = '''a'''", TRIPLE_QUOTED),
+    ('x = f"""{a}"""', TRIPLE_QUOTED | FORMATTED),
+    ("x = 1  # it's", COMMENT),
+    ("x = '#'", SINGLE_QUOTED),
+])
+def test_string_flags(code, flags):
+    assert scan(code).flags[0] == flags
+
+
+def test_triple_quoted_strings_span_lines():
+    code = (
+        'def f():\n'
+        '    """文档。\n'
+        "    'a' # 不是注释\n"
+        '    """\n'
+        "    return f'''{1}\n"
+        "'''  # 注释\n"
+        "x = 'b'\n"
+    )
+    table = scan(code)
+    assert list(table.flags) == [
+        0, TRIPLE_QUOTED, 0, 0, TRIPLE_QUOTED | FORMATTED, COMMENT,
+        SINGLE_QUOTED, 0
+    ]
+    assert table.comments == {6: 5}
+    assert list(table.lengths) == [len(line.rstrip()) for line in code.split("\n")]
+
+
+def test_quote_rule_uses_real_strings(home, tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text(
+        '"""模块。"""\n'
+        "# 'quoted' 注释\n"
+        'a = "it\'s" + \'x\'\n'
+        "b = f'{a}'\n"
+        "c = '''\n"
+        "'not a string'\n"
+        "'''\n",
+        encoding="utf-8"
+    )
+    issues = CodeReview(use_cache=False).review_file(str(source))["issues"]
+    assert [i["line"] for i in issues if i["rule"] == "quotes"] == [3, 4]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 4096])
+def test_chunked_scan_matches_whole_file(chunk_size):
+    code = (
+        '"""模块。\n\n'
+        "跨越多行的 'docstring'\n"
+        '"""\n'
+        "x = 'a'  # 注释\n"
+        'y = f"""{x}\n'
+        "'''\n"
+        '"""\n'
+        "z = \"b\"\n"
+    ) * 5
+    whole = scan(code)
+    tables = list(iter_scan(code.encode("utf-8"), chunk_size))
+    # 各分块的行号连续，合并后与整个文件一次分析的结果相同
+    assert [table.first_line for table in tables] == [
+        1 + sum(len(t) for t in tables[:i]) for i in range(len(tables))
+    ]
+    assert [f for table in tables for f in table.flags] == list(whole.flags)
+    assert [n for table in tables for n in table.lengths] == list(whole.lengths)
+    comments = {}
+    for table in tables:
+        comments.update(table.comments)
+    assert comments == whole.comments
@@ -0,0 +1,62 @@
+"""
+审查报告渲染的回归测试
+"""
+import io
+
+from rich.console import Console
+
+from cursormind.core.review_render import (
+    ReviewRenderer, page_issues, summarize
+)
+
+ISSUES = [
+    {"file": "b.py", "line": 3, "type": "style", "rule": "quotes",
+     "message": "建议使用双引号", "severity": "info"},
+    {"file": "a.py", "line": 1, "type": "style", "rule": "docstring",
+     "message": "缺少文档字符串", "severity": "info"},
+    {"file": "a.py", "line": 9, "type": "security", "rule": "sql_injection",
+     "message": "可能存在SQL注入风险", "severity": "error"},
+]
+
+
+def test_page_issues_groups_before_paging():
+    assert page_issues(ISSUES, 1, 1) == [ISSUES[1]]
+    assert page_issues(ISSUES, 0, 2, group_by="file") == [ISSUES[1], ISSUES[2]]
+    assert page_issues(ISSUES, 2, None, group_by="rule") == [ISSUES[2]]
+
+
+def test_plain_output_is_one_line_per_issue():
+    stream = io.StringIO()
+    renderer = ReviewRenderer(None, plain=True, stream=stream)
+    renderer.summary(summarize(ISSUES), top=1)
+    renderer.page(ISSUES, 0, len(ISSUES))
+
+    lines = stream.getvalue().splitlines()
+    # 先输出以 # 开头的汇总，再按编译器的格式每个问题输出一行
+    assert lines[0] == "# 总问题数：3"
+    assert lines[-3:] == [
+        "b.py:3: INFO [quotes] 建议使用双引号",
+        "a.py:1: INFO [docstring] 缺少文档字符串",
+        "a.py:9: ERROR [sql_injection] 可能存在SQL注入风险",
+    ]
+
+
+def test_rich_page_hints_next_offset():
+    console = Console(file=io.StringIO(), width=200)
+    renderer = ReviewRenderer(console)
+    renderer.page(ISSUES[:2], 0, len(ISSUES))
+    output = console.file.getvalue()
+    assert "第 1 - 2 个，共 3 个" in output
+    assert "--offset 2" in output
+
+
+def test_plain_mode_does_not_import_rich(run_python):
+    output = run_python("""
+        import io
+        import sys
+        from cursormind.core.review_render import ReviewRenderer, summarize
+        renderer = ReviewRenderer(None, plain=True, stream=io.StringIO())
+        renderer.summary(summarize([]))
+        print("rich" in sys.modules)
+    """)
+    assert output.strip() == "False"
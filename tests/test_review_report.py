@@ -0,0 +1,102 @@
+"""
+紧凑格式审查报告的回归测试
+"""
+import pytest
+
+from cursormind.core import review_report
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_render import summarize
+from cursormind.core.review_report import CompactReport, write_compact_report
+
+
+def _report(count):
+    issues = []
+    for i in range(count):
+        issue = {
+            "type": "style",
+            "rule": "quotes" if i % 3 else "line_length",
+            "message": f"第 {i % 5} 类问题",
+            "line": i + 1,
+            "severity": "info",
+        }
+        if i % 7:
+            issue = {"file": f"pkg/m{i % 4}.py", **issue}
+        issues.append(issue)
+    return {"directory": "pkg", "total_issues": count, "issues": issues}
+
+
+def test_compact_report_round_trip(tmp_path, monkeypatch):
+    # 缩小块大小，让问题分布在多个压缩块中
+    monkeypatch.setattr(review_report, "CHUNK_SIZE", 8)
+    report = _report(50)
+    path = tmp_path / "report.cmr"
+    write_compact_report(path, report)
+
+    stored = CompactReport(path)
+    assert stored.total == 50
+    assert stored.meta == {"directory": "pkg", "total_issues": 50}
+    assert stored.to_dict() == report
+
+
+def test_compact_report_pages_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(review_report, "CHUNK_SIZE", 8)
+    report = _report(50)
+    path = tmp_path / "report.cmr"
+    write_compact_report(path, report)
+
+    stored = CompactReport(path)
+    issues = report["issues"]
+    for offset, limit in [(0, 5), (6, 4), (7, 20), (45, 10), (50, 5), (3, None)]:
+        end = None if limit is None else offset + limit
+        assert list(stored.iter_issues(offset, limit)) == issues[offset:end]
+
+
+def test_compact_report_rejects_other_files(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CompactReport(path)
+
+
+def test_saved_compact_report_opens_by_id(home):
+    reviewer = CodeReview()
+    report = _report(10)
+    report_id = reviewer.save_report(report, "compact")
+
+    stored = reviewer.open_report(report_id)
+    assert isinstance(stored, CompactReport)
+    assert list(stored.iter_issues(2, 3)) == report["issues"][2:5]
+    [entry] = reviewer.list_reports()
+    assert entry["id"] == report_id
+
+
+def test_compact_summary_reads_no_chunks(tmp_path, monkeypatch):
+    issues = [
+        {
+            "file": f"pkg/m{i % 7}.py", "line": i, "type": "style",
+            "rule": f"rule{i % 3}", "message": "问题",
+            "severity": ("info", "warning")[i % 2]
+        }
+        for i in range(10000)
+    ]
+    path = tmp_path / "report.cmr"
+    write_compact_report(path, {"directory": "pkg", "issues": issues})
+
+    report = CompactReport(path)
+
+    def fail(*args):
+        raise AssertionError("统计问题时不应解压块")
+
+    monkeypatch.setattr(report, "_read_chunk", fail)
+    assert report.summary() == summarize(issues)
+
+
+def test_legacy_compact_report_has_no_summary(tmp_path):
+    path = tmp_path / "report.cmr"
+    write_compact_report(path, _report(20))
+
+    # 早期的报告头部没有计数，由调用方遍历问题统计
+    report = CompactReport(path)
+    report._file_counts = None
+    assert report.summary() is None
+    assert summarize(report.iter_issues()) == summarize(_report(20)["issues"])
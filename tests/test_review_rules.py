@@ -0,0 +1,121 @@
+"""
+代码审查规则插件的回归测试
+"""
+import ast
+
+import pytest
+
+from cursormind.core import review_rules
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_rules import ReviewRule, create_rules, is_builtin
+
+PLUGIN_SOURCE = '''
+import ast
+
+from cursormind.core.review_rules import ReviewRule
+
+
+class NoPrintRule(ReviewRule):
+    name = "no_print"
+    category = "style"
+    severity = "warning"
+    node_types = (ast.Call,)
+
+    def visit(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id == "print":
+            return self.issue("不要使用 print", node.lineno)
+
+
+class TodoRule(ReviewRule):
+    name = "todo"
+    lexical = True
+
+    def check_line(self, line_no, lexical):
+        if "TODO" in lexical.lines[line_no - 1]:
+            return self.issue("存在 TODO", line_no)
+'''
+
+
+@pytest.fixture
+def plugin_dist(tmp_path, monkeypatch):
+    """在 sys.path 上安装一个通过入口点发布规则的插件包。"""
+    (tmp_path / "my_rules.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    dist_info = tmp_path / "my_rules-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: my-rules\nVersion: 1.0\n", encoding="utf-8"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        "[cursormind.review_rules]\n"
+        "no_print = my_rules:NoPrintRule\n"
+        "todo = my_rules:TodoRule\n"
+        "broken = my_rules:Missing\n",
+        encoding="utf-8"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # 入口点每个进程只加载一次，测试前后清空缓存
+    monkeypatch.setattr(review_rules, "_entry_point_rules", None)
+    yield
+    monkeypatch.setattr(review_rules, "_entry_point_rules", None)
+
+
+def test_builtin_rules_are_registered_in_order(home):
+    names = [rule.name for rule in create_rules({"plugins": {"enabled": False}})]
+    assert names == [
+        "line_length", "indentation", "docstring", "quotes",
+        "complexity", "locals", "returns", "statements",
+        "sql_injection", "command_injection", "file_access",
+    ]
+
+
+def test_entry_point_plugins_are_discovered(home, plugin_dist, tmp_path, capsys):
+    source = tmp_path / "module.py"
+    source.write_text('"""模块。"""\nprint("hi")  # TODO\n', encoding="utf-8")
+
+    reviewer = CodeReview(use_cache=False)
+    plugins = [rule.name for rule in reviewer.rules if not is_builtin(type(rule))]
+    assert plugins == ["no_print", "todo"]
+    assert "broken" in capsys.readouterr().out
+
+    issues = reviewer.review_file(str(source))["issues"]
+    assert [(i["rule"], i["line"]) for i in issues] == [
+        ("no_print", 2), ("todo", 2)
+    ]
+
+
+def test_disabled_rules_are_skipped(home, plugin_dist):
+    config = {"plugins": {"disabled": ["todo", "docstring"]}}
+    names = {rule.name for rule in create_rules(config)}
+    assert "no_print" in names
+    assert not names & {"todo", "docstring"}
+
+
+def test_failing_rule_reports_error_issue(home, tmp_path, monkeypatch):
+    class FailingRule(ReviewRule):
+        name = "failing"
+        node_types = (ast.Name,)
+
+        def visit(self, node):
+            raise ValueError("boom")
+
+    monkeypatch.setattr(review_rules, "_registered", [
+        *review_rules._registered, FailingRule
+    ])
+    source = tmp_path / "module.py"
+    source.write_text('"""模块。"""\nx = 1\n', encoding="utf-8")
+
+    issues = CodeReview(use_cache=False).review_file(str(source))["issues"]
+    assert [(i["rule"], i["severity"], i["line"]) for i in issues] == [
+        ("failing", "error", 2)
+    ]
+
+
+def test_dispatch_table_is_built_once(home, tmp_path, monkeypatch):
+    reviewer = CodeReview(use_cache=False)
+    dispatch = reviewer._dispatch
+    assert ast.Call in dispatch and ast.Constant not in dispatch
+
+    source = tmp_path / "module.py"
+    source.write_text("def f():\n    pass\n", encoding="utf-8")
+    reviewer.review_file(str(source))
+    assert reviewer._dispatch is dispatch
@@ -0,0 +1,68 @@
+"""
+代码审查守护进程的回归测试
+"""
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_server import (
+    ReviewServer, review_via_daemon, send_request
+)
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="需要 Unix 域套接字"
+)
+
+
+@pytest.fixture
+def socket_path():
+    # Unix 域套接字路径长度有限，不使用层级较深的 tmp_path
+    with tempfile.TemporaryDirectory(prefix="cmr-") as directory:
+        yield Path(directory) / "review.sock"
+
+
+@pytest.fixture
+def server(home, socket_path):
+    server = ReviewServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    send_request({"op": "shutdown"}, socket_path)
+    thread.join(5)
+    server.server_close()
+
+
+def test_daemon_review_matches_in_process(server, socket_path, tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("x = 'a'\n", encoding="utf-8")
+
+    result = review_via_daemon(str(source), socket_path)
+    assert result["issues"] == CodeReview().review_file(str(source))["issues"]
+    assert send_request({"op": "ping"}, socket_path)["requests"] == 1
+
+
+def test_version_mismatch_falls_back(server, socket_path, tmp_path):
+    response = send_request(
+        {"op": "review", "path": str(tmp_path / "m.py"), "version": "0"},
+        socket_path
+    )
+    assert response == {"ok": False, "error": "版本不一致"}
+
+
+def test_refuses_second_daemon_and_replaces_stale_socket(server, socket_path):
+    with pytest.raises(RuntimeError):
+        ReviewServer(socket_path)
+
+    stale = socket_path.with_name("stale.sock")
+    stale.touch()
+    # 没有进程监听的套接字文件视为上次异常退出留下的，直接替换
+    ReviewServer(stale).server_close()
+    assert not stale.exists()
+
+
+def test_client_without_daemon_returns_none(socket_path):
+    assert review_via_daemon(__file__, socket_path) is None
@@ -0,0 +1,86 @@
+"""
+分片审查的回归测试
+"""
+import os
+import shutil
+
+import pytest
+
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_shard import (
+    merge_reports, parse_shard_spec, select_shard
+)
+
+
+def _entries(root, sizes):
+    entries = []
+    for name, size in sizes.items():
+        path = root / name
+        path.write_text("x" * size, encoding="utf-8")
+        entries.append((str(path), os.stat(path)))
+    return entries
+
+
+@pytest.mark.parametrize("balance", [False, True])
+def test_shards_partition_files(tmp_path, balance):
+    entries = _entries(
+        tmp_path, {f"module_{n}.py": (n * 37) % 500 + 1 for n in range(40)}
+    )
+    shards = [
+        select_shard(entries, str(tmp_path), index, 3, balance=balance)
+        for index in (1, 2, 3)
+    ]
+    # 每个文件恰好属于一个分片，分片内保持原有顺序
+    assert sorted(entry for shard in shards for entry in shard) == sorted(entries)
+    for shard in shards:
+        assert shard == [entry for entry in entries if entry in shard]
+
+
+def test_timings_balance_shards(tmp_path):
+    entries = _entries(tmp_path, {"slow.py": 10, "a.py": 10, "b.py": 10})
+    timings = {"slow.py": 9.0, "a.py": 1.0, "b.py": 1.0}
+    first = select_shard(entries, str(tmp_path), 1, 2, timings=timings)
+    second = select_shard(entries, str(tmp_path), 2, 2, timings=timings)
+    # 耗时最长的文件单独一个分片
+    assert [os.path.basename(path) for path, _ in first] == ["slow.py"]
+    assert len(second) == 2
+
+
+@pytest.mark.parametrize("spec", ["0/2", "3/2", "1", "a/b", "1/0"])
+def test_parse_shard_spec_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_shard_spec(spec)
+
+
+def test_merge_rejects_missing_and_duplicate_shards():
+    def shard(index):
+        return {"shard": {"index": index, "count": 3}, "issues": []}
+
+    with pytest.raises(ValueError, match="缺少分片"):
+        merge_reports([shard(1), shard(3)])
+    with pytest.raises(ValueError, match="重复"):
+        merge_reports([shard(1), shard(1), shard(2)])
+    merged = merge_reports([shard(1), shard(3)], allow_partial=True)
+    assert merged["shards"]["missing"] == [2]
+
+
+def test_merge_rebases_shards_from_other_checkouts(home, tmp_path):
+    first = tmp_path / "job1" / "repo"
+    (first / "pkg").mkdir(parents=True)
+    for number in range(6):
+        (first / "pkg" / f"module_{number}.py").write_text(
+            f"def f{number}():\n    return 'x'\n", encoding="utf-8"
+        )
+    # 另一个 CI 任务的检出目录
+    second = tmp_path / "job2" / "repo"
+    shutil.copytree(first, second)
+
+    reviewer = CodeReview(use_cache=False)
+    full = reviewer.review_directory(str(first))
+    merged = merge_reports([
+        reviewer.review_directory(str(first), shard=(1, 2)),
+        reviewer.review_directory(str(second), shard=(2, 2)),
+    ])
+
+    assert merged["root"] == str(first.resolve())
+    assert merged["issues"] == full["issues"]
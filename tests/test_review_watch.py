@@ -0,0 +1,150 @@
+"""
+代码审查监视的回归测试
+"""
+import os
+import time
+
+import pytest
+
+from cursormind.core import review_watch
+from cursormind.core.code_review import CodeReview
+from cursormind.core.review_watch import ReviewWatcher
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _touch_later(path, text):
+    # 保证修改时间与之前不同
+    _write(path, text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / "a.py", '"""模块。"""\nx = 1\n')
+    _write(root / "pkg" / "b.py", '"""模块。"""\ny = 2\n')
+    # 刚创建的目录修改时间不可靠，每次检查都会重新列出
+    past = time.time_ns() - 10 * 10 ** 9
+    for directory in (root, root / "pkg"):
+        os.utime(directory, ns=(past, past))
+    return root.resolve()
+
+
+def _changed(watcher):
+    return {
+        os.path.relpath(path, watcher._root): st is not None
+        for path, st in watcher._changes().items()
+    }
+
+
+def test_polling_stats_known_files_without_rescanning(home, tree, monkeypatch):
+    reviewer = CodeReview()
+    watcher = ReviewWatcher(reviewer, str(tree), use_events=False)
+    watcher.start()
+
+    scans = []
+    discover = reviewer.discover_files
+
+    def record(directory, exclude=None, start="", visit_dir=None):
+        scans.append(start)
+        return discover(directory, exclude, start, visit_dir)
+
+    monkeypatch.setattr(reviewer, "discover_files", record)
+
+    # 修改已有文件不改变目录的修改时间，不需要重新遍历
+    assert _changed(watcher) == {}
+    _touch_later(tree / "pkg" / "b.py", "y = 'z'\n")
+    assert _changed(watcher) == {os.path.join("pkg", "b.py"): True}
+    assert scans == []
+
+    # 新增和删除文件只重新列出所在目录
+    _write(tree / "pkg" / "c.py", "z = 3\n")
+    (tree / "a.py").unlink()
+    assert _changed(watcher) == {
+        os.path.join("pkg", "b.py"): True,
+        os.path.join("pkg", "c.py"): True,
+        "a.py": False,
+    }
+    assert sorted(scans) == ["", "pkg"]
+
+
+def test_polling_tracks_new_and_removed_directories(home, tree):
+    watcher = ReviewWatcher(CodeReview(), str(tree), use_events=False)
+    watcher.start()
+
+    _write(tree / "new" / "deep" / "d.py", "d = 1\n")
+    _write(tree / "build" / "e.py", "e = 1\n")
+    assert _changed(watcher) == {os.path.join("new", "deep", "d.py"): True}
+
+    for path in (tree / "pkg").iterdir():
+        path.unlink()
+    (tree / "pkg").rmdir()
+    changes = _changed(watcher)
+    assert changes[os.path.join("pkg", "b.py")] is False
+    assert str(tree / "pkg") not in watcher._dirs
+
+
+def test_watch_reports_new_and_fixed_issues(home, tree):
+    watcher = ReviewWatcher(
+        CodeReview(), str(tree), interval=0.01, debounce=0, use_events=False
+    )
+    watcher.start()
+    _touch_later(tree / "a.py", "\"\"\"模块。\"\"\"\nx = 'a'\n")
+
+    batch = next(watcher.watch())
+    assert batch["files"] == [str(tree / "a.py")]
+    assert [issue["rule"] for issue in batch["new"]] == ["quotes"]
+    assert batch["fixed"] == []
+
+
+def test_watch_matches_issues_like_baseline_diff(home, tree):
+    watcher = ReviewWatcher(
+        CodeReview(), str(tree), interval=0.01, debounce=0, use_events=False
+    )
+    _write(tree / "a.py", "\"\"\"模块。\"\"\"\nx = 'a'\n")
+    watcher.start()
+
+    # 问题所在行下移，指纹不变
+    _touch_later(tree / "a.py", "\"\"\"模块。\"\"\"\n\n\nx = 'a'\n")
+    batch = next(watcher.watch())
+    assert batch["new"] == batch["fixed"] == []
+
+    # 同一条规则报在另一行代码上，算作新增一个问题、修复一个问题
+    _touch_later(tree / "a.py", "\"\"\"模块。\"\"\"\n\n\ny = 'a'\n")
+    batch = next(watcher.watch())
+    assert [issue["line"] for issue in batch["new"]] == [4]
+    assert [issue["line"] for issue in batch["fixed"]] == [4]
+
+
+def test_events_only_check_reported_paths(home, tree):
+    pytest.importorskip("watchdog")
+    watcher = ReviewWatcher(CodeReview(), str(tree))
+    watcher.start()
+    try:
+        assert watcher._observer is not None
+        _touch_later(tree / "pkg" / "b.py", "y = 'z'\n")
+        _write(tree / "pkg" / "c.py", "z = 3\n")
+        deadline = time.monotonic() + 5
+        changes = {}
+        while len(changes) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            changes = _changed(watcher)
+        assert changes == {
+            os.path.join("pkg", "b.py"): True,
+            os.path.join("pkg", "c.py"): True,
+        }
+    finally:
+        watcher.close()
+
+
+def test_falls_back_to_polling_without_watchdog(home, tree, monkeypatch):
+    monkeypatch.setattr(review_watch, "Observer", None)
+    watcher = ReviewWatcher(CodeReview(), str(tree))
+    assert not watcher.use_events
+    watcher.start()
+    assert watcher._observer is None
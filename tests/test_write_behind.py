@@ -0,0 +1,90 @@
+"""
+延迟写回统计数据的回归测试
+"""
+import json
+
+from cursormind.utils.write_behind import WriteBehindStore, merge_changes
+
+
+def _default():
+    return {'total': 0, 'topics': {}, 'tags': [], 'last': ''}
+
+
+def _read(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def test_concurrent_stores_merge_counters(tmp_path):
+    path = tmp_path / 'stats.json'
+    # 两个命令同时运行，各自读到同一份数据
+    first = WriteBehindStore(path, _default)
+    second = WriteBehindStore(path, _default)
+
+    first.data['total'] += 2
+    first.data['topics']['python'] = 2
+    first.data['tags'].append('a')
+    first.data['last'] = 'first'
+    first.mark_dirty()
+    first.flush()
+
+    second.data['total'] += 3
+    second.data['topics']['python'] = 1
+    second.data['topics']['rust'] = 2
+    second.data['tags'].append('b')
+    second.mark_dirty()
+    second.flush()
+
+    expected = {'total': 5, 'topics': {'python': 3, 'rust': 2}, 'tags': ['a', 'b'], 'last': 'first'}
+    assert _read(path) == expected
+    # 调用方持有的引用也看到合并后的数据
+    assert second.data == expected
+
+    first.data['total'] += 1
+    first.mark_dirty()
+    first.flush()
+    assert _read(path)['total'] == 6
+
+
+def test_merge_keeps_set_type_and_local_removals():
+    base = {'tags': ['a', 'b'], 'topics': {'x': 1, 'y': 1}}
+    ours = {'tags': {'a', 'c'}, 'topics': {'y': 1}}
+    theirs = {'tags': ['a', 'b', 'd'], 'topics': {'x': 1, 'y': 2}}
+    assert merge_changes(base, ours, theirs) == {'tags': {'a', 'c', 'd'}, 'topics': {'y': 2}}
+
+
+def test_flush_every_writes_before_exit(tmp_path):
+    path = tmp_path / 'stats.json'
+    store = WriteBehindStore(path, _default, flush_every=3)
+    store.flush()
+    for _ in range(5):
+        store.data['total'] += 1
+        store.mark_dirty()
+    assert _read(path)['total'] == 3 and store.pending == 2
+    assert store.writes == 2
+
+
+def test_flush_interval_writes_before_exit(tmp_path, monkeypatch):
+    from cursormind.utils import write_behind
+
+    now = [100.0]
+    monkeypatch.setattr(write_behind.time, 'monotonic', lambda: now[0])
+    path = tmp_path / 'stats.json'
+    store = WriteBehindStore(path, _default, flush_interval=10)
+    store.data['total'] += 1
+    store.mark_dirty()
+    assert not path.exists()
+
+    now[0] += 10
+    store.data['total'] += 1
+    store.mark_dirty()
+    assert _read(path)['total'] == 2 and store.pending == 0
+
+
+def test_corrupt_file_is_overwritten(tmp_path):
+    path = tmp_path / 'stats.json'
+    store = WriteBehindStore(path, _default)
+    path.write_text('{"total": 1', encoding='utf-8')
+    store.data['total'] = 4
+    store.mark_dirty()
+    store.flush()
+    assert _read(path)['total'] == 4